@@ -0,0 +1,26 @@
+"""
+Measures the time needed to import the package and its main modules in a fresh interpreter.
+"""
+
+import sys
+import subprocess
+import statistics
+
+statements = [
+    "import numpy",
+    "import metaheuristic_designer",
+    "from metaheuristic_designer.algorithms import AlgorithmSelection",
+    "from metaheuristic_designer.benchmarks import *",
+    "import metaheuristic_designer.simple",
+]
+
+
+def time_import(statement, repetitions=10):
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    times = [float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout) for _ in range(repetitions)]
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    for statement in statements:
+        print(f"{statement:<70} {time_import(statement) * 1000:8.1f} ms")
@@ -0,0 +1,85 @@
+"""
+Compares the batched permutation operators with the previous implementations, that processed
+each individual (or each pair of parents) separately.
+"""
+
+import timeit
+import numpy as np
+import metaheuristic_designer as mhd
+from metaheuristic_designer.operators.operator_functions.permutation import *
+
+
+def roll_mutation_loop(population, n):
+    roll_start = mhd.RAND_GEN.integers(0, population.shape[1] - 2, population.shape[0])
+    roll_end = mhd.RAND_GEN.integers(roll_start + 2, population.shape[1] + 1, (population.shape[0]))
+
+    def roll_individual(indiv, start, end, n):
+        indiv_copy = indiv.copy()
+        indiv_copy[start:end] = np.roll(indiv[start:end], n)
+        return indiv_copy
+
+    roll_vec = np.vectorize(roll_individual, signature="(m),(),(),()->(m)")
+    return roll_vec(population, roll_start, roll_end, n)
+
+
+def invert_mutation_loop(population):
+    invert_start = mhd.RAND_GEN.integers(0, population.shape[1] - 2, population.shape[0])
+    invert_end = mhd.RAND_GEN.integers(invert_start + 2, population.shape[1] + 1, population.shape[0])
+
+    def invert_individual(indiv, start, end):
+        indiv_copy = indiv.copy()
+        indiv_copy[start:end] = indiv[start:end][::-1]
+        return indiv_copy
+
+    invert_vec = np.vectorize(invert_individual, signature="(m),(),()->(m)")
+    return invert_vec(population, invert_start, invert_end)
+
+
+def pmx_loop(population):
+    half_size = np.ceil(population.shape[0] / 2).astype(int)
+
+    new_population = np.empty((2 * half_size, population.shape[1]), dtype=int)
+    for i in range(half_size):
+        new_population[i] = pmx_single(population[i], population[2 * i])
+        new_population[i + half_size] = pmx_single(population[2 * i], population[i])
+
+    return new_population
+
+
+def order_cross_loop(population):
+    half_size = np.ceil(population.shape[0] / 2).astype(int)
+    parents1 = population[:half_size]
+    parents2 = population[population.shape[0] // 2 :]
+
+    new_population = np.empty((2 * half_size, population.shape[1]), dtype=int)
+    for i in range(half_size):
+        new_population[i] = order_cross_single(parents1[i], parents2[i])
+        new_population[i + half_size] = order_cross_single(parents2[i], parents1[i])
+
+    return new_population
+
+
+operators = {
+    "roll": (lambda pop: roll_mutation_loop(pop, 3), lambda pop: roll_mutation(pop, 3)),
+    "invert": (invert_mutation_loop, invert_mutation),
+    "pmx": (pmx_loop, pmx),
+    "order_cross": (order_cross_loop, order_cross),
+}
+
+
+def main(vecsize=1000, pop_size=500, repetitions=3):
+    mhd.reset_seed(0)
+    population = mhd.RAND_GEN.permuted(np.tile(np.arange(vecsize), (pop_size, 1)), axis=1)
+
+    print(f"Permutations of {vecsize} elements, population of {pop_size} individuals")
+    print(f"{'operator':<15} {'loop':>12} {'batched':>12} {'speedup':>10}")
+    for name, (loop_fn, batch_fn) in operators.items():
+        loop_time = min(timeit.repeat(lambda: loop_fn(population), number=1, repeat=repetitions))
+        batch_time = min(timeit.repeat(lambda: batch_fn(population), number=1, repeat=repetitions))
+        print(f"{name:<15} {loop_time * 1000:9.1f} ms {batch_time * 1000:9.1f} ms {loop_time / batch_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main(1000, 500)
+    print()
+    main(20, 500)
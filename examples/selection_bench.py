@@ -0,0 +1,44 @@
+"""
+Compares the selection of the best individuals with a partial sort against a full sort of the
+population, as it was done before, for several population sizes.
+"""
+
+import timeit
+import numpy as np
+import metaheuristic_designer as mhd
+from metaheuristic_designer.selectionMethods.parent_selection_functions import select_best
+from metaheuristic_designer.selectionMethods.survivor_selection_functions import lamb_plus_mu
+
+
+def select_best_sort(fitness, amount):
+    return np.argsort(fitness)[::-1][:amount]
+
+
+def lamb_plus_mu_sort(population_fitness, offspring_fitness):
+    full_fitness = np.concatenate((population_fitness, offspring_fitness))
+    return np.argsort(full_fitness)[::-1][: population_fitness.shape[0]]
+
+
+def main(sizes=(10**2, 10**3, 10**4, 10**5, 10**6, 10**7), amount=20, repetitions=3):
+    mhd.reset_seed(0)
+
+    print(f"Selection of the best {amount} individuals and (mu+lambda) selection with mu = lambda / 10")
+    print(f"{'population':>12} {'method':<12} {'sort':>12} {'partial':>12} {'speedup':>10}")
+    for size in sizes:
+        fitness = mhd.RAND_GEN.normal(size=size)
+        parent_fitness = mhd.RAND_GEN.normal(size=max(size // 10, 1))
+
+        cases = {
+            "best": (lambda: select_best_sort(fitness, amount), lambda: select_best(fitness, amount)),
+            "mu+lambda": (lambda: lamb_plus_mu_sort(parent_fitness, fitness), lambda: lamb_plus_mu(parent_fitness, fitness)),
+        }
+
+        number = max(10**6 // size, 1)
+        for name, (sort_fn, partial_fn) in cases.items():
+            sort_time = min(timeit.repeat(sort_fn, number=number, repeat=repetitions)) / number
+            partial_time = min(timeit.repeat(partial_fn, number=number, repeat=repetitions)) / number
+            print(f"{size:>12} {name:<12} {sort_time * 1000:9.2f} ms {partial_time * 1000:9.2f} ms {sort_time / partial_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
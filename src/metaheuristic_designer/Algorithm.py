@@ -1,16 +1,17 @@
 from __future__ import annotations
-from typing import List, Tuple, Any
+from typing import Callable, List, Tuple, Any
 from abc import ABC, abstractmethod
 import time
 import json
 import numpy as np
-import pyparsing as pp
-import matplotlib.pyplot as plt
 from .utils import NumpyEncoder
+from .parallel import get_backend, create_executor, SharedMemoryEvaluator
 from .ObjectiveFunc import ObjectiveFunc
 from .SearchStrategy import SearchStrategy
 from .ParamScheduler import ParamScheduler
 from .Population import Population
+from .HistoryRecorder import HistoryRecorder
+from .checkpoint import save_checkpoint, load_checkpoint
 
 
 class Algorithm(ABC):
@@ -32,6 +33,31 @@ class Algorithm(ABC):
         Name that will be displayed when showing the algorithm.
     """
 
+    # Configuration of the run, taken from the algorithm when resuming from a checkpoint instead of from the checkpoint
+    _checkpoint_exclude = (
+        "params",
+        "show_init_info",
+        "verbose",
+        "v_timer",
+        "stop_cond",
+        "stop_cond_parsed",
+        "progress_metric",
+        "progress_metric_parsed",
+        "_uses_real_time",
+        "_uses_cpu_time",
+        "check_every",
+        "ngen",
+        "neval",
+        "time_limit",
+        "cpu_time_limit",
+        "fit_target",
+        "max_patience",
+        "parallel",
+        "threads",
+        "checkpoint_file",
+        "checkpoint_every",
+    )
+
     def __init__(
         self,
         objfunc: ObjectiveFunc,
@@ -63,6 +89,20 @@ class Algorithm(ABC):
         self.progress_metric = params.get("progress_metric", self.stop_cond)
         self.progress_metric_parsed = parse_stopping_cond(self.progress_metric) if "progress_metric" in params else self.stop_cond_parsed
 
+        # The stopping condition is compiled once, the values it uses are read once in each update
+        self._stop_cond_fn = compile_condition(self.stop_cond_parsed, STOP_CONDITIONS)
+        self._progress_fn = compile_progress(self.progress_metric_parsed, PROGRESS_METRICS)
+        used_conditions = condition_names(self.stop_cond_parsed) | condition_names(self.progress_metric_parsed)
+        self._uses_real_time = "time_limit" in used_conditions
+        self._uses_cpu_time = "cpu_time_limit" in used_conditions
+        self._current_gen = 0
+        self._real_time = 0
+        self._cpu_time = 0
+        self._best_fitness = None
+
+        # Number of generations between each check of the stopping condition
+        self.check_every = params.get("check_every", 1)
+
         self.ngen = params.get("ngen", 100)
         self.neval = params.get("neval", 1e5)
         self.time_limit = params.get("time_limit", 10.0)
@@ -77,9 +117,23 @@ class Algorithm(ABC):
         self.parallel = params.get("parallel", False)
         self.threads = params.get("threads", 8)
 
+        # Checkpoints saved periodically during the optimization
+        self.checkpoint_file = params.get("checkpoint_file")
+        self.checkpoint_every = params.get("checkpoint_every", 100)
+
+        # History of the best solutions
+        self.history = params.get("history")
+        if self.history is None:
+            self.history = HistoryRecorder(
+                size=params.get("history_size", 100000),
+                every=params.get("history_every", 0),
+                on_improvement=params.get("history_improvement", True),
+                snapshots=params.get("history_snapshots", 10),
+                spill_file=params.get("history_file"),
+                mode=objfunc.mode,
+            )
+
         # Metrics
-        self.fit_history = []
-        self.best_history = []
         self.progress = 0
         self.ended = False
         self.steps = 0
@@ -96,6 +150,22 @@ class Algorithm(ABC):
     def name(self, new_name: str):
         self._name = new_name
 
+    @property
+    def fit_history(self) -> np.ndarray:
+        """
+        Fitness of the best solution in each of the generations stored in the history.
+        """
+
+        return self.history.fitness
+
+    @property
+    def best_history(self) -> np.ndarray:
+        """
+        Snapshots of the best solution stored in the history.
+        """
+
+        return self.history.solutions
+
     @property
     def initializer(self):
         return self.search_strategy.initializer
@@ -124,8 +194,8 @@ class Algorithm(ABC):
         Resets the internal values of the algorithm and the number of evaluations of the fitness function.
         """
 
-        self.fit_history = []
-        self.best_history = []
+        self.history.reset()
+        self.steps = 0
         self.progress = 0
         self.ended = False
         self.prev_best_fitness = None
@@ -148,6 +218,59 @@ class Algorithm(ABC):
         ind, fit = self.search_strategy.best_solution(decoded=False)
         np.savetxt(file_name, ind.reshape([1, -1]), delimiter=",")
 
+    def save_checkpoint(self, file_name: str = None):
+        """
+        Saves the state of the algorithm to a binary file from which the execution can be resumed.
+
+        The checkpoint contains the population, the state of the search strategy, operators, selection methods
+        and parameter schedulers, the counters of the algorithm and the state of the random number generators.
+
+        Parameters
+        ----------
+        file_name: str, optional
+            Path to the checkpoint file, by default the one given in the 'checkpoint_file' parameter or "checkpoint.npz".
+        """
+
+        if file_name is None:
+            file_name = self.checkpoint_file if self.checkpoint_file is not None else "checkpoint.npz"
+
+        save_checkpoint(file_name, {"objfunc": self.objfunc, "algorithm": self})
+
+    def resume(self, file_name: str = None) -> Algorithm:
+        """
+        Restores the state of the algorithm from a checkpoint created with 'save_checkpoint'.
+
+        The algorithm must be built in the same way as the one that was saved, its configuration (stopping
+        condition, verbosity, parallelism...) is kept and the rest is taken from the checkpoint. Calling
+        'optimize(initialize=False)' afterwards continues the execution exactly where it was saved.
+
+        Parameters
+        ----------
+        file_name: str, optional
+            Path to the checkpoint file, by default the one given in the 'checkpoint_file' parameter or "checkpoint.npz".
+
+        Returns
+        -------
+        self: Algorithm
+        """
+
+        if file_name is None:
+            file_name = self.checkpoint_file if self.checkpoint_file is not None else "checkpoint.npz"
+
+        load_checkpoint(file_name, {"objfunc": self.objfunc, "algorithm": self})
+
+        return self
+
+    def _measure(self, gen: int, real_time_start: float, cpu_time_start: float, best_fitness: float):
+        """
+        Stores the values used in the stopping condition, the clocks are only read if they are needed.
+        """
+
+        self._current_gen = gen
+        self._real_time = time.time() - real_time_start if self._uses_real_time else 0
+        self._cpu_time = time.process_time() - cpu_time_start if self._uses_cpu_time else 0
+        self._best_fitness = best_fitness
+
     def stopping_condition(self, gen: int, real_time_start: float, cpu_time_start: float) -> bool:
         """
         Given the state of the algorithm, returns wether we have finished or not.
@@ -167,30 +290,9 @@ class Algorithm(ABC):
             Whether the algorithm has reached its end
         """
 
-        neval_reached = self.objfunc.counter >= self.neval
+        self._measure(gen, real_time_start, cpu_time_start, self.best_solution()[1])
 
-        ngen_reached = gen >= self.ngen
-
-        real_time_reached = time.time() - real_time_start >= self.time_limit
-
-        cpu_time_reached = time.process_time() - cpu_time_start >= self.cpu_time_limit
-
-        if self.objfunc.mode == "max":
-            target_reached = self.best_solution()[1] >= self.fit_target
-        else:
-            target_reached = self.best_solution()[1] <= self.fit_target
-
-        patience_reached = self.patience_left < 0
-
-        return self.search_strategy.finish or process_condition(
-            self.stop_cond_parsed,
-            neval_reached,
-            ngen_reached,
-            real_time_reached,
-            cpu_time_reached,
-            target_reached,
-            patience_reached,
-        )
+        return self.search_strategy.finish or self._stop_cond_fn(self)
 
     def get_progress(self, gen: int, real_time_start: float, cpu_time_start: float) -> float:
         """
@@ -212,39 +314,17 @@ class Algorithm(ABC):
             Indicator of how close it the algorithm to finishing, 1 means the algorithm should be stopped.
         """
 
-        neval_reached = self.objfunc.counter / self.neval
-
-        ngen_reached = gen / self.ngen
-
-        real_time_reached = (time.time() - real_time_start) / self.time_limit
+        self._measure(gen, real_time_start, cpu_time_start, self.best_solution()[1])
 
-        cpu_time_reached = (time.process_time() - cpu_time_start) / self.cpu_time_limit
-
-        best_fitness = self.best_solution()[1]
-
-        fit_target = self.fit_target if self.fit_target != 0 else 1e-10
-        if self.objfunc.mode == "max":
-            target_reached = 1 - (best_fitness - self.fit_target) / fit_target
-        else:
-            target_reached = 1 - (self.fit_target - best_fitness) / fit_target
-
-        patience_prec = 1 - self.patience_left / self.max_patience
-
-        return process_progress(
-            self.stop_cond_parsed,
-            neval_reached,
-            ngen_reached,
-            real_time_reached,
-            cpu_time_reached,
-            target_reached,
-            patience_prec,
-        )
+        return self._progress_fn(self)
 
     def update(self, real_time_start: float, cpu_time_start: float, pass_step: bool = True):
         """
         Updates the attributes of the optimization algorithm.
         This function should be called once per iteration of the algorithm.
 
+        The stopping condition and the progress are only evaluated every 'check_every' generations.
+
         Parameters
         ----------
         real_time_start: float
@@ -258,16 +338,28 @@ class Algorithm(ABC):
         if pass_step:
             self.steps += 1
 
-        if self.prev_best_fitness is not None and ((self.best_solution()[1] >= self.prev_best_fitness) != (self.objfunc.mode == "max")):
+        best_fitness = self.best_solution()[1]
+
+        if self.prev_best_fitness is None:
+            stalled = False
+        elif self.objfunc.mode == "max":
+            stalled = best_fitness < self.prev_best_fitness
+        else:
+            stalled = best_fitness >= self.prev_best_fitness
+
+        if stalled:
             self.patience_left -= 1
         else:
             self.patience_left = self.max_patience
 
-        self.prev_best_fitness = self.best_solution()[1]
+        self.prev_best_fitness = best_fitness
 
-        self.progress = self.get_progress(self.steps, real_time_start, cpu_time_start)
+        if not pass_step or self.steps % self.check_every == 0:
+            self._measure(self.steps, real_time_start, cpu_time_start, best_fitness)
+            self.progress = self._progress_fn(self)
+            self.ended = self._stop_cond_fn(self)
 
-        self.ended = self.stopping_condition(self.steps, real_time_start, cpu_time_start)
+        self.ended = self.ended or self.search_strategy.finish
 
     def initialize(self, reset_objfunc=True) -> Population:
         """
@@ -310,6 +402,14 @@ class Algorithm(ABC):
         It will initialize the algorithm and repeat steps of the algorithm untill the
         stopping condition is met.
 
+        If the 'checkpoint_file' parameter is given, a checkpoint is saved every 'checkpoint_every' generations.
+
+        Parameters
+        ----------
+        initialize: bool, optional
+            Whether to start a new execution or continue the current one (for example after calling 'resume'),
+            in which case the generations and time already spent count towards the stopping condition.
+
         Returns
         -------
         current_population: Population
@@ -319,32 +419,55 @@ class Algorithm(ABC):
         if self.verbose and self.show_init_info:
             self.init_info()
 
-        self.steps = 0
-
         # initialize clocks
         real_time_start = time.time()
         cpu_time_start = time.process_time()
+        if not initialize:
+            real_time_start -= self.real_time_spent
+            cpu_time_start -= self.cpu_time_spent
         display_timer = time.time()
 
-        # Initizalize search strategy
-        if initialize:
-            self.initialize()
-
-        # Search until the stopping condition is met
-        self.update(real_time_start, cpu_time_start, pass_step=False)
+        # Keep the workers alive during the whole execution
+        parallel_option = self.parallel
+        evaluator = None
+        backend = get_backend(self.parallel)
+        if backend == "shared_memory":
+            evaluator = SharedMemoryEvaluator(self.objfunc, self.threads).start()
+        elif isinstance(backend, str):
+            evaluator = create_executor(backend, self.threads)
 
-        if self.verbose:
-            self.step_info(real_time_start)
+        if evaluator is not None:
+            self.parallel = evaluator
 
-        while not self.ended:
-            self.step(real_time_start)
+        try:
+            # Initizalize search strategy
+            if initialize:
+                self.initialize()
 
-            self.update(real_time_start, cpu_time_start)
+            # Search until the stopping condition is met
+            self.update(real_time_start, cpu_time_start, pass_step=False)
 
-            # Display information
-            if self.verbose and time.time() - display_timer > self.v_timer:
+            if self.verbose:
                 self.step_info(real_time_start)
-                display_timer = time.time()
+
+            while not self.ended:
+                self.step(real_time_start)
+
+                self.update(real_time_start, cpu_time_start)
+
+                if self.checkpoint_file is not None and self.steps % self.checkpoint_every == 0:
+                    self.real_time_spent = time.time() - real_time_start
+                    self.cpu_time_spent = time.process_time() - cpu_time_start
+                    self.save_checkpoint()
+
+                # Display information
+                if self.verbose and time.time() - display_timer > self.v_timer:
+                    self.step_info(real_time_start)
+                    display_timer = time.time()
+        finally:
+            if evaluator is not None:
+                evaluator.shutdown(wait=True, cancel_futures=True)
+                self.parallel = parallel_option
 
         # Store the time spent optimizing
         self.real_time_spent = time.time() - real_time_start
@@ -368,7 +491,7 @@ class Algorithm(ABC):
         show_fit_history: bool, optional
             Save the fitness of the best individual of each iteration.
         show_gen_history: bool, optional
-            Save the best inividual for each iteration.
+            Save the snapshots of the best individual stored in the history.
         show_pop: bool, optional
             Save the entire population of the last iteration.
         show_pop_details:bool, optional
@@ -480,7 +603,7 @@ class Algorithm(ABC):
             Whether to display plots about the algorithm or not.
         """
 
-        print("Number of generations:", len(self.fit_history))
+        print("Number of generations:", len(self.history))
         print("Real time spent: ", round(self.real_time_spent, 5), "s", sep="")
         print("CPU time spent: ", round(self.cpu_time_spent, 5), "s", sep="")
         print("Number of fitness evaluations:", self.objfunc.counter)
@@ -489,9 +612,12 @@ class Algorithm(ABC):
         print("Best fitness:", best_fitness)
 
         if show_plots:
+            # Imported here to avoid loading matplotlib unless plots are requested
+            import matplotlib.pyplot as plt
+
             # Plot fitness history
             fig, ax = plt.subplots()
-            ax.plot(self.fit_history, color="blue", zorder=3)
+            ax.plot(self.history.generations, self.fit_history, color="blue", zorder=3)
             _xlim = ax.get_xlim()
             _ylim = ax.get_ylim()
             ax.axhline(y=0, color="black", alpha=0.9)
@@ -521,6 +647,8 @@ def parse_stopping_cond(condition_str: str) -> List[str | List]:
         The list of tokens representing the original string.
     """
 
+    import pyparsing as pp
+
     orop = pp.Literal("and")
     andop = pp.Literal("or")
     condition = pp.oneOf(["neval", "ngen", "time_limit", "cpu_time_limit", "fit_target", "convergence"])
@@ -530,6 +658,148 @@ def parse_stopping_cond(condition_str: str) -> List[str | List]:
     return expr.parse_string(condition_str).as_list()
 
 
+def _target_reached(algorithm: Algorithm) -> bool:
+    if algorithm.objfunc.mode == "max":
+        return algorithm._best_fitness >= algorithm.fit_target
+    return algorithm._best_fitness <= algorithm.fit_target
+
+
+def _target_progress(algorithm: Algorithm) -> float:
+    fit_target = algorithm.fit_target if algorithm.fit_target != 0 else 1e-10
+    if algorithm.objfunc.mode == "max":
+        return 1 - (algorithm._best_fitness - algorithm.fit_target) / fit_target
+    return 1 - (algorithm.fit_target - algorithm._best_fitness) / fit_target
+
+
+# Functions that evaluate each of the stopping conditions with the values read in the last update of the algorithm
+STOP_CONDITIONS = {
+    "neval": lambda algorithm: algorithm.objfunc.counter >= algorithm.neval,
+    "ngen": lambda algorithm: algorithm._current_gen >= algorithm.ngen,
+    "time_limit": lambda algorithm: algorithm._real_time >= algorithm.time_limit,
+    "cpu_time_limit": lambda algorithm: algorithm._cpu_time >= algorithm.cpu_time_limit,
+    "fit_target": _target_reached,
+    "convergence": lambda algorithm: algorithm.patience_left < 0,
+}
+
+PROGRESS_METRICS = {
+    "neval": lambda algorithm: algorithm.objfunc.counter / algorithm.neval,
+    "ngen": lambda algorithm: algorithm._current_gen / algorithm.ngen,
+    "time_limit": lambda algorithm: algorithm._real_time / algorithm.time_limit,
+    "cpu_time_limit": lambda algorithm: algorithm._cpu_time / algorithm.cpu_time_limit,
+    "fit_target": _target_progress,
+    "convergence": lambda algorithm: 1 - algorithm.patience_left / algorithm.max_patience,
+}
+
+
+def condition_names(cond_parsed: List[str | List]) -> set:
+    """
+    Returns the names of the conditions that appear in a parsed stopping condition.
+
+    Parameters
+    ----------
+    cond_parsed: List[str | List]
+        The list of tokens representing the parsed stopping condition.
+
+    Returns
+    -------
+    names: set
+        Names of the conditions used.
+    """
+
+    if isinstance(cond_parsed, str):
+        return {cond_parsed} if cond_parsed in STOP_CONDITIONS else set()
+
+    return set().union(*(condition_names(token) for token in cond_parsed))
+
+
+def compile_condition(cond_parsed: List[str | List], conditions: dict) -> Callable:
+    """
+    Converts a parsed stopping condition into a single function, so that the token tree is
+    only processed once. Equivalent to 'process_condition'.
+
+    Parameters
+    ----------
+    cond_parsed: List[str | List]
+        The list of tokens representing the parsed stopping condition.
+    conditions: dict
+        Function that evaluates each of the possible conditions, all of them receive the same argument.
+
+    Returns
+    -------
+    condition_fn: Callable
+        Function that receives the argument of the conditions and returns wether to stop or not.
+    """
+
+    condition_fn = None
+
+    match cond_parsed:
+        case [cond1, "and", cond2]:
+            cond1_fn = compile_condition(cond1, conditions)
+            cond2_fn = compile_condition(cond2, conditions)
+
+            def condition_fn(arg):
+                return cond1_fn(arg) and cond2_fn(arg)
+
+        case [cond1, "or", cond2]:
+            cond1_fn = compile_condition(cond1, conditions)
+            cond2_fn = compile_condition(cond2, conditions)
+
+            def condition_fn(arg):
+                return cond1_fn(arg) or cond2_fn(arg)
+
+        case [cond1]:
+            condition_fn = compile_condition(cond1, conditions)
+
+        case str():
+            condition_fn = conditions[cond_parsed]
+
+    return condition_fn
+
+
+def compile_progress(cond_parsed: List[str | List], metrics: dict) -> Callable:
+    """
+    Converts a parsed stopping condition into a single function that measures the progress of the
+    algorithm, so that the token tree is only processed once. Equivalent to 'process_progress'.
+
+    Parameters
+    ----------
+    cond_parsed: List[str | List]
+        The list of tokens representing the parsed stopping condition.
+    metrics: dict
+        Function that measures the progress of each of the possible conditions, all of them receive the same argument.
+
+    Returns
+    -------
+    progress_fn: Callable
+        Function that receives the argument of the metrics and returns the progress of the algorithm.
+    """
+
+    progress_fn = None
+
+    match cond_parsed:
+        case [cond1, "and", cond2]:
+            progress1_fn = compile_progress(cond1, metrics)
+            progress2_fn = compile_progress(cond2, metrics)
+
+            def progress_fn(arg):
+                return max(progress1_fn(arg), progress2_fn(arg))
+
+        case [cond1, "or", cond2]:
+            progress1_fn = compile_progress(cond1, metrics)
+            progress2_fn = compile_progress(cond2, metrics)
+
+            def progress_fn(arg):
+                return min(progress1_fn(arg), progress2_fn(arg))
+
+        case [cond1]:
+            progress_fn = compile_progress(cond1, metrics)
+
+        case str():
+            progress_fn = metrics[cond_parsed]
+
+    return progress_fn
+
+
 def process_condition(
     cond_parsed: List[str | List],
     neval: int,
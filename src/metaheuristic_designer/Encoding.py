@@ -97,3 +97,25 @@ class Encoding(ABC):
             solutions = np.asarray(solutions)
 
         return solutions
+
+    def repair_population(self, objfunc: ObjectiveFunc, population: ndarray) -> ndarray:
+        """
+        Repairs a population matrix with the repair method of the objective function.
+
+        By default the genotypes are repaired directly, encodings whose genotypes can't be
+        understood by the objective function should reimplement it.
+
+        Parameters
+        ----------
+        objfunc: ObjectiveFunc
+            Objective function that defines the restrictions of the problem.
+        population: ndarray
+            Population matrix that could be violating the restrictions of the problem.
+
+        Returns
+        -------
+        repaired_population: ndarray
+            Repaired population matrix.
+        """
+
+        return objfunc.repair_population(population)
@@ -0,0 +1,263 @@
+from __future__ import annotations
+from typing import Any
+import numpy as np
+
+
+class _RingBuffer:
+    """
+    Preallocated buffer that keeps the last 'capacity' rows appended to it.
+
+    If 'spill_file' is given, the rows are written to that file each time the buffer fills up instead of
+    being overwritten, so that they can be read later as a memory-mapped array.
+    """
+
+    def __init__(self, capacity: int, spill_file: str = None):
+        self.capacity = capacity
+        self.spill_file = spill_file
+        self.reset()
+
+    def reset(self):
+        self.data = None
+        self.count = 0
+        self.start = 0
+        self.n_spilled = 0
+
+    def append(self, row: Any):
+        row = np.asarray(row)
+
+        if self.data is None:
+            self.data = np.empty((self.capacity,) + row.shape, dtype=row.dtype)
+
+        if self.count == self.capacity:
+            if self.spill_file is not None:
+                # The file is overwritten by the first records so that the ones of a previous run are discarded
+                with open(self.spill_file, "ab" if self.n_spilled > 0 else "wb") as file:
+                    self.data.tofile(file)
+                self.n_spilled += self.capacity
+                self.count = 0
+            else:
+                self.start = (self.start + 1) % self.capacity
+                self.count -= 1
+
+        self.data[(self.start + self.count) % self.capacity] = row
+        self.count += 1
+
+    def spilled(self) -> np.ndarray:
+        """
+        Rows written to the spill file, memory-mapped so that they are only read when accessed.
+        """
+
+        if self.n_spilled == 0:
+            return np.empty((0,) + (() if self.data is None else self.data.shape[1:]))
+
+        return np.memmap(self.spill_file, dtype=self.data.dtype, mode="r", shape=(self.n_spilled,) + self.data.shape[1:])
+
+    def recent(self) -> np.ndarray:
+        """
+        Rows kept in memory, from oldest to newest.
+        """
+
+        if self.data is None:
+            return np.empty(0)
+
+        if self.start == 0:
+            return self.data[: self.count].copy()
+
+        return np.concatenate((self.data[self.start :], self.data[: self.start]))
+
+    def values(self) -> np.ndarray:
+        """
+        All the rows, from oldest to newest. The spilled rows are read into memory to join them
+        with the recent ones, use 'spilled' and 'recent' to avoid it.
+        """
+
+        if self.n_spilled == 0:
+            return self.recent()
+
+        return np.concatenate((self.spilled(), self.recent()))
+
+    def __len__(self):
+        return self.n_spilled + self.count
+
+    def _checkpoint_state(self) -> dict:
+        # Only the rows in use are stored, the buffer is preallocated again when restoring it
+        return {
+            "capacity": self.capacity,
+            "spill_file": self.spill_file,
+            "n_spilled": self.n_spilled,
+            "rows": None if self.data is None else self.recent(),
+        }
+
+    def _checkpoint_restore(self, state: dict):
+        self.capacity = state["capacity"]
+        self.spill_file = state["spill_file"]
+        self.reset()
+
+        rows = state.get("rows")
+        if rows is not None:
+            self.data = np.empty((self.capacity,) + rows.shape[1:], dtype=rows.dtype)
+            self.data[: len(rows)] = rows
+            self.count = len(rows)
+
+        self.n_spilled = state["n_spilled"]
+
+
+class HistoryRecorder:
+    """
+    Records the best fitness and (optionally) the best solution found in each generation of an algorithm using
+    a fixed amount of memory.
+
+    The fitness of the last 'size' generations is stored in a preallocated ring buffer. Snapshots of the best
+    solution can be taken every 'every' generations and/or each time the best fitness improves, keeping the
+    last 'snapshots' of them. If 'spill_file' is given, the older records are written to disk instead of
+    being discarded and can be read back as memory-mapped arrays.
+
+    Parameters
+    ----------
+    size: int, optional
+        Number of generations for which the best fitness is kept in memory.
+    every: int, optional
+        Take a snapshot of the best solution every 'every' generations, 0 to disable it.
+    on_improvement: bool, optional
+        Take a snapshot of the best solution each time the best fitness improves.
+    snapshots: int, optional
+        Number of snapshots of the best solution kept in memory, 0 to not store solutions.
+    spill_file: str, optional
+        Prefix of the files where the records that don't fit in memory will be written
+        ('<spill_file>.fitness', '<spill_file>.solutions' and '<spill_file>.generations').
+    mode: str, optional
+        Whether the objective function is maximized ("max") or minimized ("min"), used to detect improvements.
+    """
+
+    def __init__(
+        self,
+        size: int = 100000,
+        every: int = 0,
+        on_improvement: bool = True,
+        snapshots: int = 10,
+        spill_file: str = None,
+        mode: str = "max",
+    ):
+        if size < 1:
+            raise ValueError("The size of the history must be at least 1.")
+
+        self.size = size
+        self.every = every
+        self.on_improvement = on_improvement
+        self.snapshots = snapshots
+        self.spill_file = spill_file
+        self.mode = mode
+
+        fitness_file = None if spill_file is None else f"{spill_file}.fitness"
+        solution_file = None if spill_file is None else f"{spill_file}.solutions"
+        generation_file = None if spill_file is None else f"{spill_file}.generations"
+
+        self._fitness = _RingBuffer(size, fitness_file)
+        self._solutions = _RingBuffer(max(snapshots, 1), solution_file)
+        self._solution_generations = _RingBuffer(max(snapshots, 1), generation_file)
+
+        self.best_fitness = None
+        self.n_generations = 0
+
+    def reset(self):
+        """
+        Deletes all the recorded information.
+        """
+
+        self._fitness.reset()
+        self._solutions.reset()
+        self._solution_generations.reset()
+        self.best_fitness = None
+        self.n_generations = 0
+
+    def record(self, best_solution: Any, best_fitness: float):
+        """
+        Records the best solution and fitness of a generation.
+
+        Parameters
+        ----------
+        best_solution: Any
+            Best solution of the generation, only copied if a snapshot is taken.
+        best_fitness: float
+            Fitness of the best solution.
+        """
+
+        improved = self.best_fitness is None or (best_fitness > self.best_fitness if self.mode == "max" else best_fitness < self.best_fitness)
+        if improved:
+            self.best_fitness = best_fitness
+
+        take_snapshot = (self.on_improvement and improved) or (self.every > 0 and self.n_generations % self.every == 0)
+        if self.snapshots > 0 and take_snapshot:
+            self._solutions.append(best_solution)
+            self._solution_generations.append(self.n_generations)
+
+        self._fitness.append(best_fitness)
+        self.n_generations += 1
+
+    @property
+    def fitness(self) -> np.ndarray:
+        """
+        Best fitness of each of the recorded generations that are still stored.
+
+        The records written to disk are read into memory, use 'fitness_parts' to avoid it.
+        """
+
+        return self._fitness.values()
+
+    def fitness_parts(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Best fitness of the recorded generations without loading the records written to disk.
+
+        Returns
+        -------
+        spilled: ndarray
+            Fitness of the oldest generations, memory-mapped from the spill file (empty if nothing was written to disk).
+        recent: ndarray
+            Fitness of the newest generations, kept in memory.
+        """
+
+        return self._fitness.spilled(), self._fitness.recent()
+
+    @property
+    def generations(self) -> np.ndarray:
+        """
+        Generation corresponding to each of the values in 'fitness'.
+        """
+
+        n_stored = len(self._fitness)
+        return np.arange(self.n_generations - n_stored, self.n_generations)
+
+    @property
+    def solutions(self) -> np.ndarray:
+        """
+        Snapshots of the best solution that are still stored, from oldest to newest.
+
+        The snapshots written to disk are read into memory, use 'solution_parts' to avoid it.
+        """
+
+        return self._solutions.values()
+
+    def solution_parts(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Snapshots of the best solution without loading the ones written to disk.
+
+        Returns
+        -------
+        spilled: ndarray
+            Oldest snapshots, memory-mapped from the spill file (empty if nothing was written to disk).
+        recent: ndarray
+            Newest snapshots, kept in memory.
+        """
+
+        return self._solutions.spilled(), self._solutions.recent()
+
+    @property
+    def solution_generations(self) -> np.ndarray:
+        """
+        Generation in which each of the snapshots in 'solutions' was taken.
+        """
+
+        return self._solution_generations.values()
+
+    def __len__(self):
+        return self.n_generations
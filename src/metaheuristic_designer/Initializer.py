@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Any
+from typing import Any, List
 from abc import ABC, abstractmethod
 import numpy as np
 from .Population import Population
@@ -18,9 +18,11 @@ class Initializer(ABC):
         Number of individuals to be generated.
     encoding: Encoding, optional
         Encoding that will be passed to each individual.
+    storage_dtype: type, optional
+        Data type used to store the genotypes of the generated populations (for example np.float32 or np.int8).
     """
 
-    def __init__(self, pop_size: int = 1, encoding: Encoding = None):
+    def __init__(self, pop_size: int = 1, encoding: Encoding = None, storage_dtype: type = None):
         """
         Constructor for the Initializer class.
         """
@@ -29,6 +31,7 @@ class Initializer(ABC):
         if encoding is None:
             encoding = DefaultEncoding()
         self.encoding = encoding
+        self.storage_dtype = storage_dtype
 
     @abstractmethod
     def generate_random(self) -> Any:
@@ -63,9 +66,33 @@ class Initializer(ABC):
 
         return self.generate_random()
 
+    def generate_batch(self, n_indiv: int) -> np.ndarray | List[Any]:
+        """
+        Generates a batch of individuals.
+
+        By default it calls 'generate_individual' once for each individual, initializers that can
+        sample all of them with a single call to the random number generator should override it.
+
+        Parameters
+        ----------
+        n_indiv: int
+            Number of individuals to generate.
+
+        Returns
+        -------
+        new_individuals: ndarray or List[Any]
+            Matrix with one individual per row, or a list of individuals if they are not vectors.
+        """
+
+        batch = [self.generate_individual() for _ in range(n_indiv)]
+        if len(batch) > 0 and isinstance(batch[0], np.ndarray):
+            batch = np.asarray(batch)
+
+        return batch
+
     def generate_population(self, objfunc: ObjectiveFunc, n_indiv: int = None) -> Population:
         """
-        Generate n_indiv Individuals using the generate_individual method.
+        Generate n_indiv Individuals using the generate_batch method.
 
         Parameters
         ----------
@@ -83,8 +110,6 @@ class Initializer(ABC):
         if n_indiv is None:
             n_indiv = self.pop_size
 
-        population_set = [self.generate_individual() for _ in range(n_indiv)]
-        if isinstance(population_set[0], np.ndarray):
-            population_set = np.asarray(population_set)
+        population_set = self.generate_batch(n_indiv)
 
-        return Population(objfunc, genotype_set=population_set, encoding=self.encoding)
+        return Population(objfunc, genotype_set=population_set, encoding=self.encoding, dtype=self.storage_dtype)
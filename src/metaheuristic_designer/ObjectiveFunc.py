@@ -1,8 +1,28 @@
 from __future__ import annotations
 from typing import Any
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
 import numpy as np
 from numpy import ndarray
+from .parallel import get_backend, parallel_evaluate
+from .fitness_cache import FitnessCache, get_cache, solution_key, definition_digest
+from .encodings import DefaultEncoding
+
+
+class PendingEvaluation:
+    """
+    State of an evaluation started with 'ObjectiveFunc.start_evaluation' that hasn't been finished yet.
+    """
+
+    def __init__(self, population: Population, solutions: Any, adjusted: bool):
+        self.population = population
+        self.solutions = solutions
+        self.adjusted = adjusted
+        self.to_evaluate = np.empty(0, dtype=int)
+        self.all_to_evaluate = None
+        self.inverse = None
+        self.missing_keys = []
+        self.n_evaluated = 0
 
 
 class ObjectiveFunc(ABC):
@@ -23,9 +43,32 @@ class ObjectiveFunc(ABC):
         Indicates that the function will calculate the fitness of the entire population in one function call.
     recalculate: bool, optional
         Wheather to calculate the fitness of the individuals even if they were already calcualted before.
+    cache: bool | int | str | FitnessCache, optional
+        Stores the fitness of the evaluated solutions to avoid evaluating repeated solutions. It can be a boolean,
+        the maximum number of solutions stored in an LRU cache, the path of an sqlite database shared between
+        runs and processes or an already created FitnessCache.
+    count_cache_hits: bool, optional
+        Whether the solutions found in the cache count as evaluations for the stopping condition.
     """
 
-    def __init__(self, mode: str = "max", name: str = "some function", vectorized: bool = False, recalculate: bool = False):
+    # Only the number of evaluations is stored in the checkpoints, the rest is part of the definition of the problem
+    _checkpoint_include = ("counter",)
+
+    # Attributes that don't change the fitness of the solutions, ignored when identifying the problem in a persistent cache
+    _cache_ignore = ("counter", "cache", "vectorized", "recalculate")
+
+    # Maximum relative rounding error accumulated by incremental evaluations before evaluating a solution completely
+    delta_rtol = 1e-10
+
+    def __init__(
+        self,
+        mode: str = "max",
+        name: str = "some function",
+        vectorized: bool = False,
+        recalculate: bool = False,
+        cache: bool | int | str | FitnessCache = False,
+        count_cache_hits: bool = False,
+    ):
         """
         Constructor for the ObjectiveFunc class
         """
@@ -35,6 +78,7 @@ class ObjectiveFunc(ABC):
         self.factor = 1
         self.vectorized = vectorized
         self.recalculate = recalculate
+        self.cache = get_cache(cache, count_cache_hits, namespace=None)
 
         self.mode = mode
         if mode not in ["max", "min"]:
@@ -43,14 +87,59 @@ class ObjectiveFunc(ABC):
         if self.mode == "min":
             self.factor = -1
 
-    def __call__(self, population: Population, adjusted: bool = True, parallel: bool = False, threads: int = 8) -> float:
+    def __call__(self, population: Population, adjusted: bool = True, parallel: bool | str | Executor = False, threads: int = 8) -> float:
         """
         Shorthand for executing the objective function on a vector.
         """
 
-        return self.fitness(population, adjusted)
+        return self.fitness(population, adjusted, parallel, threads)
+
+    def set_cache(self, cache: bool | int | str | FitnessCache = True, count_cache_hits: bool = False, namespace: str = None):
+        """
+        Enables or disables the storage of the fitness of the evaluated solutions.
 
-    def fitness(self, population: Population, adjusted: bool = True, parallel: bool = False, threads: int = 8) -> ndarray:
+        Parameters
+        ----------
+        cache: bool | int | str | FitnessCache, optional
+            False to disable the cache, True to use an LRU cache with the default size,
+            the maximum number of solutions stored in an LRU cache, the path of an sqlite database
+            or an already created FitnessCache.
+        count_cache_hits: bool, optional
+            Whether the solutions found in the cache count as evaluations for the stopping condition.
+        namespace: str, optional
+            Identifier of the problem in an sqlite database, by default it is derived from the definition
+            of the problem with 'cache_namespace'.
+        """
+
+        self.cache = get_cache(cache, count_cache_hits, namespace=namespace)
+
+    def cache_namespace(self) -> str:
+        """
+        Identifier of the problem in persistent fitness caches.
+
+        It is built from the class and name of the objective function and a digest of the rest of its attributes
+        (the mode, the size of the solutions and the data of the problem), so that instances of the same problem
+        with different data don't share their cached fitness.
+
+        Returns
+        -------
+        namespace: str
+        """
+
+        definition = {name: value for name, value in vars(self).items() if name not in self._cache_ignore}
+
+        return f"{type(self).__qualname__}:{self.name}:{definition_digest(definition)}"
+
+    @property
+    def has_delta(self) -> bool:
+        """
+        Whether the objective function can be evaluated incrementally with 'delta_fitness', that is,
+        whether a subclass reimplements it.
+        """
+
+        return type(self).delta_fitness is not ObjectiveFunc.delta_fitness
+
+    def fitness(self, population: Population, adjusted: bool = True, parallel: bool | str | Executor = False, threads: int = 8) -> ndarray:
         """
         Returns the value of the objective function given an individual.
         If the fitness is adjusted, the sign will be switched for minimization problems
@@ -62,8 +151,11 @@ class ObjectiveFunc(ABC):
             The individual for which the fitness will be calculated.
         adjusted: bool, optional
             Whether to adjust the fitness value or not.
-        parallel: bool, optional
-            Wheather to evaluate the individuals in the population in parallel.
+        parallel: bool | str | Executor, optional
+            Wheather to evaluate the individuals in the population in parallel. It can be a boolean,
+            the name of the backend to use ("thread" for objectives that release the GIL, "process"
+            for pure python objectives) or an already created Executor. Only used if the objective
+            function is not vectorized.
         threads: int, optional
             Number of processes to use at once if calculating the fitness in parallel.
 
@@ -73,40 +165,258 @@ class ObjectiveFunc(ABC):
             Fitness value of the individual.
         """
 
-        fitness = population.fitness
-        solutions = population.decode()
-        if self.vectorized:
-            if self.recalculate:
-                solutions = solutions[population.fitness_calculated == 0, :]
+        pending = self.start_evaluation(population, adjusted)
+        to_evaluate = pending.to_evaluate
 
-            fitness_new = self.objective(solutions)
+        if to_evaluate.size == 0:
+            new_fitness = np.empty(0)
+
+        elif self.vectorized:
+            solutions_new = pending.solutions[to_evaluate]
+
+            new_fitness = self.objective(solutions_new)
             if adjusted:
-                fitness_new = self.factor * (fitness_new - self.penalize(solutions))
+                new_fitness = self.factor * (new_fitness - self.penalize(solutions_new))
 
-            if self.recalculate:
-                fitness[population.fitness_calculated == 0] = fitness_new
-            else:
-                fitness = fitness_new
+        elif get_backend(parallel) is not None:
+            new_fitness = parallel_evaluate(self, pending.solutions, to_evaluate, adjusted, parallel, threads)
 
         else:
-            for idx, (solution, already_calculated) in enumerate(zip(solutions, population.fitness_calculated)):
-                if self.recalculate or not already_calculated:
-                    value = self.objective(solution)
+            new_fitness = np.empty(to_evaluate.size)
+            for position, idx in enumerate(to_evaluate):
+                solution = pending.solutions[idx]
+                value = self.objective(solution)
 
-                    if adjusted:
-                        value = self.factor * (value - self.penalize(solution))
+                if adjusted:
+                    value = self.factor * (value - self.penalize(solution))
 
-                    fitness[idx] = value
+                new_fitness[position] = value
+
+        return self.finish_evaluation(pending, new_fitness)
+
+    def start_evaluation(self, population: Population, adjusted: bool = True) -> PendingEvaluation:
+        """
+        First half of the evaluation of a population. The fitness of the individuals that can be updated
+        incrementally or found in the cache is calculated and the ones that need to be evaluated are returned.
+
+        The evaluation is completed with 'finish_evaluation' once the fitness of the remaining individuals
+        is known, which lets them be evaluated asynchronously.
+
+        Parameters
+        ----------
+        population: Population
+            The population to be evaluated.
+        adjusted: bool, optional
+            Whether to adjust the fitness value or not.
+
+        Returns
+        -------
+        pending: PendingEvaluation
+            The state of the evaluation, 'pending.to_evaluate' holds the indices of the individuals that need
+            to be evaluated and 'pending.solutions' the decoded population.
+        """
+
+        pending = PendingEvaluation(population, population.decode(), adjusted)
 
         if self.recalculate:
-            self.counter += int(population.pop_size)
+            to_evaluate = np.arange(population.pop_size)
         else:
-            self.counter += int(population.pop_size - population.fitness_calculated.sum())
+            to_evaluate = np.flatnonzero(population.fitness_calculated == 0)
+
+        pending.n_evaluated = to_evaluate.size
+
+        # Individuals that differ in a few components from an already evaluated one are updated incrementally
+        n_delta = 0
+        if to_evaluate.size > 0 and self._delta_available(population, adjusted):
+            to_evaluate, n_delta = self._delta_evaluate(population, population.fitness, to_evaluate)
+
+        if self.cache is not None and to_evaluate.size > 0:
+            # The namespace is derived once the problem is completely built, after the constructors of the subclasses
+            if getattr(self.cache, "namespace", "") is None:
+                self.cache.namespace = self.cache_namespace()
+
+            # Repeated solutions are only looked up and evaluated once
+            solution_keys = [solution_key(pending.solutions[idx], adjusted) for idx in to_evaluate]
+            first_position = {}
+            for position, key in enumerate(solution_keys):
+                first_position.setdefault(key, position)
+            keys = list(first_position.keys())
+            unique_positions = np.fromiter(first_position.values(), dtype=int, count=len(keys))
+            pending.inverse = np.fromiter((first_position[key] for key in solution_keys), dtype=int, count=len(solution_keys))
+            pending.all_to_evaluate = to_evaluate
+
+            found, cached_fitness = self.cache.lookup(keys)
+            population.fitness[to_evaluate[unique_positions[found]]] = cached_fitness[found]
+
+            to_evaluate = to_evaluate[unique_positions[~found]]
+            pending.missing_keys = [key for key, key_found in zip(keys, found) if not key_found]
+
+            if not self.cache.count_hits:
+                pending.n_evaluated = n_delta + to_evaluate.size
+
+        pending.to_evaluate = to_evaluate
+
+        return pending
+
+    def finish_evaluation(self, pending: PendingEvaluation, new_fitness: ndarray) -> ndarray:
+        """
+        Second half of the evaluation of a population started with 'start_evaluation'.
+
+        Parameters
+        ----------
+        pending: PendingEvaluation
+            The state returned by 'start_evaluation'.
+        new_fitness: ndarray
+            Fitness of the individuals in 'pending.to_evaluate', in the same order.
+
+        Returns
+        -------
+        fitness: ndarray
+            Fitness value of each individual of the population.
+        """
+
+        population = pending.population
+        fitness = population.fitness
+
+        # The individuals that weren't updated incrementally have their exact fitness
+        evaluated = pending.to_evaluate if pending.all_to_evaluate is None else pending.all_to_evaluate
+        population.delta_error[evaluated] = 0
+
+        if pending.to_evaluate.size > 0:
+            fitness[pending.to_evaluate] = new_fitness
+
+            if self.cache is not None:
+                self.cache.store(pending.missing_keys, fitness[pending.to_evaluate])
+
+        if pending.inverse is not None:
+            fitness[pending.all_to_evaluate] = fitness[pending.all_to_evaluate[pending.inverse]]
+
+        self.counter += int(pending.n_evaluated)
 
         population.fitness_calculated = np.ones_like(population.fitness_calculated)
+        population.delta_parent = None
 
         return fitness
 
+    def _delta_available(self, population: Population, adjusted: bool) -> bool:
+        """
+        Checks whether the fitness of the population can be updated incrementally.
+
+        The fitness stored in the population must be the adjusted value of the objective without penalties
+        and the genotypes must be the solutions themselves, so that the components that changed are known.
+        """
+
+        return (
+            self.has_delta
+            and adjusted
+            and not self.recalculate
+            and getattr(population, "delta_parent", None) is not None
+            and type(population.encoding) is DefaultEncoding
+            and type(self).penalize is ObjectiveFunc.penalize
+        )
+
+    def _delta_evaluate(self, population: Population, fitness: ndarray, to_evaluate: ndarray) -> tuple[ndarray, int]:
+        """
+        Updates the fitness of the individuals that were evaluated before their last modification using 'delta_fitness'.
+
+        Each update adds rounding error to the fitness of the parent, a bound of the error accumulated since the last
+        complete evaluation is kept in 'population.delta_error'. The individuals whose error would exceed 'delta_rtol'
+        times their objective value are evaluated completely instead, which also covers the loss of precision when the
+        objective value becomes much smaller than in the previous evaluations.
+
+        Parameters
+        ----------
+        population: Population
+            The population being evaluated.
+        fitness: ndarray
+            Fitness array of the population, it holds the fitness of the individuals before being modified.
+        to_evaluate: ndarray
+            Indices of the individuals that need to be evaluated.
+
+        Returns
+        -------
+        remaining: ndarray
+            Indices of the individuals that need a complete evaluation.
+        n_delta: int
+            Number of individuals evaluated incrementally.
+        """
+
+        parent_genotype, parent_evaluated = population.delta_parent
+
+        delta_mask = parent_evaluated[to_evaluate]
+        candidates = to_evaluate[delta_mask]
+        if candidates.size == 0:
+            return to_evaluate, 0
+
+        remaining = [to_evaluate[~delta_mask]]
+        n_delta = 0
+
+        old_solutions = parent_genotype[candidates]
+        new_solutions = population.genotype_set[candidates]
+        changed = old_solutions != new_solutions
+        n_changed = np.count_nonzero(changed, axis=1)
+
+        # Individuals with the same number of changes are evaluated together
+        for n in np.unique(n_changed):
+            group = n_changed == n
+            rows = candidates[group]
+            changed_idx = np.nonzero(changed[group])[1].reshape((rows.size, n))
+            new_values = np.take_along_axis(new_solutions[group], changed_idx, axis=1)
+            prev_values = self.factor * fitness[rows]
+
+            if self.vectorized:
+                new_fitness = self.delta_fitness(old_solutions[group], prev_values, changed_idx, new_values)
+            else:
+                new_fitness = [
+                    self.delta_fitness(solution, value, idx, values)
+                    for solution, value, idx, values in zip(old_solutions[group], prev_values, changed_idx, new_values)
+                ]
+
+            new_fitness = np.asarray(new_fitness, dtype=float)
+
+            # The error of each update is bounded assuming that the terms that change don't exceed the objective
+            # value before and after the change, as in the sums of non-negative terms with an incremental version
+            error = population.delta_error[rows] + np.finfo(float).eps * (n + 2) * (np.abs(prev_values) + np.abs(new_fitness))
+            accurate = error <= self.delta_rtol * np.abs(new_fitness)
+
+            fitness[rows[accurate]] = self.factor * new_fitness[accurate]
+            population.delta_error[rows[accurate]] = error[accurate]
+            remaining.append(rows[~accurate])
+            n_delta += np.count_nonzero(accurate)
+
+        return np.sort(np.concatenate(remaining)), n_delta
+
+    def delta_fitness(self, solution: Any, fitness: float | ndarray, changed_idx: ndarray, new_values: ndarray) -> float | ndarray:
+        """
+        Calculates the objective value of a solution after changing some of its components, given the objective
+        value before the change. Reimplementing it lets local search strategies evaluate neighbours in time
+        proportional to the number of changed components instead of the size of the solution.
+
+        If the objective function is vectorized, the parameters contain one row per solution, all with the
+        same number of changed components.
+
+        The default implementation does nothing, 'has_delta' tells whether a subclass provides one.
+
+        Parameters
+        ----------
+        solution: Any
+            The solution before the change.
+        fitness: float | ndarray
+            Value of the objective function (not adjusted) of the solution before the change.
+        changed_idx: ndarray
+            Indices of the components that changed.
+        new_values: ndarray
+            New values of the components that changed.
+
+        Returns
+        -------
+        objective_value: float | ndarray
+            Value of the objective function for the modified solution, or None if it can't be calculated
+            incrementally.
+        """
+
+        return None
+
     @abstractmethod
     def objective(self, solution: Any) -> float | ndarray:
         """
@@ -139,6 +449,70 @@ class ObjectiveFunc(ABC):
             A modified version of the solution passed that satisfies the restrictions of the problem.
         """
 
+    def repair_population(self, solutions: ndarray) -> ndarray:
+        """
+        Transforms every solution of a population into one that satisfies the restrictions of the problem.
+
+        By default each solution is repaired with 'repair_solution', it should be reimplemented with
+        a vectorized version when possible.
+
+        Parameters
+        ----------
+        solutions: ndarray
+            A matrix of solutions that could be violating the restrictions of the problem.
+
+        Returns
+        -------
+        repaired_solutions: ndarray
+            A modified version of the solutions passed that satisfies the restrictions of the problem.
+        """
+
+        for idx, solution in enumerate(solutions):
+            solutions[idx] = self.repair_solution(solution)
+
+        return solutions
+
+    def repair_is_identity(self, low: float, high: float) -> bool:
+        """
+        Whether repairing solutions whose components are all between 'low' and 'high' leaves them unchanged,
+        which lets encodings skip the repair. It is only known for the default repair of vector problems.
+
+        Parameters
+        ----------
+        low: float
+            Minimum value of the components of the solutions.
+        high: float
+            Maximum value of the components of the solutions.
+
+        Returns
+        -------
+        is_identity: bool
+        """
+
+        return False
+
+    def repair_speed_population(self, speeds: ndarray) -> ndarray:
+        """
+        Transforms every speed vector of a population into one that satisfies the restrictions of the problem.
+
+        By default each vector is repaired with 'repair_speed'.
+
+        Parameters
+        ----------
+        speeds: ndarray
+            A matrix of speed vectors that could be violating the restrictions of the problem.
+
+        Returns
+        -------
+        repaired_speeds: ndarray
+            A modified version of the speed vectors passed that satisfies the restrictions of the problem.
+        """
+
+        for idx, speed in enumerate(speeds):
+            speeds[idx] = self.repair_speed(speed)
+
+        return speeds
+
     def penalize(self, _: Any) -> float | ndarray:
         """
         Gives a penalization to the fitness value of an individual if it violates any constraints propotional
@@ -187,12 +561,21 @@ class ObjectiveVectorFunc(ObjectiveFunc):
         name: str = "some function",
         vectorized: bool = False,
         recalculate: bool = False,
+        cache: bool | int | str | FitnessCache = False,
+        count_cache_hits: bool = False,
     ):
         """
         Constructor for the ObjectiveVectorFunc class
         """
 
-        super().__init__(mode=mode, name=name, vectorized=vectorized, recalculate=recalculate)
+        super().__init__(
+            mode=mode,
+            name=name,
+            vectorized=vectorized,
+            recalculate=recalculate,
+            cache=cache,
+            count_cache_hits=count_cache_hits,
+        )
 
         self.vecsize = vecsize
         self.low_lim = low_lim
@@ -201,6 +584,26 @@ class ObjectiveVectorFunc(ObjectiveFunc):
     def repair_solution(self, vector: ndarray) -> ndarray:
         return np.clip(vector, self.low_lim, self.up_lim)
 
+    def repair_population(self, solutions: ndarray) -> ndarray:
+        # Subclasses that only redefine the repair of a single solution are repaired one by one
+        if type(self).repair_solution is not ObjectiveVectorFunc.repair_solution:
+            return super().repair_population(solutions)
+
+        return np.clip(solutions, self.low_lim, self.up_lim)
+
+    def repair_is_identity(self, low: float, high: float) -> bool:
+        default_repair = (
+            type(self).repair_solution is ObjectiveVectorFunc.repair_solution
+            and type(self).repair_population is ObjectiveVectorFunc.repair_population
+        )
+        return default_repair and self.low_lim <= low and high <= self.up_lim
+
+    def repair_speed_population(self, speeds: ndarray) -> ndarray:
+        if type(self).repair_speed is not ObjectiveVectorFunc.repair_speed:
+            return super().repair_speed_population(speeds)
+
+        return self.repair_population(speeds)
+
     def repair_speed(self, speed: ndarray) -> ndarray:
         """
         Transforms an invalid vector into one that satisfies the restrictions of the problem.
@@ -264,6 +667,3 @@ class ObjectiveFromLambda(ObjectiveVectorFunc):
 
     def objective(self, vector):
         return self.obj_func(vector)
-
-    def repair_solution(self, vector):
-        return np.clip(vector, self.low_lim, self.up_lim)
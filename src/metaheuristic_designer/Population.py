@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import Tuple, Any
 from copy import copy
+import sys
+from concurrent.futures import Executor
 import numpy as np
 from numpy import ndarray
 from .encodings import DefaultEncoding
@@ -25,6 +27,13 @@ class Population:
         The ages of the individuals.
     encoding: Encoding, optional
         The encoding to be used when calculating the objective function.
+    dtype: type, optional
+        Data type used to store the genotypes (for example np.float32 or np.int8), the solutions
+        generated by the operators are converted to this type. If not specified the genotypes are
+        kept with the type they are generated with.
+
+    The speed of the individuals and the historical best solutions are only allocated when they are
+    accessed for the first time, so strategies that don't use them don't store them.
     """
 
     def __init__(
@@ -34,6 +43,7 @@ class Population:
         speed_set: ndarray = None,
         ages: ndarray = None,
         encoding: Encoding = None,
+        dtype: type = None,
     ):
         """
         Constructor of the Individual class.
@@ -43,16 +53,16 @@ class Population:
         self.objfunc = objfunc
 
         # Population of solutions
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        genotype_set = self._as_storage_type(genotype_set)
         self.genotype_set = genotype_set
 
         # Size of the population
         self.pop_size = genotype_set.shape[0]
         self.vec_size = genotype_set.shape[1]
 
-        # Speed of the individuals
-        if speed_set is None:
-            speed_set = RAND_GEN.random(genotype_set.shape)
-        self.speed_set = speed_set
+        # Speed of the individuals, generated when it is first used
+        self._speed_set = speed_set
 
         # Fitness of each individual in the population
         self.fitness = np.full(self.pop_size, -np.inf)
@@ -62,10 +72,16 @@ class Population:
         self.best = None
         self.best_fitness = None
 
-        # Best inidividual in each spot of the population
-        self.historical_best_set = genotype_set
+        # Best inidividual in each spot of the population, stored when it is first used
+        self._historical_best_set = None
         self.historical_best_fitness = np.full(self.pop_size, -np.inf)
 
+        # Last evaluated genotypes and which of them had their fitness calculated, used to update the fitness incrementally
+        self.delta_parent = None
+
+        # Bound of the rounding error accumulated in the fitness of each individual by incremental updates
+        self.delta_error = np.zeros(self.pop_size)
+
         # Ages of the individuals
         if ages is None:
             ages = np.zeros(self.pop_size)
@@ -78,6 +94,54 @@ class Population:
 
         self.index = -1
 
+    @property
+    def speed_set(self) -> ndarray:
+        """
+        Speed of each individual, randomly initialized the first time it is used.
+        """
+
+        if self._speed_set is None:
+            speed_dtype = self.genotype_set.dtype if np.issubdtype(self.genotype_set.dtype, np.floating) else np.float64
+            if speed_dtype not in (np.float32, np.float64):
+                speed_dtype = np.float64
+            self._speed_set = RAND_GEN.random(self.genotype_set.shape, dtype=speed_dtype)
+        return self._speed_set
+
+    @speed_set.setter
+    def speed_set(self, speed_set: ndarray):
+        self._speed_set = speed_set
+
+    @property
+    def historical_best_set(self) -> ndarray:
+        """
+        Best solution found in each position of the population, initialized with the current solutions the first time it is used.
+        """
+
+        if self._historical_best_set is None:
+            self._historical_best_set = self.genotype_set.copy()
+        return self._historical_best_set
+
+    @historical_best_set.setter
+    def historical_best_set(self, historical_best_set: ndarray):
+        self._historical_best_set = historical_best_set
+
+    def _as_storage_type(self, genotype_set: ndarray) -> ndarray:
+        """
+        Converts a set of solutions to the data type used to store the genotypes.
+        """
+
+        if self.dtype is None or genotype_set.dtype == self.dtype:
+            return genotype_set
+
+        if np.issubdtype(self.dtype, np.integer) and not np.issubdtype(genotype_set.dtype, np.integer):
+            genotype_set = np.round(genotype_set)
+
+        return genotype_set.astype(self.dtype)
+
+    @staticmethod
+    def _take_optional(array: ndarray, idx: Any) -> ndarray:
+        return None if array is None else copy(array[idx])
+
     def __len__(self):
         return self.genotype_set.shape[0]
 
@@ -96,13 +160,13 @@ class Population:
             "Population{"
             f"\n\tobjfunc = {self.objfunc.name}"
             f"\n\tgenotype_set = {self.genotype_set}"
-            f"\n\tspeed_set = {self.speed_set}"
+            f"\n\tspeed_set = {self._speed_set}"
             f"\n\tages = {self.ages}"
             f"\n\tpop_size = {self.pop_size}"
             f"\n\tvec_size = {self.vec_size}"
             f"\n\tfitness = {self.fitness}"
             f"\n\tfitness_calculated = {self.fitness_calculated}"
-            f"\n\thistorical_best_set = {self.historical_best_set}"
+            f"\n\thistorical_best_set = {self._historical_best_set}"
             f"\n\thistorical_best_fitness = {self.historical_best_fitness}"
             f"\n\tbest = {self.best}"
             f"\n\tbest_fitness = {self.best_fitness}"
@@ -111,10 +175,13 @@ class Population:
 
     def __copy__(self) -> Population:
 
-        copied_pop = Population(self.objfunc, copy(self.genotype_set), copy(self.speed_set), ages=copy(self.ages), encoding=self.encoding)
+        copied_pop = Population(
+            self.objfunc, copy(self.genotype_set), copy(self._speed_set), ages=copy(self.ages), encoding=self.encoding, dtype=self.dtype
+        )
         copied_pop.fitness = copy(self.fitness)
         copied_pop.fitness_calculated = copy(self.fitness_calculated)
-        copied_pop.historical_best_set = copy(self.historical_best_set)
+        copied_pop.delta_error = copy(self.delta_error)
+        copied_pop.historical_best_set = copy(self._historical_best_set)
         copied_pop.historical_best_fitness = copy(self.historical_best_fitness)
         copied_pop.best = copy(self.best)
         copied_pop.best_fitness = copy(self.best_fitness)
@@ -163,11 +230,21 @@ class Population:
         self: Population
         """
 
+        genotype_set = self._as_storage_type(genotype_set)
+
         if len(genotype_set) != len(self.genotype_set):
             self.ages = np.zeros_like(self.ages)
             self.fitness_calculated = np.zeros_like(self.fitness_calculated)
+            self.delta_error = np.zeros(len(genotype_set))
+            self.delta_parent = None
         else:
-            self.fitness_calculated = np.all(self.genotype_set == genotype_set, axis=1)
+            evaluated = self.fitness_calculated != 0
+
+            # The objective function can update the fitness of the modified individuals from the ones last evaluated
+            if self.delta_parent is None and genotype_set is not self.genotype_set and getattr(self.objfunc, "has_delta", False):
+                self.delta_parent = (self.genotype_set, evaluated)
+
+            self.fitness_calculated = np.all(self.genotype_set == genotype_set, axis=1) & evaluated
 
         self.genotype_set = genotype_set
 
@@ -194,19 +271,66 @@ class Population:
         """
 
         selected_genotype_set = copy(self.genotype_set[selection_idx, :])
-        selected_speed_set = copy(self.speed_set[selection_idx, :])
+        selected_speed_set = self._take_optional(self._speed_set, selection_idx)
         selected_ages = copy(self.ages[selection_idx])
 
-        selected_pop = Population(self.objfunc, selected_genotype_set, selected_speed_set, ages=selected_ages, encoding=self.encoding)
+        selected_pop = Population(
+            self.objfunc, selected_genotype_set, selected_speed_set, ages=selected_ages, encoding=self.encoding, dtype=self.dtype
+        )
         selected_pop.fitness = copy(self.fitness[selection_idx])
         selected_pop.fitness_calculated = copy(self.fitness_calculated[selection_idx])
-        selected_pop.historical_best_set = copy(self.historical_best_set[selection_idx, :])
+        selected_pop.delta_error = copy(self.delta_error[selection_idx])
+        selected_pop.historical_best_set = self._take_optional(self._historical_best_set, selection_idx)
         selected_pop.historical_best_fitness = copy(self.historical_best_fitness[selection_idx])
         selected_pop.best = copy(self.best)
         selected_pop.best_fitness = copy(self.best_fitness)
 
+        if self.delta_parent is not None:
+            parent_genotype, parent_evaluated = self.delta_parent
+            selected_pop.delta_parent = (parent_genotype[selection_idx], parent_evaluated[selection_idx])
+
         return selected_pop
 
+    def take_block(self, start: int, end: int) -> Population:
+        """
+        Takes a contiguous block of individuals without copying their solutions.
+
+        The solutions and speeds of the block are views of the ones in this population, so they must not
+        be modified in place. The rest of the data of each individual is copied, so that evaluating the
+        block doesn't change the fitness of this population.
+
+        Parameters
+        ----------
+        start: int
+            Position of the first individual of the block.
+        end: int
+            Position after the last individual of the block.
+
+        Returns
+        -------
+        block_population: Population
+            A population whose solutions are views of the ones in this population.
+        """
+
+        block = slice(start, end)
+        block_pop = Population(
+            self.objfunc,
+            self.genotype_set[block],
+            None if self._speed_set is None else self._speed_set[block],
+            ages=copy(self.ages[block]),
+            encoding=self.encoding,
+            dtype=self.dtype,
+        )
+        block_pop.fitness = copy(self.fitness[block])
+        block_pop.fitness_calculated = copy(self.fitness_calculated[block])
+        block_pop.delta_error = copy(self.delta_error[block])
+        block_pop.historical_best_set = self._take_optional(self._historical_best_set, block)
+        block_pop.historical_best_fitness = copy(self.historical_best_fitness[block])
+        block_pop.best = self.best
+        block_pop.best_fitness = self.best_fitness
+
+        return block_pop
+
     def apply_selection(self, selected_pop: Population, selection_idx: ndarray) -> Population:
         """
         Replaces the chosen individuals from the input population to the current population.
@@ -224,12 +348,22 @@ class Population:
         """
 
         # population_copy = copy(self)
+        self.delta_parent = None
         self.genotype_set[selection_idx, :] = selected_pop.genotype_set
-        self.speed_set[selection_idx, :] = selected_pop.speed_set
+        if self._speed_set is not None or selected_pop._speed_set is not None:
+            # Speeds that were never used are filled with zeros so that no random numbers are drawn
+            if self._speed_set is None:
+                self._speed_set = np.zeros(self.genotype_set.shape, dtype=selected_pop._speed_set.dtype)
+            if selected_pop._speed_set is None:
+                self._speed_set[selection_idx, :] = 0
+            else:
+                self._speed_set[selection_idx, :] = selected_pop._speed_set
         self.ages[selection_idx] = selected_pop.ages
         self.fitness[selection_idx] = selected_pop.fitness
         self.fitness_calculated[selection_idx] = selected_pop.fitness_calculated
-        self.historical_best_set[selection_idx, :] = selected_pop.historical_best_set
+        self.delta_error[selection_idx] = selected_pop.delta_error
+        if self._historical_best_set is not None or selected_pop._historical_best_set is not None:
+            self.historical_best_set[selection_idx, :] = selected_pop.historical_best_set
         self.historical_best_fitness[selection_idx] = selected_pop.historical_best_fitness
 
         # if selected_pop.best_fitness is None or (self.best_fitness is not None and self.best_fitness > selected_pop.best_fitness):
@@ -255,13 +389,14 @@ class Population:
         """
 
         sliced_genotype_set = copy(self.genotype_set[:, mask])
-        sliced_speed_set = copy(self.speed_set[:, mask])
+        sliced_speed_set = self._take_optional(self._speed_set, (slice(None), mask))
         sliced_ages = copy(self.ages)
 
-        sliced_pop = Population(self.objfunc, sliced_genotype_set, sliced_speed_set, ages=sliced_ages, encoding=self.encoding)
-        sliced_pop.historical_best_set = copy(self.historical_best_set[:, mask])
+        sliced_pop = Population(self.objfunc, sliced_genotype_set, sliced_speed_set, ages=sliced_ages, encoding=self.encoding, dtype=self.dtype)
+        sliced_pop.historical_best_set = self._take_optional(self._historical_best_set, (slice(None), mask))
         sliced_pop.historical_best_fitness = copy(self.historical_best_fitness)
         sliced_pop.fitness_calculated = copy(self.fitness_calculated)
+        sliced_pop.delta_error = copy(self.delta_error)
         sliced_pop.fitness = copy(self.fitness)
         sliced_pop.best = copy(self.best)
         sliced_pop.best_fitness = copy(self.best_fitness)
@@ -285,8 +420,10 @@ class Population:
         self: Population
         """
 
+        self.delta_parent = None
         self.genotype_set[:, mask] = sliced_pop.genotype_set
-        self.speed_set[:, mask] = sliced_pop.speed_set
+        if self._speed_set is not None or sliced_pop._speed_set is not None:
+            self.speed_set[:, mask] = sliced_pop.speed_set
 
         if self.best is None or (sliced_pop.best is not None and self.best_fitness < sliced_pop.best_fitness):
             self.best = sliced_pop.best
@@ -294,6 +431,17 @@ class Population:
 
         return self
 
+    @staticmethod
+    def _join_optional(population1: Population, population2: Population, field: str) -> ndarray:
+        """
+        Concatenates an optional attribute of two populations, it's only generated if any of them has it stored.
+        """
+
+        if getattr(population1, "_" + field) is None and getattr(population2, "_" + field) is None:
+            return None
+
+        return np.concatenate((getattr(population1, field), getattr(population2, field)), axis=0)
+
     @staticmethod
     def _join(population1, population2):
         """
@@ -301,13 +449,16 @@ class Population:
         """
 
         joined_genotype_set = np.concatenate((population1.genotype_set, population2.genotype_set), axis=0)
-        joined_speed_set = np.concatenate((population1.speed_set, population2.speed_set), axis=0)
+        joined_speed_set = Population._join_optional(population1, population2, "speed_set")
         joined_ages = np.concatenate((population1.ages, population2.ages))
 
-        joined_pop = Population(population1.objfunc, joined_genotype_set, joined_speed_set, ages=joined_ages, encoding=population1.encoding)
-        joined_pop.historical_best_set = np.concatenate((population1.historical_best_set, population2.historical_best_set), axis=0)
+        joined_pop = Population(
+            population1.objfunc, joined_genotype_set, joined_speed_set, ages=joined_ages, encoding=population1.encoding, dtype=population1.dtype
+        )
+        joined_pop.historical_best_set = Population._join_optional(population1, population2, "historical_best_set")
         joined_pop.historical_best_fitness = np.concatenate((population1.historical_best_fitness, population2.historical_best_fitness))
         joined_pop.fitness_calculated = np.concatenate((population1.fitness_calculated, population2.fitness_calculated))
+        joined_pop.delta_error = np.concatenate((population1.delta_error, population2.delta_error))
         joined_pop.fitness = np.concatenate((population1.fitness, population2.fitness))
 
         if population1.best is None or (population2.best is not None and population1.best_fitness < population2.best_fitness):
@@ -335,13 +486,17 @@ class Population:
             A population containing both the individuals from the current population and the ones from the input population.
         """
 
-        self.genotype_set = np.concatenate((self.genotype_set, other_population.genotype_set), axis=0)
+        joined_speed_set = self._join_optional(self, other_population, "speed_set")
+        joined_historical_best_set = self._join_optional(self, other_population, "historical_best_set")
+
+        self.genotype_set = np.concatenate((self.genotype_set, self._as_storage_type(other_population.genotype_set)), axis=0)
         self.pop_size += other_population.genotype_set.shape[0]
-        self.speed_set = np.concatenate((self.speed_set, other_population.speed_set), axis=0)
+        self.speed_set = joined_speed_set
         self.ages = np.concatenate((self.ages, other_population.ages))
-        self.historical_best_set = np.concatenate((self.historical_best_set, other_population.historical_best_set), axis=0)
+        self.historical_best_set = joined_historical_best_set
         self.historical_best_fitness = np.concatenate((self.historical_best_fitness, other_population.historical_best_fitness))
         self.fitness_calculated = np.concatenate((self.fitness_calculated, other_population.fitness_calculated), axis=0)
+        self.delta_error = np.concatenate((self.delta_error, other_population.delta_error))
         self.fitness = np.concatenate((self.fitness, other_population.fitness))
 
         if self.best is None or (other_population.best is not None and self.best_fitness < other_population.best_fitness):
@@ -361,12 +516,14 @@ class Population:
 
         fitness_order = np.argsort(self.fitness)
 
+        self.delta_parent = None
         self.genotype_set = self.genotype_set[fitness_order, :]
-        self.speed_set = self.speed_set[fitness_order, :]
+        self.speed_set = self._take_optional(self._speed_set, fitness_order)
         self.ages = self.ages[fitness_order]
-        self.historical_best_set = self.historical_best_set[fitness_order, :]
+        self.historical_best_set = self._take_optional(self._historical_best_set, fitness_order)
         self.historical_best_fitness = self.historical_best_fitness[fitness_order]
         self.fitness_calculated = self.fitness_calculated[fitness_order]
+        self.delta_error = self.delta_error[fitness_order]
         self.fitness = self.fitness[fitness_order]
 
         return self
@@ -404,7 +561,7 @@ class Population:
         """
         if self.best is None or np.any(self.best_fitness < self.fitness):
             best_idx = np.argmax(self.fitness)
-            self.best = self.genotype_set[best_idx, :]
+            self.best = self.genotype_set[best_idx, :].copy()
             self.best_fitness = self.fitness[best_idx]
 
         if increase_age:
@@ -428,18 +585,25 @@ class Population:
         """
 
         genotype_set = np.tile(self.genotype_set, (amount, 1))
-        speed_set = np.tile(self.speed_set, (amount, 1))
+        speed_set = None if self._speed_set is None else np.tile(self._speed_set, (amount, 1))
         ages = np.tile(self.ages, amount)
-        return Population(self.objfunc, genotype_set, speed_set, ages=ages, encoding=self.encoding)
 
-    def calculate_fitness(self, parallel: bool = False, threads: int = 8) -> ndarray:
+        repeated_pop = Population(self.objfunc, genotype_set, speed_set, ages=ages, encoding=self.encoding, dtype=self.dtype)
+        repeated_pop.fitness = np.tile(self.fitness, amount)
+        repeated_pop.fitness_calculated = np.tile(self.fitness_calculated, amount)
+        repeated_pop.delta_error = np.tile(self.delta_error, amount)
+
+        return repeated_pop
+
+    def calculate_fitness(self, parallel: bool | str | Executor = False, threads: int = 8) -> ndarray:
         """
         Calculates the fitness of the individual if it has not been calculated before
 
         Parameters
         ----------
-        parallel: bool, optional
-            Wheather to evaluate the individuals in the population in parallel.
+        parallel: bool | str | Executor, optional
+            Wheather to evaluate the individuals in the population in parallel. Either a boolean, the name of
+            the backend ("thread" or "process") or an already created Executor.
         threads: int, optional
             Number of processes to use at once if calculating the fitness in parallel.
 
@@ -456,11 +620,12 @@ class Population:
         else:
             improved_mask = prev_fitness < self.fitness
             self.historical_best_fitness[improved_mask] = self.fitness[improved_mask]
-            self.historical_best_set[improved_mask, :] = self.genotype_set[improved_mask, :]
+            if self._historical_best_set is not None:
+                self.historical_best_set[improved_mask, :] = self.genotype_set[improved_mask, :]
 
         if self.best is None or np.any(self.fitness > self.best_fitness):
             best_idx = np.argmax(self.fitness)
-            self.best = self.genotype_set[best_idx]
+            self.best = self.genotype_set[best_idx].copy()
             self.best_fitness = self.fitness[best_idx]
 
         return self.fitness
@@ -474,10 +639,9 @@ class Population:
         self: Population
         """
 
-        for idx, indiv in enumerate(self.genotype_set):
-            self.genotype_set[idx] = self.objfunc.repair_solution(indiv)
-            if self.speed_set is not None:
-                self.speed_set[idx] = self.objfunc.repair_speed(self.speed_set[idx])
+        self.genotype_set[:] = self.encoding.repair_population(self.objfunc, self.genotype_set)
+        if self._speed_set is not None:
+            self.speed_set[:] = self.objfunc.repair_speed_population(self.speed_set)
 
         return self
 
@@ -517,8 +681,231 @@ class Population:
             "best": self.best,
             "best_fitness": self.best_fitness,
             "ages": self.ages,
-            "speed": self.speed_set,
+            "speed": self._speed_set,
             "encoding": type(self.encoding).__name__,
         }
 
         return data
+
+
+class PopulationArena:
+    """
+    Preallocated storage used to build the population selected in each generation without allocating new arrays.
+
+    The arena holds a pool with a slot for each parent and each offspring individual and two output buffers.
+    In each selection the parents and the offspring are written in the pool and the selected individuals are
+    gathered into the output buffer that is not being used by the current population, so the buffers are swapped
+    every generation instead of being reallocated. The buffers only grow when a bigger population is selected.
+
+    A buffer is only reused if nothing outside of the arena references it anymore, so populations (or arrays of
+    them) that are kept by the caller are never overwritten, a new buffer is allocated instead.
+    """
+
+    # Attributes of the population stored per individual
+    _fields = [
+        "genotype_set",
+        "speed_set",
+        "ages",
+        "fitness",
+        "fitness_calculated",
+        "delta_error",
+        "historical_best_set",
+        "historical_best_fitness",
+    ]
+
+    # Attributes that are only stored if the populations have them allocated
+    _optional_fields = ["speed_set", "historical_best_set"]
+
+    # Array only referenced by this dictionary, used to know the reference count of an unused buffer
+    _refcount_probe = {"probe": np.empty(0)}
+
+    def __init__(self):
+        """
+        Constructor of the PopulationArena class.
+        """
+
+        self.pool = None
+        self.buffers = [None, None]
+        self.current = 0
+
+    def _checkpoint_state(self) -> dict:
+        # The buffers only hold reusable storage, they are allocated again after resuming from a checkpoint
+        return {}
+
+    def _checkpoint_restore(self, state: dict):
+        self.__init__()
+
+    @staticmethod
+    def _fits(storage: dict, template: dict, n_rows: int) -> bool:
+        if storage is None:
+            return False
+
+        for field, array in template.items():
+            stored = storage.get(field)
+            if stored is None or stored.shape[0] < n_rows or stored.shape[1:] != array.shape[1:] or stored.dtype != array.dtype:
+                return False
+
+        return True
+
+    @staticmethod
+    def _allocate(template: dict, n_rows: int) -> dict:
+        return {field: np.empty((n_rows,) + array.shape[1:], dtype=array.dtype) for field, array in template.items()}
+
+    @staticmethod
+    def _referenced(storage: dict) -> bool:
+        """
+        Whether any array of the storage is referenced from outside of the arena, every population
+        and every view taken from the buffer holds a reference to it.
+
+        This relies on the reference counting of CPython, where sys.getrefcount gives the exact number of references.
+        Instead of a fixed threshold, the counts are compared with the one of an array only referenced by a dictionary,
+        like the buffers, so the check doesn't depend on how many temporary references a given version of CPython adds.
+        Other implementations (PyPy) don't give meaningful counts, there the buffers are always considered referenced
+        and a new one is allocated in every selection.
+        """
+
+        if sys.implementation.name != "cpython":
+            return True
+
+        (unused_count,) = [sys.getrefcount(array) for array in PopulationArena._refcount_probe.values()]
+        return any(count > unused_count for count in [sys.getrefcount(array) for array in storage.values()])
+
+    def _output_buffer(self, template: dict, n_rows: int) -> dict:
+        """
+        Swaps to the output buffer that is not holding the current population, allocating it if it is too small
+        or if it is still in use.
+        """
+
+        buffer_idx = 1 - self.current
+        buffer = self.buffers[buffer_idx]
+
+        if not self._fits(buffer, template, n_rows) or self._referenced(buffer):
+            buffer = self._allocate(template, n_rows)
+            self.buffers[buffer_idx] = buffer
+
+        self.current = buffer_idx
+
+        return buffer
+
+    @staticmethod
+    def _build_population(population: Population, arrays: dict) -> Population:
+        """
+        Creates a population that holds the given arrays, with the same objective function and encoding as 'population'.
+        """
+
+        new_population = Population(
+            population.objfunc,
+            arrays["genotype_set"],
+            arrays["speed_set"],
+            ages=arrays["ages"],
+            encoding=population.encoding,
+            dtype=population.dtype,
+        )
+        new_population.fitness = arrays["fitness"]
+        new_population.fitness_calculated = arrays["fitness_calculated"]
+        new_population.delta_error = arrays["delta_error"]
+        new_population.historical_best_set = arrays["historical_best_set"]
+        new_population.historical_best_fitness = arrays["historical_best_fitness"]
+
+        return new_population
+
+    def empty_like(self, population: Population) -> Population:
+        """
+        Builds a population with the same size and attributes as the given one stored in one of the buffers of the arena.
+
+        The values of the individuals are left uninitialized, they are meant to be written in place
+        with 'apply_selection'.
+
+        Parameters
+        ----------
+        population: Population
+            Population used as a template.
+
+        Returns
+        -------
+        new_population: Population
+            A population stored in one of the buffers of the arena.
+        """
+
+        n_rows = population.pop_size
+        fields = [field for field in self._fields if field not in self._optional_fields or getattr(population, "_" + field) is not None]
+        template = {field: getattr(population, field)[:0] for field in fields}
+
+        buffer = self._output_buffer(template, n_rows)
+
+        arrays = dict.fromkeys(self._optional_fields)
+        for field in fields:
+            arrays[field] = buffer[field][:n_rows]
+
+        new_population = self._build_population(population, arrays)
+        new_population.best = population.best
+        new_population.best_fitness = population.best_fitness
+
+        return new_population
+
+    def select(self, population: Population, offspring: Population, selection_idx: ndarray) -> Population:
+        """
+        Builds a population with the chosen individuals from the parents followed by the offspring.
+
+        Equivalent to 'population.join(offspring).take_selection(selection_idx)' without modifying the
+        input populations.
+
+        Parameters
+        ----------
+        population: Population
+            The current population.
+        offspring: Population
+            The newly generated individuals.
+        selection_idx: ndarray
+            Indices of the chosen individuals, where the offspring is indexed after the parents.
+
+        Returns
+        -------
+        selected_population: Population
+            A population stored in one of the buffers of the arena.
+        """
+
+        selection_idx = np.asarray(selection_idx)
+        if selection_idx.dtype == bool:
+            selection_idx = np.flatnonzero(selection_idx)
+
+        n_parents = population.pop_size
+        n_total = n_parents + offspring.pop_size
+        n_selected = selection_idx.shape[0]
+
+        fields = [
+            field
+            for field in self._fields
+            if field not in self._optional_fields or getattr(population, "_" + field) is not None or getattr(offspring, "_" + field) is not None
+        ]
+
+        template = {}
+        for field in fields:
+            parent_array = getattr(population, field)
+            offspring_array = getattr(offspring, field)
+            dtype = np.result_type(parent_array.dtype, offspring_array.dtype)
+            template[field] = np.empty((0,) + parent_array.shape[1:], dtype=dtype)
+
+        if not self._fits(self.pool, template, n_total):
+            self.pool = self._allocate(template, n_total)
+
+        buffer = self._output_buffer(template, n_selected)
+
+        selected_arrays = dict.fromkeys(self._optional_fields)
+        for field in fields:
+            pool = self.pool[field][:n_total]
+            pool[:n_parents] = getattr(population, field)
+            pool[n_parents:] = getattr(offspring, field)
+
+            selected_arrays[field] = np.take(pool, selection_idx, axis=0, out=buffer[field][:n_selected])
+
+        selected_pop = self._build_population(population, selected_arrays)
+
+        if population.best is None or (offspring.best is not None and population.best_fitness < offspring.best_fitness):
+            selected_pop.best = offspring.best
+            selected_pop.best_fitness = offspring.best_fitness
+        else:
+            selected_pop.best = population.best
+            selected_pop.best_fitness = population.best_fitness
+
+        return selected_pop
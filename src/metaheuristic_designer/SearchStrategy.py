@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import Tuple, Any
+from concurrent.futures import Executor
 from abc import ABC
 from .ParamScheduler import ParamScheduler
 from .selectionMethods import (
@@ -164,15 +165,16 @@ class SearchStrategy:
 
         return self.population
 
-    def evaluate_population(self, population: Population, parallel: bool = False, threads: int = 8) -> Population:
+    def evaluate_population(self, population: Population, parallel: bool | str | Executor = False, threads: int = 8) -> Population:
         """
         Calculates the fitness of the individuals on the population.
 
         Parameters
         ----------
         population: Population
-        parallel: bool, optional
-            Wheather to evaluate the individuals in the population in parallel.
+        parallel: bool | str | Executor, optional
+            Wheather to evaluate the individuals in the population in parallel. Either a boolean, the name of
+            the backend ("thread" or "process") or an already created Executor.
         threads: int, optional
             Number of processes to use at once if calculating the fitness in parallel.
 
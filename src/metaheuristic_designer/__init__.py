@@ -30,4 +30,6 @@ from . import benchmarks
 
 from .ParamScheduler import ParamScheduler
 
+from .HistoryRecorder import HistoryRecorder
+
 __version__ = "0.2.0"
@@ -1,8 +1,6 @@
 from __future__ import annotations
 from typing import Iterable, Tuple, Any
 from collections import Counter
-import pandas as pd
-import enlighten
 from ..Algorithm import Algorithm
 from ..ParamScheduler import ParamScheduler
 
@@ -51,6 +49,10 @@ class AlgorithmSelection:
         if self.verbose:
             print(f"Running {len(self.algorithm_list)} algorithms {self.repetitions} times each.")
 
+        # Imported here to keep the import of the package fast
+        import pandas as pd
+        import enlighten
+
         best_solution = None
         best_fitness = 0
         report_raw = pd.DataFrame(columns=["name", "realtime", "cputime", "fitness"])
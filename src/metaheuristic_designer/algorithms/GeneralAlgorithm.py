@@ -34,12 +34,12 @@ class GeneralAlgorithm(Algorithm):
             print("original population", population)
 
         # Generate their parents
-        parents = self.search_strategy.select_parents(new_population, progress=self.progress, history=self.best_history)
+        parents = self.search_strategy.select_parents(new_population, progress=self.progress, history=self.history)
         if self.debug:
             print("Parent selection", population)
 
         # Evolve the selected parents
-        offspring = self.search_strategy.perturb(parents, progress=self.progress, history=self.best_history)
+        offspring = self.search_strategy.perturb(parents, progress=self.progress, history=self.history)
         if self.debug:
             print("Perturbed", offspring)
 
@@ -49,7 +49,7 @@ class GeneralAlgorithm(Algorithm):
             print("Evaluated", offspring)
 
         # Select the individuals that remain for the next generation
-        new_population = self.search_strategy.select_individuals(population, offspring, progress=self.progress, history=self.best_history)
+        new_population = self.search_strategy.select_individuals(population, offspring, progress=self.progress, history=self.history)
         if self.debug:
             print("Selected", new_population)
 
@@ -63,8 +63,7 @@ class GeneralAlgorithm(Algorithm):
 
         # Store information
         best_individual, best_fitness = self.search_strategy.best_solution()
-        self.best_history.append(best_individual)
-        self.fit_history.append(best_fitness)
+        self.history.record(best_individual, best_fitness)
 
         if self.debug_stop:
             raise Exception()
@@ -76,10 +76,10 @@ class MemeticAlgorithm(Algorithm):
         new_population = copy(population)
 
         # Generate their parents
-        parents = self.search_strategy.select_parents(new_population, progress=self.progress, history=self.best_history)
+        parents = self.search_strategy.select_parents(new_population, progress=self.progress, history=self.history)
 
         # Evolve the selected parents
-        offspring = self.search_strategy.perturb(parents, progress=self.progress, history=self.best_history)
+        offspring = self.search_strategy.perturb(parents, progress=self.progress, history=self.history)
 
         # Get the fitness of the individuals
         offspring = self.search_strategy.evaluate_population(offspring, self.parallel, self.threads)
@@ -88,7 +88,7 @@ class MemeticAlgorithm(Algorithm):
         offspring = self._do_local_search(offspring)
 
         # Select the individuals that remain for the next generation
-        new_population = self.search_strategy.select_individuals(population, offspring, progress=self.progress, history=self.best_history)
+        new_population = self.search_strategy.select_individuals(population, offspring, progress=self.progress, history=self.history)
 
         # Assign the newly generated population
         self.search_strategy.population = new_population
@@ -98,8 +98,7 @@ class MemeticAlgorithm(Algorithm):
 
         # Store information
         best_individual, best_fitness = self.search_strategy.best_solution()
-        self.best_history.append(best_individual)
-        self.fit_history.append(best_fitness)
+        self.history.record(best_individual, best_fitness)
 
         return new_population
 
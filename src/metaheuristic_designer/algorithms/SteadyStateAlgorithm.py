@@ -0,0 +1,258 @@
+from __future__ import annotations
+from copy import copy
+from concurrent.futures import wait, FIRST_COMPLETED
+import numpy as np
+from ..parallel import get_backend, create_executor, submit_evaluation, SharedMemoryEvaluator
+from ..selectionMethods import SurvivorSelection, SurvSelMethod
+from .GeneralAlgorithm import GeneralAlgorithm
+
+# Survivor selection methods that compare each individual of the offspring with its parent
+_pairwise_methods = [
+    SurvSelMethod.ONE_TO_ONE,
+    SurvSelMethod.PROB_ONE_TO_ONE,
+    SurvSelMethod.MANY_TO_ONE,
+    SurvSelMethod.PROB_MANY_TO_ONE,
+]
+
+# Survivor selection methods that replace the population with the offspring
+_full_offspring_methods = [
+    SurvSelMethod.GENERATIONAL,
+    SurvSelMethod.MU_COMMA_LAMBDA,
+    SurvSelMethod.ELITISM,
+    SurvSelMethod.COND_ELITISM,
+]
+
+
+class SteadyStateAlgorithm(GeneralAlgorithm):
+    """
+    Asynchronous steady-state version of the general framework for metaheuristic algorithms.
+
+    Instead of waiting for the whole offspring to be evaluated, new individuals are generated and sent to be
+    evaluated each time a worker is free, and the evaluated individuals are inserted into the population
+    with the survivor selection method of the search strategy as soon as their fitness is available.
+
+    Survivor selection methods that compare each individual with its parent (one-to-one, many-to-one and their
+    probabilistic versions) are applied to each individual as it arrives. Other methods are applied to batches
+    of 'batch_size' individuals, methods that replace the population with the offspring (generational, (m,n), elitism)
+    will use batches the size of the population.
+
+    Parameters
+    ----------
+
+    objfunc: ObjectiveFunc
+        Objective function to be optimized.
+    search_strategy: Algorithm
+        Search strategy that will iteratively optimize the function.
+    params: ParamScheduler or dict, optional
+        Dictionary of parameters to define the stopping condition and output of the algorithm.
+        Additionally accepts "batch_size", the number of evaluated individuals to gather before applying the survivor selection.
+    """
+
+    # The pool of workers created by the algorithm can't be stored, a new one is created after resuming
+    _checkpoint_exclude = GeneralAlgorithm._checkpoint_exclude + ("_evaluator",)
+
+    def __init__(self, objfunc, search_strategy, params=None, name=None):
+        """
+        Constructor of the SteadyStateAlgorithm class
+        """
+
+        super().__init__(objfunc, search_strategy, params, name)
+
+        if params is None:
+            params = {}
+
+        # The evaluations are always done by a pool of workers
+        if get_backend(self.parallel) is None:
+            self.parallel = "thread"
+
+        self.batch_size = params.get("batch_size", 1)
+
+        self.pending = {}
+        self.arrived = []
+        self.next_offspring = 0
+        self._evaluator = None
+
+    @property
+    def name(self):
+        backup_name = f"Steady-state {self.search_strategy.name}"
+        return self._name if self._name else backup_name
+
+    @name.setter
+    def name(self, new_name: str):
+        self._name = new_name
+
+    def restart(self, reset_objfunc=True):
+        super().restart(reset_objfunc)
+        self._shutdown_evaluator()
+
+        self.pending = {}
+        self.arrived = []
+        self.next_offspring = 0
+
+    def _get_evaluator(self):
+        """
+        Gets the pool of workers where the individuals are evaluated.
+
+        If 'parallel' holds the name of a backend, which happens when the steps are run outside of 'optimize',
+        a pool of workers is created the first time it is needed and kept until '_shutdown_evaluator' is called.
+        """
+
+        backend = get_backend(self.parallel)
+        if not isinstance(backend, str):
+            return backend
+
+        if self._evaluator is None:
+            if backend == "shared_memory":
+                self._evaluator = SharedMemoryEvaluator(self.objfunc, self.threads).start()
+            else:
+                self._evaluator = create_executor(backend, self.threads)
+
+        return self._evaluator
+
+    def _shutdown_evaluator(self):
+        """
+        Discards the evaluations in progress and stops the pool of workers created by the algorithm, if any.
+        """
+
+        for future in self.pending:
+            future.cancel()
+        self.pending = {}
+
+        if self._evaluator is not None:
+            self._evaluator.shutdown(wait=True, cancel_futures=True)
+            self._evaluator = None
+
+    def _survivor_method(self):
+        survivor_sel = self.search_strategy.survivor_sel
+        if isinstance(survivor_sel, SurvivorSelection):
+            return survivor_sel.method
+        return SurvSelMethod.GENERATIONAL
+
+    def _fill_workers(self):
+        """
+        Generates new offspring and sends it to be evaluated until all the workers are busy.
+
+        Only the parents whose offspring is going to be evaluated are perturbed, operators that combine
+        individuals take their partners among them.
+        """
+
+        population = self.search_strategy.population
+        n_free = self.threads - len(self.pending)
+
+        if n_free <= 0:
+            return
+
+        evaluator = self._get_evaluator()
+
+        parents = self.search_strategy.select_parents(copy(population), progress=self.progress, history=self.history)
+
+        # Position in the population of each parent, needed to compare the offspring with its parent
+        parent_sel = getattr(self.search_strategy, "parent_sel", None)
+        selection_idx = getattr(parent_sel, "last_selection_idx", None)
+        if selection_idx is None or len(selection_idx) != parents.pop_size:
+            selection_idx = range(parents.pop_size)
+        selection_idx = np.asarray(selection_idx)
+
+        # Take the parents in turns so that every parent gets its offspring evaluated
+        chosen_idx = (self.next_offspring + np.arange(n_free)) % parents.pop_size
+        self.next_offspring = (self.next_offspring + n_free) % parents.pop_size
+
+        offspring = self.search_strategy.perturb(parents.take_selection(chosen_idx), progress=self.progress, history=self.history)
+
+        for idx, parent_idx in enumerate(selection_idx[chosen_idx]):
+            individual = offspring.take_selection(np.array([idx]))
+
+            # Cached and incrementally evaluated individuals don't need to be sent to the workers
+            evaluation = self.objfunc.start_evaluation(individual)
+            if evaluation.to_evaluate.size == 0:
+                self._store_result(evaluation, np.empty(0), parent_idx)
+            else:
+                solutions = [evaluation.solutions[i] for i in evaluation.to_evaluate]
+                future = submit_evaluation(self.objfunc, solutions, executor=evaluator)
+                self.pending[future] = (evaluation, parent_idx)
+
+    def _store_result(self, evaluation, fitness, parent_idx):
+        """
+        Finishes the evaluation of an individual and stores it to be inserted in the population.
+        """
+
+        self.objfunc.finish_evaluation(evaluation, fitness)
+
+        individual = evaluation.population
+        individual.update()
+        self.arrived.append((individual, parent_idx))
+
+    def _collect_results(self):
+        """
+        Waits for at least one evaluation to end and stores the evaluated individuals.
+        """
+
+        if not self.pending:
+            return
+
+        done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            evaluation, parent_idx = self.pending.pop(future)
+            self._store_result(evaluation, future.result(), parent_idx)
+
+    def _fold_results(self):
+        """
+        Inserts the evaluated individuals in the population using the survivor selection method.
+        """
+
+        population = self.search_strategy.population
+        method = self._survivor_method()
+
+        if method in _pairwise_methods:
+            for individual, parent_idx in self.arrived:
+                parent_mask = np.array([parent_idx])
+                parent = population.take_selection(parent_mask)
+                selected = self.search_strategy.select_individuals(parent, individual, progress=self.progress, history=self.history)
+                population = population.apply_selection(selected, parent_mask)
+
+            self.arrived = []
+        else:
+            batch_size = self.batch_size
+            if method in _full_offspring_methods:
+                batch_size = max(batch_size, population.pop_size)
+
+            if len(self.arrived) >= batch_size:
+                offspring = self.arrived[0][0]
+                for individual, _ in self.arrived[1:]:
+                    offspring = offspring.join(individual)
+
+                population = self.search_strategy.select_individuals(population, offspring, progress=self.progress, history=self.history)
+                self.arrived = []
+
+        self.search_strategy.population = population
+
+        return population
+
+    def step(self, time_start=0, verbose=False):
+        # Keep all the workers busy
+        self._fill_workers()
+
+        # Get the individuals that have finished being evaluated
+        self._collect_results()
+
+        # Select the individuals that remain for the next generation
+        new_population = self._fold_results()
+
+        # Get information about the algorithm to track it's progress
+        self.search_strategy.update_params(progress=self.progress)
+
+        # Store information
+        best_individual, best_fitness = self.search_strategy.best_solution()
+        self.history.record(best_individual, best_fitness)
+
+        return new_population
+
+    def optimize(self, initialize=True):
+        try:
+            population = super().optimize(initialize)
+        finally:
+            # Evaluations in progress are discarded when the stopping condition is met
+            self._shutdown_evaluator()
+
+        return population
@@ -1,6 +1,5 @@
 from __future__ import annotations
 from typing import Tuple, Any, Iterable
-import pandas as pd
 from ..ParamScheduler import ParamScheduler
 from ..SearchStrategy import SearchStrategy
 from ..ObjectiveFunc import ObjectiveFunc
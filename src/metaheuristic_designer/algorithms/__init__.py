@@ -1,4 +1,5 @@
 from .GeneralAlgorithm import GeneralAlgorithm
 from .MemeticAlgorithm import MemeticAlgorithm
+from .SteadyStateAlgorithm import SteadyStateAlgorithm
 from .AlgorithmSelection import AlgorithmSelection
 from .StrategySelection import StrategySelection
@@ -1,48 +1,82 @@
+import math
 import numpy as np
 
-# from numba import jit
 from ..ObjectiveFunc import ObjectiveVectorFunc
 from ..utils import RAND_GEN
+from ..bitpack import popcount, padding_mask
+from ..kernels import register_kernel
 import time
 
 
 class MaxOnes(ObjectiveVectorFunc):
-    def __init__(self, size, opt="max"):
+    """
+    Counts the number of ones in a binary vector.
+
+    With 'packed' set the solutions are binary vectors packed in 64 bit words (see 'BitPackInitializer')
+    and the ones are counted a whole word at a time.
+    """
+
+    def __init__(self, size, opt="max", packed=False):
         self.size = size
-        super().__init__(self.size, opt, name="Max ones")
+        self.packed = packed
+        super().__init__(self.size, opt, name="Max ones", vectorized=True)
 
     def objective(self, solution):
-        return solution.sum()
+        if self.packed:
+            return popcount(solution)
+        return solution.sum(axis=-1)
+
+    def delta_fitness(self, solution, fitness, changed_idx, new_values):
+        old_values = np.take_along_axis(solution, changed_idx, axis=-1)
+        if self.packed:
+            return fitness + popcount(new_values) - popcount(old_values)
+        return fitness + (new_values - old_values).sum(axis=-1)
 
     def repair_solution(self, solution):
+        if self.packed:
+            return solution & padding_mask(self.size)
         return (solution >= 0.5).astype(np.int32)
 
+    def repair_population(self, solutions):
+        if self.packed:
+            return solutions & padding_mask(self.size)
+        return (solutions >= 0.5).astype(np.int32)
+
 
 class DiophantineEq(ObjectiveVectorFunc):
     def __init__(self, size, coeff, target, opt="min"):
         self.size = size
         self.coeff = coeff
         self.target = target
-        super().__init__(self.size, opt, name="Diophantine equation")
+        super().__init__(self.size, opt, name="Diophantine equation", vectorized=True)
 
     def objective(self, solution):
-        return abs((solution * self.coeff).sum() - self.target)
+        return np.abs((solution * self.coeff).sum(axis=-1) - self.target)
 
     def repair_solution(self, solution):
         return solution.astype(np.int32)
 
+    def repair_population(self, solutions):
+        return solutions.astype(np.int32)
+
 
 class MaxOnesReal(ObjectiveVectorFunc):
     def __init__(self, size, opt="max"):
         self.size = size
-        super().__init__(self.size, opt, name="Max ones")
+        super().__init__(self.size, opt, name="Max ones", vectorized=True)
 
     def objective(self, solution):
-        return solution.sum()
+        return solution.sum(axis=-1)
+
+    def delta_fitness(self, solution, fitness, changed_idx, new_values):
+        return fitness + (new_values - np.take_along_axis(solution, changed_idx, axis=-1)).sum(axis=-1)
 
     def repair_solution(self, solution):
         return np.clip(solution.copy(), 0, 1)
 
+    def repair_population(self, solutions):
+        return np.clip(solutions, 0, 1)
+
 
 class SleepTest(ObjectiveVectorFunc):
     def __init__(self, size, sleep_time=2, opt="min"):
@@ -59,25 +93,35 @@ class SleepTest(ObjectiveVectorFunc):
 class Sphere(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -100, 100, name="Sphere function")
+        super().__init__(self.size, opt, -100, 100, name="Sphere function", vectorized=True)
 
     def objective(self, solution):
         return _sphere(solution)
 
+    def delta_fitness(self, solution, fitness, changed_idx, new_values):
+        old_values = np.take_along_axis(solution, changed_idx, axis=-1)
+        return fitness + (_sphere_terms(new_values) - _sphere_terms(old_values)).sum(axis=-1)
+
 
 class HighCondElliptic(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -5.12, 5.12, name="High condition elliptic function")
+        super().__init__(self.size, opt, -5.12, 5.12, name="High condition elliptic function", vectorized=True)
 
     def objective(self, solution):
         return _high_cond_elipt_f(solution)
 
+    def delta_fitness(self, solution, fitness, changed_idx, new_values):
+        old_values = np.take_along_axis(solution, changed_idx, axis=-1)
+        return fitness + (
+            _high_cond_elipt_terms(new_values, changed_idx, self.size) - _high_cond_elipt_terms(old_values, changed_idx, self.size)
+        ).sum(axis=-1)
+
 
 class BentCigar(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -100, 100, name="Bent Cigar function")
+        super().__init__(self.size, opt, -100, 100, name="Bent Cigar function", vectorized=True)
 
     def objective(self, solution):
         return _bent_cigar(solution)
@@ -86,7 +130,7 @@ class BentCigar(ObjectiveVectorFunc):
 class Discus(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -5.12, 5.12, name="Discus function")
+        super().__init__(self.size, opt, -5.12, 5.12, name="Discus function", vectorized=True)
 
     def objective(self, solution):
         return _discus(solution)
@@ -95,7 +139,7 @@ class Discus(ObjectiveVectorFunc):
 class Rosenbrock(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -100, 100, name="Rosenbrock function")
+        super().__init__(self.size, opt, -100, 100, name="Rosenbrock function", vectorized=True)
 
     def objective(self, solution):
         return _rosenbrock(solution)
@@ -104,7 +148,7 @@ class Rosenbrock(ObjectiveVectorFunc):
 class Ackley(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -5.12, 5.12, name="Ackley function")
+        super().__init__(self.size, opt, -5.12, 5.12, name="Ackley function", vectorized=True)
 
     def objective(self, solution):
         return _ackley(solution)
@@ -113,7 +157,7 @@ class Ackley(ObjectiveVectorFunc):
 class Weierstrass(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -100, 100, name="Weierstrass function")
+        super().__init__(self.size, opt, -100, 100, name="Weierstrass function", vectorized=True)
 
     def objective(self, solution):
         return _weierstrass(solution)
@@ -122,7 +166,7 @@ class Weierstrass(ObjectiveVectorFunc):
 class Griewank(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -100, 100, name="Griewank function")
+        super().__init__(self.size, opt, -100, 100, name="Griewank function", vectorized=True)
 
     def objective(self, solution):
         return _griewank(solution)
@@ -131,16 +175,20 @@ class Griewank(ObjectiveVectorFunc):
 class Rastrigin(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -5.12, 5.12, name="Rastrigin function")
+        super().__init__(self.size, opt, -5.12, 5.12, name="Rastrigin function", vectorized=True)
 
     def objective(self, solution):
         return _rastrigin(solution)
 
+    def delta_fitness(self, solution, fitness, changed_idx, new_values):
+        old_values = np.take_along_axis(solution, changed_idx, axis=-1)
+        return fitness + (_rastrigin_terms(new_values) - _rastrigin_terms(old_values)).sum(axis=-1)
+
 
 class ModSchwefel(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -100, 100, name="Modified Schweafel function")
+        super().__init__(self.size, opt, -100, 100, name="Modified Schweafel function", vectorized=True)
 
     def objective(self, solution):
         return _mod_schwefel(solution)
@@ -149,7 +197,7 @@ class ModSchwefel(ObjectiveVectorFunc):
 class Katsuura(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -100, 100, name="Katsuura function")
+        super().__init__(self.size, opt, -100, 100, name="Katsuura function", vectorized=True)
 
     def objective(self, solution):
         return _katsuura(solution)
@@ -158,7 +206,7 @@ class Katsuura(ObjectiveVectorFunc):
 class HappyCat(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -2, 2, name="Happy Cat function")
+        super().__init__(self.size, opt, -2, 2, name="Happy Cat function", vectorized=True)
 
     def objective(self, solution):
         return _happy_cat(solution)
@@ -167,7 +215,7 @@ class HappyCat(ObjectiveVectorFunc):
 class HGBat(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -2, 2, name="HGBat function")
+        super().__init__(self.size, opt, -2, 2, name="HGBat function", vectorized=True)
 
     def objective(self, solution):
         return _hgbat(solution)
@@ -176,7 +224,7 @@ class HGBat(ObjectiveVectorFunc):
 class ExpandedGriewankPlusRosenbrock(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -100, 100, name="Expanded Griewank + Rosenbrock")
+        super().__init__(self.size, opt, -100, 100, name="Expanded Griewank + Rosenbrock", vectorized=True)
 
     def objective(self, solution):
         return _exp_griewank_plus_rosenbrock(solution)
@@ -185,7 +233,7 @@ class ExpandedGriewankPlusRosenbrock(ObjectiveVectorFunc):
 class ExpandedShafferF6(ObjectiveVectorFunc):
     def __init__(self, size, opt="min"):
         self.size = size
-        super().__init__(self.size, opt, -100, 100, name="Expanded Shaffer F6 function")
+        super().__init__(self.size, opt, -100, 100, name="Expanded Shaffer F6 function", vectorized=True)
 
     def objective(self, solution):
         return _exp_shafferF6(solution)
@@ -200,7 +248,7 @@ class SumPowell(ObjectiveVectorFunc):
         self.size = size
         self.lim_min = lim_min
         self.lim_max = lim_max
-        super().__init__(self.size, opt, low_lim=lim_min, up_lim=lim_max, name="Sum Powell")
+        super().__init__(self.size, opt, low_lim=lim_min, up_lim=lim_max, name="Sum Powell", vectorized=True)
 
     def objective(self, solution):
         return _sum_powell(solution)
@@ -228,7 +276,7 @@ class N4XinSheYang(ObjectiveVectorFunc):
         self.size = size
         self.lim_min = lim_min
         self.lim_max = lim_max
-        super().__init__(self.size, opt, low_lim=lim_min, up_lim=lim_max, name="N4 Xin-She Yang")
+        super().__init__(self.size, opt, low_lim=lim_min, up_lim=lim_max, name="N4 Xin-She Yang", vectorized=True)
 
     def objective(self, solution):
         return _n4xinshe_yang(solution)
@@ -247,148 +295,185 @@ class N4XinSheYang(ObjectiveVectorFunc):
     #     return solution
 
 
+# The benchmark functions accept either a single vector or a matrix with one solution per row.
+
+
 # @jit(nopython=True)
 def _sphere(solution):
-    return (solution**2).sum()
+    return _sphere_terms(solution).sum(axis=-1)
+
+
+def _sphere_terms(solution):
+    return solution**2
 
 
 # @jit(nopython=True)
 def _high_cond_elipt_f(vect):
-    c = 1.0e6 ** ((np.arange(vect.shape[0]) / (vect.shape[0] - 1)))
-    return np.sum(c * vect * vect)
+    return np.sum(_high_cond_elipt_terms(vect, np.arange(vect.shape[-1]), vect.shape[-1]), axis=-1)
+
+
+def _high_cond_elipt_terms(vect, idx, dim):
+    c = 1.0e6 ** (idx / (dim - 1))
+    return c * vect * vect
 
 
 # @jit(nopython=True)
 def _bent_cigar(solution):
-    return solution[0] ** 2 + 1e6 * (solution[1:] ** 2).sum()
+    return solution[..., 0] ** 2 + 1e6 * (solution[..., 1:] ** 2).sum(axis=-1)
 
 
 # @jit(nopython=True)
 def _discus(solution):
-    return 1e6 * solution[0] ** 2 + (solution[1:] ** 2).sum()
+    return 1e6 * solution[..., 0] ** 2 + (solution[..., 1:] ** 2).sum(axis=-1)
 
 
 # @jit(nopython=True)
 def _rosenbrock(solution):
-    term1 = solution[1:] - solution[:-1] ** 2
-    term2 = 1 - solution[:-1]
+    term1 = solution[..., 1:] - solution[..., :-1] ** 2
+    term2 = 1 - solution[..., :-1]
     result = 100 * term1**2 + term2**2
-    return result.sum()
+    return result.sum(axis=-1)
 
 
 # @jit(nopython=True)
 def _ackley(solution):
-    term1 = (solution**2).sum()
-    term1 = -0.2 * np.sqrt(term1 / solution.size)
-    term2 = (np.cos(2 * np.pi * solution)).sum() / solution.size
+    dim = solution.shape[-1]
+    term1 = (solution**2).sum(axis=-1)
+    term1 = -0.2 * np.sqrt(term1 / dim)
+    term2 = (np.cos(2 * np.pi * solution)).sum(axis=-1) / dim
     return np.exp(1) - 20 * np.exp(term1) - np.exp(term2) + 20
 
 
 # @jit(nopython=False)
 def _weierstrass(solution, iter=20):
-    return np.sum(np.array([0.5**k * np.cos(2 * np.pi * 3**k * (solution + 0.5)) for k in range(iter)]))
+    k = np.arange(iter).reshape((-1,) + (1,) * solution.ndim)
+    return np.sum(0.5**k * np.cos(2 * np.pi * 3**k * (solution + 0.5)), axis=(0, -1))
 
 
 # @jit(nopython=True)
 def _griewank(solution):
-    term1 = (solution**2).sum()
-    term2 = np.prod(np.cos(solution / np.sqrt(np.arange(1, solution.size + 1))))
+    term1 = (solution**2).sum(axis=-1)
+    term2 = np.prod(np.cos(solution / np.sqrt(np.arange(1, solution.shape[-1] + 1))), axis=-1)
     return 1 + term1 / 4000 - term2
 
 
 # @jit(nopython=True)
 def _rastrigin(solution, A=10):
-    return A * len(solution) + (solution**2 - A * np.cos(2 * np.pi * solution)).sum()
+    return A * solution.shape[-1] + _rastrigin_terms(solution, A).sum(axis=-1)
 
 
-# @jit(nopython=True)
-def _mod_schwefel(solution):
-    fit = 0
-    for i in range(solution.size):
-        z = solution[i] + 4.209687462275036e2
-        if z > 500:
-            fit = fit - (500 - z % 500) * np.sin((500 - z % 500) ** 0.5)
-            tmp = (z - 500) / 100
-            fit = fit + tmp * tmp / solution.size
-        elif z < -500:
-            fit = fit - (-500 - abs(z) % 500) * np.sin((500 - abs(z) % 500) ** 0.5)
-            tmp = (z + 500) / 100
-            fit = fit + tmp * tmp / solution.size
-        else:
-            fit = fit - z * np.sin(abs(z) ** 0.5)
-    return fit + 4.189828872724338e2 * solution.size
+def _rastrigin_terms(solution, A=10):
+    return solution**2 - A * np.cos(2 * np.pi * solution)
+
+
+def _mod_schwefel_numpy(solution):
+    dim = solution.shape[-1]
+    z = solution + 4.209687462275036e2
+
+    z_mod = z % 500
+    fit_upper = -(500 - z_mod) * np.sin((500 - z_mod) ** 0.5) + ((z - 500) / 100) ** 2 / dim
+
+    abs_z_mod = np.abs(z) % 500
+    fit_lower = -(-500 - abs_z_mod) * np.sin((500 - abs_z_mod) ** 0.5) + ((z + 500) / 100) ** 2 / dim
+
+    fit_inside = -z * np.sin(np.abs(z) ** 0.5)
+
+    fit = np.where(z > 500, fit_upper, np.where(z < -500, fit_lower, fit_inside))
+    return fit.sum(axis=-1) + 4.189828872724338e2 * dim
+
+
+def _mod_schwefel_loop(solutions):
+    n_rows, dim = solutions.shape
+
+    result = np.empty(n_rows)
+    for row in range(n_rows):
+        fit = 4.189828872724338e2 * dim
+        for i in range(dim):
+            z = solutions[row, i] + 4.209687462275036e2
+            if z > 500:
+                z_mod = z % 500
+                fit += -(500 - z_mod) * math.sin((500 - z_mod) ** 0.5) + ((z - 500) / 100) ** 2 / dim
+            elif z < -500:
+                abs_z_mod = abs(z) % 500
+                fit += -(-500 - abs_z_mod) * math.sin((500 - abs_z_mod) ** 0.5) + ((z + 500) / 100) ** 2 / dim
+            else:
+                fit += -z * math.sin(abs(z) ** 0.5)
+        result[row] = fit
+
+    return result
+
+
+_mod_schwefel = register_kernel("mod_schwefel", _mod_schwefel_numpy, _mod_schwefel_loop, lambda: (np.zeros((2, 3)),), rows=True)
 
 
 # @jit(nopython=True)
 def _katsuura(solution):
-    A = 10 / solution.size**2
-
-    temp_list = [
-        1
-        + (i + 1)
-        * np.sum(
-            (
-                np.abs(2 ** (np.arange(1, 32 + 1)) * solution[i] - np.round(2 ** (np.arange(1, 32 + 1)) * solution[i]))
-                * 2 ** (-np.arange(1, 32 + 1, dtype=float))
-            )
-            ** (10 / solution.size**1.2)
-        )
-        for i in range(solution.size)
-    ]
-    prod_val = np.prod(temp_list)
+    dim = solution.shape[-1]
+    A = 10 / dim**2
+
+    powers = 2.0 ** np.arange(1, 32 + 1)
+    scaled = solution[..., None] * powers
+    terms = (np.abs(scaled - np.round(scaled)) / powers) ** (10 / dim**1.2)
+    temp_list = 1 + np.arange(1, dim + 1) * terms.sum(axis=-1)
+
+    prod_val = np.prod(temp_list, axis=-1)
     return A * prod_val - A
 
 
 # @jit(nopython=True)
 def _happy_cat(solution):
+    dim = solution.shape[-1]
     z = solution + 4.189828872724338e2
-    r2 = (z * solution).sum()
-    s = solution.sum()
-    return np.abs(r2 - solution.size) ** 0.25 + (0.5 * r2 + s) / solution.size + 0.5
+    r2 = (z * solution).sum(axis=-1)
+    s = solution.sum(axis=-1)
+    return np.abs(r2 - dim) ** 0.25 + (0.5 * r2 + s) / dim + 0.5
 
 
 # @jit(nopython=True)
 def _hgbat(solution):
+    dim = solution.shape[-1]
     z = solution + 4.189828872724338e2
-    r2 = (z * solution).sum()
-    s = solution.sum()
-    return np.abs((r2**2 - s**2)) ** 0.5 + (0.5 * r2 + s) / solution.size + 0.5
+    r2 = (z * solution).sum(axis=-1)
+    s = solution.sum(axis=-1)
+    return np.abs((r2**2 - s**2)) ** 0.5 + (0.5 * r2 + s) / dim + 0.5
 
 
 # @jit(nopython=True)
 def _exp_griewank_plus_rosenbrock(solution):
-    z = solution[:-1] + 4.189828872724338e2
-    tmp1 = solution[:-1] ** 2 - solution[1:]
+    z = solution[..., :-1] + 4.189828872724338e2
+    tmp1 = solution[..., :-1] ** 2 - solution[..., 1:]
     tmp2 = z - 1
     tmp = 100 * tmp1**2 + tmp2**2
-    grw = (tmp**2 / 4000 - np.cos(tmp) + 1).sum()
+    grw = (tmp**2 / 4000 - np.cos(tmp) + 1).sum(axis=-1)
 
-    term1 = solution[1:] - solution[:-1] ** 2
-    term2 = 1 - solution[:-1]
-    ros = (100 * term1**2 + term2**2).sum()
+    term1 = solution[..., 1:] - solution[..., :-1] ** 2
+    term2 = 1 - solution[..., :-1]
+    ros = (100 * term1**2 + term2**2).sum(axis=-1)
 
     return grw + ros**2 / 4000 - np.cos(ros) + 1
 
 
 # @jit(nopython=True)
 def _exp_shafferF6(solution):
-    term1 = np.sin(np.sqrt(np.sum(solution[:-1] ** 2 + solution[1:] ** 2))) ** 2 - 0.5
-    term2 = 1 + 0.001 * (solution[:-1] ** 2 + solution[1:] ** 2).sum()
+    dim = solution.shape[-1]
+    pair_sum = solution[..., :-1] ** 2 + solution[..., 1:] ** 2
+    term1 = np.sin(np.sqrt(np.sum(pair_sum, axis=-1))) ** 2 - 0.5
+    term2 = 1 + 0.001 * pair_sum.sum(axis=-1)
     temp = 0.5 + term1 / term2
 
-    term1 = np.sin(np.sqrt(np.sum((solution.size - 1) ** 2 + solution[0] ** 2))) ** 2 - 0.5
-    term2 = 1 + 0.001 * ((solution.size - 1) ** 2 + solution[0] ** 2)
+    term1 = np.sin(np.sqrt((dim - 1) ** 2 + solution[..., 0] ** 2)) ** 2 - 0.5
+    term2 = 1 + 0.001 * ((dim - 1) ** 2 + solution[..., 0] ** 2)
 
     return temp + 0.5 + term1 / term2
 
 
 # @jit(nopython=True)
 def _sum_powell(solution):
-    return (np.abs(solution) ** np.arange(2, solution.shape[0] + 2)).sum()
+    return (np.abs(solution) ** np.arange(2, solution.shape[-1] + 2)).sum(axis=-1)
 
 
 # @jit(nopython=True)
 def _n4xinshe_yang(solution):
-    sum_1 = np.exp(-(solution**2).sum())
-    sum_2 = np.exp(-(np.sin(np.sqrt(np.abs(solution))) ** 2).sum())
-    return (np.sin(solution) ** 2 - sum_1).sum() * sum_2
+    sum_1 = np.exp(-(solution**2).sum(axis=-1))
+    sum_2 = np.exp(-(np.sin(np.sqrt(np.abs(solution))) ** 2).sum(axis=-1))
+    return (np.sin(solution) ** 2 - np.expand_dims(sum_1, -1)).sum(axis=-1) * sum_2
@@ -1,5 +1,6 @@
-import numpy as np
+import os
 import warnings
+import numpy as np
 from ..ObjectiveFunc import ObjectiveVectorFunc
 
 
@@ -28,7 +29,23 @@ class ThreeSAT(ObjectiveVectorFunc):
         self.clauses = clauses
         self.n_vars = np.abs(clauses).max()
 
-        super().__init__(self.n_vars, name="3-SAT")
+        # Index of the variable and negation of each literal of each clause
+        self.clause_vars = np.abs(clauses) - 1
+        self.clause_negated = clauses < 0
+
+        # Only the first appearance of a variable in a clause is used when calculating the effect of flipping it
+        repeated = np.zeros(clauses.shape, dtype=bool)
+        repeated[:, 1] = self.clause_vars[:, 1] == self.clause_vars[:, 0]
+        repeated[:, 2] = (self.clause_vars[:, 2] == self.clause_vars[:, 0]) | (self.clause_vars[:, 2] == self.clause_vars[:, 1])
+        self._first_literal = ~repeated
+
+        # Clauses in which each variable appears, stored contiguously for each variable
+        literal_order = np.argsort(self.clause_vars.ravel(), kind="stable")
+        self._occurrence_clause = literal_order // 3
+        self._occurrence_negated = self.clause_negated.ravel()[literal_order]
+        self._occurrence_start = np.searchsorted(self.clause_vars.ravel()[literal_order], np.arange(self.n_vars + 1))
+
+        super().__init__(self.n_vars, name="3-SAT", vectorized=True)
 
     @staticmethod
     def from_cnf_file(path):
@@ -62,7 +79,7 @@ class ThreeSAT(ObjectiveVectorFunc):
         Parameters
         ----------
         solution: ndarray
-            A binary vector representing the value of each binary variable.
+            A binary vector representing the value of each binary variable, or a matrix with one of these vectors per row.
 
         Returns
         -------
@@ -70,13 +87,126 @@ class ThreeSAT(ObjectiveVectorFunc):
             The percentage of clauses satisfied with this assignment of variables.
         """
 
-        n_satisfied = 0
-        for clause in self.clauses:
-            bool_vals = solution[np.abs(clause) - 1].astype(bool)
-            satisfied = np.logical_xor(bool_vals, clause < 0)  # Flip if negative
-            n_satisfied += np.any(satisfied).astype(int)
+        return (self.true_literal_count(solution) > 0).mean(axis=-1)
+
+    def delta_fitness(self, solution, fitness, changed_idx, new_values):
+        n_clauses = self.clauses.shape[0]
+        old_rows = solution.reshape((-1, self.n_vars))
+        n_rows = old_rows.shape[0]
+        changed_idx = changed_idx.reshape((n_rows, -1))
+
+        new_rows = old_rows.copy()
+        np.put_along_axis(new_rows, changed_idx, new_values.reshape((n_rows, -1)), axis=1)
+
+        # Clauses in which each of the changed variables appears, without repetitions
+        changed_vars = changed_idx.ravel()
+        n_occurrences = self._occurrence_start[changed_vars + 1] - self._occurrence_start[changed_vars]
+        occurrence_offset = np.repeat(self._occurrence_start[changed_vars] - (np.cumsum(n_occurrences) - n_occurrences), n_occurrences)
+        occurrences = occurrence_offset + np.arange(n_occurrences.sum())
+        occurrence_rows = np.repeat(np.repeat(np.arange(n_rows), changed_idx.shape[1]), n_occurrences)
+
+        affected = np.unique(occurrence_rows * n_clauses + self._occurrence_clause[occurrences])
+        rows, clauses = np.divmod(affected, n_clauses)
+
+        literal_vars = self.clause_vars[clauses]
+        negated = self.clause_negated[clauses]
+        satisfied_before = np.any((old_rows[rows[:, None], literal_vars] != 0) ^ negated, axis=1)
+        satisfied_after = np.any((new_rows[rows[:, None], literal_vars] != 0) ^ negated, axis=1)
+
+        delta = np.bincount(rows, weights=satisfied_after.astype(int) - satisfied_before, minlength=n_rows)
+
+        return fitness + delta.reshape(np.shape(fitness)) / n_clauses
+
+    def true_literal_count(self, solution):
+        """
+        Calculates the number of literals that are true in each clause.
+
+        Parameters
+        ----------
+        solution: ndarray
+            A binary vector representing the value of each binary variable, or a matrix with one of these vectors per row.
+
+        Returns
+        -------
+        true_count: ndarray
+            The number of true literals of each clause, a clause is satisfied if it has at least one.
+        """
+
+        literal_values = solution[..., self.clause_vars] != 0
+        return np.count_nonzero(literal_values ^ self.clause_negated, axis=-1)
+
+    def flip_delta(self, solution, true_count=None):
+        """
+        Calculates the change in the number of satisfied clauses produced by flipping each of the variables.
+
+        Parameters
+        ----------
+        solution: ndarray
+            A binary vector representing the value of each binary variable, or a matrix with one of these vectors per row.
+        true_count: ndarray, optional
+            Number of true literals of each clause, calculated with 'true_literal_count' if not given.
+
+        Returns
+        -------
+        delta: ndarray
+            The number of clauses that become satisfied minus the number of clauses that stop being satisfied
+            when each variable is flipped. Divide it by the number of clauses to get the change in the objective.
+        """
+
+        if true_count is None:
+            true_count = self.true_literal_count(solution)
+
+        literal_true = (solution[..., self.clause_vars] != 0) ^ self.clause_negated
+
+        # Literals of the same variable in the same clause change together
+        same_var = self.clause_vars[:, :, None] == self.clause_vars[:, None, :]
+        var_true = np.count_nonzero(same_var & literal_true[..., None, :], axis=-1)
+        var_false = np.count_nonzero(same_var, axis=-1) - var_true
+
+        new_count = true_count[..., None] - var_true + var_false
+        change = (new_count > 0).astype(int) - (true_count[..., None] > 0)
+
+        # Add the changes of every clause in which each variable appears, for each of the rows
+        n_rows = int(np.prod(solution.shape[:-1]))
+        row_offset = np.arange(n_rows).reshape(solution.shape[:-1] + (1, 1)) * self.n_vars
+        var_idx = np.broadcast_to(self.clause_vars + row_offset, change.shape)
+        first_literal = np.broadcast_to(self._first_literal, change.shape)
 
-        return n_satisfied / self.clauses.shape[0]
+        delta = np.bincount(var_idx[first_literal], weights=change[first_literal], minlength=n_rows * self.n_vars)
+
+        return delta.astype(int).reshape(solution.shape[:-1] + (self.n_vars,))
+
+    def flip_variable(self, solution, var_idx, true_count):
+        """
+        Flips a variable of a solution, updating the number of true literals of each clause
+        by only visiting the clauses that contain the variable.
+
+        Parameters
+        ----------
+        solution: ndarray
+            A binary vector representing the value of each binary variable, it is modified in place.
+        var_idx: int
+            Index (starting at 0) of the variable to flip.
+        true_count: ndarray
+            Number of true literals of each clause, it is modified in place.
+
+        Returns
+        -------
+        delta: int
+            The number of clauses that became satisfied minus the number of clauses that stopped being satisfied.
+        """
+
+        occurrences = slice(self._occurrence_start[var_idx], self._occurrence_start[var_idx + 1])
+        clauses = self._occurrence_clause[occurrences]
+        literal_was_true = (solution[var_idx] != 0) ^ self._occurrence_negated[occurrences]
+
+        affected = np.unique(clauses)
+        satisfied_before = np.count_nonzero(true_count[affected])
+
+        np.add.at(true_count, clauses, np.where(literal_was_true, -1, 1))
+        solution[var_idx] = 1 - (solution[var_idx] != 0)
+
+        return np.count_nonzero(true_count[affected]) - satisfied_before
 
 
 class BinKnapsack(ObjectiveVectorFunc):
@@ -133,6 +263,9 @@ class BinKnapsack(ObjectiveVectorFunc):
     def repair_solution(self, solution):
         return (np.round(solution) != 0).astype(int)
 
+    def repair_population(self, solutions):
+        return (np.round(solutions) != 0).astype(int)
+
 
 class MaxClique(ObjectiveVectorFunc):
     """
@@ -182,15 +315,284 @@ class MaxClique(ObjectiveVectorFunc):
 
 
 class TSP(ObjectiveVectorFunc):
-    def __init__(self):
-        super().__init__(1, name="TSP")
+    """
+    This is the Traveling Salesman Problem that consists in finding the shortest closed tour
+    that visits every city exactly once.
+
+    Each solution is a permutation of the cities, the tour returns to the first city after visiting the last one.
+
+    Parameters
+    ----------
+    distances: ndarray
+        Matrix of size (n_cities, n_cities) with the distance between each pair of cities.
+    name: str, optional
+        The name that will be displayed to represent this function.
+    """
+
+    # Size in bytes of the distance matrix from which it is memory-mapped when loaded from a file
+    mmap_threshold = 2**28
+
+    # Maximum number of changed cities for which the tour is evaluated incrementally
+    _max_delta_changes = 16
+
+    def __init__(self, distances, name="TSP"):
+        distances = np.asanyarray(distances)
+        if distances.ndim != 2 or distances.shape[0] != distances.shape[1]:
+            raise ValueError("The distances must be represented as a square matrix of size (n_cities, n_cities).")
+
+        self.distances = distances
+        self.n_cities = distances.shape[0]
+        self._symmetric = None
+
+        super().__init__(self.n_cities, mode="min", low_lim=0, up_lim=self.n_cities - 1, name=name, vectorized=True)
+
+    @staticmethod
+    def from_file(path, missing_weight=None, mmap=None, cache_dir=None):
+        """
+        Loads a TSP instance from a file.
+
+        The file can either be a csv with the list of edges of the graph, with the columns "Edge1,Edge2,Weight"
+        (like the ones in 'data/tsp_examples'), or a .npy file with the complete distance matrix.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file.
+        missing_weight: float, optional
+            Distance assigned to the pairs of cities without an edge. By default it is the number of cities
+            times the longest edge, so that every tour using a missing edge is worse than any other tour.
+        mmap: bool, optional
+            Whether to memory-map the distance matrix instead of loading it into memory. For csv files the matrix
+            is stored in a .npy file that is reused in the next loads with the same 'missing_weight'. By default
+            only matrices bigger than 'TSP.mmap_threshold' bytes are memory-mapped.
+        cache_dir: str, optional
+            Directory where the memory-mapped matrices of csv files are stored. By default they are stored next
+            to the csv file.
+
+        Returns
+        -------
+        objfunc: TSP
+        """
+
+        base_path, extension = os.path.splitext(path)
+        name = f"TSP ({os.path.basename(base_path)})"
+
+        if extension == ".npy":
+            return TSP(np.load(path, mmap_mode="r" if mmap else None), name=name)
+
+        # The matrix depends on the missing weight, so it is part of the name of the stored matrix
+        cache_name = os.path.basename(base_path)
+        if missing_weight is not None:
+            cache_name += f".missing_{float(missing_weight)!r}"
+        if cache_dir is None:
+            cache_dir = os.path.dirname(path)
+        cache_path = os.path.join(cache_dir, cache_name + ".npy")
+        if mmap is not False and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            return TSP(np.load(cache_path, mmap_mode="r"), name=name)
+
+        edges = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+        origin = edges[:, 0].astype(int)
+        destination = edges[:, 1].astype(int)
+        weights = edges[:, 2]
+
+        n_cities = int(max(origin.max(), destination.max())) + 1
+        if missing_weight is None:
+            missing_weight = n_cities * weights.max()
+
+        if mmap is None:
+            mmap = n_cities * n_cities * np.dtype(float).itemsize > TSP.mmap_threshold
+
+        if mmap:
+            os.makedirs(cache_dir or ".", exist_ok=True)
+            distances = np.lib.format.open_memmap(cache_path, mode="w+", dtype=float, shape=(n_cities, n_cities))
+        else:
+            distances = np.empty((n_cities, n_cities))
+
+        distances[:] = missing_weight
+        distances[origin, destination] = weights
+        distances[destination, origin] = weights
+        np.fill_diagonal(distances, 0)
+
+        if mmap:
+            distances.flush()
+
+        return TSP(distances, name=name)
+
+    @property
+    def symmetric(self):
+        """
+        Whether the distance from each city to another is the same in both directions.
+        """
+
+        if self._symmetric is None:
+            self._symmetric = bool(np.array_equal(self.distances, self.distances.T))
+
+        return self._symmetric
 
     def objective(self, solution):
         """
-        Not implemented.
+        Calculates the length of the tour.
+
+        Parameters
+        ----------
+        solution: ndarray
+            A permutation of the cities, or a matrix with one permutation per row.
+
+        Returns
+        -------
+        length: float
+            The total length of the tour, including the way back to the first city.
         """
 
-    def repair_solution(self, solution):
+        tour = solution.astype(np.intp, copy=False)
+        path_length = self.distances[tour[..., :-1], tour[..., 1:]].sum(axis=-1)
+
+        return path_length + self.distances[tour[..., -1], tour[..., 0]]
+
+    def delta_fitness(self, solution, fitness, changed_idx, new_values):
+        tour = solution.astype(np.intp, copy=False)
+        changed_idx = changed_idx.astype(np.intp, copy=False)
+        new_values = new_values.astype(np.intp, copy=False)
+
+        # Moves that change long sections of the tour are cheaper to evaluate completely
+        if changed_idx.shape[-1] > self._max_delta_changes:
+            new_tour = tour.copy()
+            np.put_along_axis(new_tour, changed_idx, new_values, axis=-1)
+            return self.objective(new_tour)
+
+        # Edges that start at each changed position or right before it, without repetitions
+        edge_start = np.sort(np.concatenate([changed_idx - 1, changed_idx], axis=-1) % self.n_cities, axis=-1)
+        edge_end = (edge_start + 1) % self.n_cities
+        repeated = np.zeros(edge_start.shape, dtype=bool)
+        repeated[..., 1:] = edge_start[..., 1:] == edge_start[..., :-1]
+
+        def cities_at(positions, new_tour):
+            cities = np.take_along_axis(tour, positions, axis=-1)
+            if not new_tour:
+                return cities
+
+            changed = positions[..., :, None] == changed_idx[..., None, :]
+            new_cities = np.take_along_axis(new_values, changed.argmax(axis=-1), axis=-1)
+            return np.where(changed.any(axis=-1), new_cities, cities)
+
+        old_length = self.distances[cities_at(edge_start, False), cities_at(edge_end, False)]
+        new_length = self.distances[cities_at(edge_start, True), cities_at(edge_end, True)]
+
+        return fitness + np.where(repeated, 0, new_length - old_length).sum(axis=-1)
+
+    def _move_positions(self, solution, i, j):
+        tour = np.atleast_2d(solution).astype(np.intp, copy=False)
+        i = np.broadcast_to(i, tour.shape[:1])
+        j = np.broadcast_to(j, tour.shape[:1])
+        rows = np.arange(tour.shape[0])
+
+        def city(position):
+            return tour[rows, position % self.n_cities]
+
+        return tour, i, j, city
+
+    def _move_result(self, solution, delta):
+        return delta if np.ndim(solution) > 1 else delta[0]
+
+    def swap_delta(self, solution, i, j):
         """
-        Not implemented.
+        Calculates the change in the length of the tour produced by swapping the cities in positions 'i' and 'j'.
+
+        Parameters
+        ----------
+        solution: ndarray
+            A permutation of the cities, or a matrix with one permutation per row.
+        i: int | ndarray
+            Position of the first city, one for each row if it is an array.
+        j: int | ndarray
+            Position of the second city, one for each row if it is an array.
+
+        Returns
+        -------
+        delta: float | ndarray
+            The length of the new tour minus the length of the current one.
+        """
+
+        tour, i, j, city = self._move_positions(solution, i, j)
+
+        changed_idx = np.stack([i, j], axis=1)
+        new_values = np.stack([city(j), city(i)], axis=1)
+        delta = self.delta_fitness(tour, 0, changed_idx, new_values)
+
+        return self._move_result(solution, np.where(i == j, 0, delta))
+
+    def two_opt_delta(self, solution, i, j):
         """
+        Calculates the change in the length of the tour produced by reversing the section of the tour between
+        the positions 'i' and 'j' (both included), with i <= j. Only valid for symmetric distances.
+
+        Parameters
+        ----------
+        solution: ndarray
+            A permutation of the cities, or a matrix with one permutation per row.
+        i: int | ndarray
+            First position of the reversed section, one for each row if it is an array.
+        j: int | ndarray
+            Last position of the reversed section, one for each row if it is an array.
+
+        Returns
+        -------
+        delta: float | ndarray
+            The length of the new tour minus the length of the current one.
+        """
+
+        if not self.symmetric:
+            raise ValueError("The 2-opt move can only be evaluated in constant time with symmetric distances.")
+
+        _, i, j, city = self._move_positions(solution, i, j)
+
+        before, first, last, after = city(i - 1), city(i), city(j), city(j + 1)
+        delta = self.distances[before, last] + self.distances[first, after] - self.distances[before, first] - self.distances[last, after]
+
+        # Reversing the whole tour gives the same tour
+        whole_tour = (i == 0) & (j == self.n_cities - 1)
+
+        return self._move_result(solution, np.where(whole_tour, 0, delta))
+
+    def insert_delta(self, solution, i, j):
+        """
+        Calculates the change in the length of the tour produced by moving the city in position 'i' to position 'j',
+        shifting the cities in between.
+
+        Parameters
+        ----------
+        solution: ndarray
+            A permutation of the cities, or a matrix with one permutation per row.
+        i: int | ndarray
+            Current position of the city, one for each row if it is an array.
+        j: int | ndarray
+            Position of the city after the move, one for each row if it is an array.
+
+        Returns
+        -------
+        delta: float | ndarray
+            The length of the new tour minus the length of the current one.
+        """
+
+        _, i, j, city = self._move_positions(solution, i, j)
+
+        moved = city(i)
+        prev_city, next_city = city(i - 1), city(i + 1)
+        remove_delta = self.distances[prev_city, next_city] - self.distances[prev_city, moved] - self.distances[moved, next_city]
+
+        # The city is placed after the city in position j if it moves forward and before it otherwise
+        insert_prev = np.where(j > i, city(j), city(j - 1))
+        insert_next = np.where(j > i, city(j + 1), city(j))
+        insert_delta = self.distances[insert_prev, moved] + self.distances[moved, insert_next] - self.distances[insert_prev, insert_next]
+
+        # Moving the first city to the end or the last one to the start gives the same tour
+        same_tour = (i == j) | ((i == 0) & (j == self.n_cities - 1)) | ((i == self.n_cities - 1) & (j == 0))
+
+        return self._move_result(solution, np.where(same_tour, 0, remove_delta + insert_delta))
+
+    def repair_solution(self, solution):
+        return self.repair_population(solution)
+
+    def repair_population(self, solutions):
+        # The rank of each component turns any vector into a permutation, valid permutations are left unchanged
+        return np.argsort(np.argsort(solutions, axis=-1, kind="stable"), axis=-1, kind="stable")
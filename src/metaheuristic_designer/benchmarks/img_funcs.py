@@ -3,10 +3,25 @@ from ..encodings import ImageEncoding
 import numpy as np
 
 # from numba import jit
-from skimage import metrics
 
 
-class ImgApprox(ObjectiveVectorFunc):
+class ImgObjective(ObjectiveVectorFunc):
+    """
+    Base class of the objective functions on images, the pixel values are kept between 0 and 255.
+    """
+
+    def repair_solution(self, solution):
+        return np.clip(solution, 0, 255)
+
+    def repair_speed(self, solution):
+        return np.clip(solution, -100, 100)
+
+    # The clips are applied element-wise, so they repair whole populations as well
+    repair_population = repair_solution
+    repair_speed_population = repair_speed
+
+
+class ImgApprox(ImgObjective):
     def __init__(self, img_dim, reference, mode=None, img_name="", diff_func="MSE", name=None):
         self.img_dim = tuple(img_dim) + (3,)
         self.size = img_dim[0] * img_dim[1] * 3
@@ -37,11 +52,15 @@ class ImgApprox(ObjectiveVectorFunc):
             case "MAE":
                 error = np.astype(np.sum(np.abs(solutions - self.reference), axis=(1, 2, 3)) / image_size, float)
             case "SSIM":
+                from skimage import metrics
+
                 for idx, s in enumerate(solutions):
                     for s_ch, ref_ch in zip(s.transpose((2, 0, 1)), self.reference.transpose((2, 0, 1))):
                         error[idx] += metrics.structural_similarity(s_ch, ref_ch)
                     error[idx] /= 3
             case "NMI":
+                from skimage import metrics
+
                 for idx, s in enumerate(solutions):
                     for s_ch, ref_ch in zip(s.transpose((2, 0, 1)), self.reference.transpose((2, 0, 1))):
                         error[idx] += metrics.normalized_mutual_information(s_ch, ref_ch, bins=256)
@@ -49,14 +68,8 @@ class ImgApprox(ObjectiveVectorFunc):
 
         return error
 
-    def repair_solution(self, solution):
-        return np.clip(solution, 0, 255)
 
-    def repair_speed(self, solution):
-        return np.clip(solution, -100, 100)
-
-
-class ImgStd(ObjectiveVectorFunc):
+class ImgStd(ImgObjective):
     def __init__(self, img_dim, mode=None):
         self.size = img_dim[0] * img_dim[1] * 3
         if mode is None:
@@ -68,14 +81,8 @@ class ImgStd(ObjectiveVectorFunc):
         solution_color = solution.reshape([3, -1])
         return solution_color.std(axis=1).mean()
 
-    def repair_solution(self, solution):
-        return np.clip(solution, 0, 255)
-
-    def repair_speed(self, solution):
-        return np.clip(solution, -100, 100)
-
 
-class ImgEntropy(ObjectiveVectorFunc):
+class ImgEntropy(ImgObjective):
     def __init__(self, img_dim, nbins=10, mode=None):
         self.size = img_dim[0] * img_dim[1] * 3
         self.nbins = nbins
@@ -92,14 +99,8 @@ class ImgEntropy(ObjectiveVectorFunc):
         img_hists_no_zeros[img_hists == 0] = 1
         return np.sum(-img_hists * np.log(img_hists_no_zeros))
 
-    def repair_solution(self, solution):
-        return np.clip(solution, 0, 255)
 
-    def repair_speed(self, solution):
-        return np.clip(solution, -100, 100)
-
-
-class ImgExperimental(ObjectiveVectorFunc):
+class ImgExperimental(ImgObjective):
     def __init__(self, img_dim, reference, img_name, mode=None):
         self.img_dim = tuple(img_dim) + (3,)
         self.size = img_dim[0] * img_dim[1] * 3
@@ -123,9 +124,3 @@ class ImgExperimental(ObjectiveVectorFunc):
         dev = -solution_color.std(axis=1).max()
 
         return dist_norm + dev
-
-    def repair_solution(self, solution):
-        return np.clip(solution, 0, 255)
-
-    def repair_speed(self, solution):
-        return np.clip(solution, -100, 100)
@@ -0,0 +1,95 @@
+import math
+import numpy as np
+
+# Bits stored in each word of a packed binary vector
+WORD_BITS = 64
+
+ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Number of bits set in each possible byte, used when numpy doesn't provide 'bitwise_count'
+_byte_popcount = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def packed_size(n_bits):
+    """
+    Number of 64 bit words needed to store a vector of 'n_bits' bits.
+    """
+
+    return math.ceil(n_bits / WORD_BITS)
+
+
+def pack_bits(bits):
+    """
+    Packs a vector (or a matrix with one vector per row) of zeros and ones into 64 bit words.
+
+    The i-th bit of the vector is stored in the bit 'i % 64' of the word 'i // 64',
+    the unused bits of the last word are set to 0.
+    """
+
+    bits = np.asarray(bits) != 0
+    n_words = packed_size(bits.shape[-1])
+
+    packed_bytes = np.packbits(bits, axis=-1, bitorder="little")
+    padding = [(0, 0)] * (bits.ndim - 1) + [(0, 8 * n_words - packed_bytes.shape[-1])]
+    packed_bytes = np.pad(packed_bytes, padding)
+
+    return packed_bytes.view("<u8").astype(np.uint64)
+
+
+def unpack_bits(words, n_bits, dtype=int):
+    """
+    Unpacks a vector (or a matrix with one vector per row) of 64 bit words into a vector of 'n_bits' zeros and ones.
+    """
+
+    words_bytes = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+
+    return np.unpackbits(words_bytes, axis=-1, count=n_bits, bitorder="little").astype(dtype)
+
+
+def popcount(words):
+    """
+    Counts the number of bits set in each vector of packed words (the last axis of the array).
+    """
+
+    words = np.asarray(words, dtype=np.uint64)
+
+    if hasattr(np, "bitwise_count"):
+        counts = np.bitwise_count(words)
+    else:
+        counts = _byte_popcount[np.ascontiguousarray(words).view(np.uint8)]
+
+    return counts.sum(axis=-1, dtype=np.int64)
+
+
+def padding_mask(n_bits):
+    """
+    Words with the bits that are part of a vector of 'n_bits' bits set to 1 and the unused bits of the last word set to 0.
+    """
+
+    return prefix_mask(np.array([n_bits]), packed_size(n_bits))[0]
+
+
+def prefix_mask(n_set, n_words):
+    """
+    Builds, for each value in 'n_set', a vector of packed words where the first 'n_set' bits are set to 1.
+
+    Parameters
+    ----------
+    n_set: ndarray
+        Number of leading bits to set in each vector.
+    n_words: int
+        Number of words of each vector.
+
+    Returns
+    -------
+    masks: ndarray
+        Matrix of shape (len(n_set), n_words) of packed words.
+    """
+
+    n_set = np.asarray(n_set).reshape((-1, 1))
+    bits_in_word = np.clip(n_set - WORD_BITS * np.arange(n_words), 0, WORD_BITS).astype(np.uint64)
+
+    # Shifting a 64 bit integer by 64 positions is undefined, full words are handled separately
+    partial = (np.uint64(1) << np.minimum(bits_in_word, np.uint64(WORD_BITS - 1))) - np.uint64(1)
+
+    return np.where(bits_in_word == WORD_BITS, ALL_ONES, partial)
@@ -0,0 +1,276 @@
+"""
+Binary checkpoints of the state of an optimization run.
+
+The state of the components of the package (algorithms, search strategies, operators, selection methods,
+parameter schedulers, initializers, populations...) is gathered by walking through their attributes.
+NumPy arrays are stored in a single '.npz' file and the rest of the values (numbers, strings, lists,
+dictionaries, the state of the random number generators...) in a JSON document inside of it.
+
+A checkpoint is restored on top of objects built in the same way as the ones that were saved, so that
+the values that can't be stored (functions, executors, objects of other libraries) are taken from the
+objects that are already built. Objects shared between components are shared again after restoring them.
+"""
+
+from __future__ import annotations
+from typing import Any
+from enum import Enum
+import importlib
+import json
+import os
+import random
+import numpy as np
+from .utils import RAND_GEN
+from .ObjectiveFunc import ObjectiveFunc
+from .Encoding import Encoding
+from .Population import Population
+from .Initializer import Initializer
+from .Operator import Operator
+from .SelectionMethod import SelectionMethod
+from .SearchStrategy import SearchStrategy
+from .ParamScheduler import ParamScheduler
+
+CHECKPOINT_VERSION = 1
+
+_COMPONENT_TYPES = (ObjectiveFunc, Encoding, Population, Initializer, Operator, SelectionMethod, SearchStrategy, ParamScheduler)
+
+
+def _is_component(value: Any) -> bool:
+    if isinstance(value, (Enum, type)):
+        return False
+
+    return isinstance(value, _COMPONENT_TYPES) or type(value).__module__.startswith(__package__ + ".")
+
+
+def _class_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _import_class(path: str) -> type:
+    module_name, class_name = path.split(":")
+    cls = importlib.import_module(module_name)
+    for name in class_name.split("."):
+        cls = getattr(cls, name)
+
+    return cls
+
+
+def _component_attributes(component: Any) -> dict:
+    """
+    Attributes of a component that form part of its state.
+
+    Classes can restrict them with a '_checkpoint_include' tuple or exclude some of them with '_checkpoint_exclude'.
+    Classes that store their state in a different form define a '_checkpoint_state' method that returns it and a
+    '_checkpoint_restore' method that receives it back.
+    """
+
+    if hasattr(component, "_checkpoint_state"):
+        return component._checkpoint_state()
+
+    attributes = vars(component)
+
+    include = getattr(type(component), "_checkpoint_include", None)
+    if include is not None:
+        attributes = {name: attributes[name] for name in include if name in attributes}
+
+    exclude = getattr(type(component), "_checkpoint_exclude", ())
+    return {name: value for name, value in attributes.items() if name not in exclude}
+
+
+class _StateWriter:
+    """
+    Converts the state of a set of objects to a JSON compatible tree, keeping the arrays apart.
+    """
+
+    def __init__(self):
+        self.arrays = {}
+        self.seen = {}
+
+    def encode(self, value: Any) -> dict | None:
+        node = None
+
+        if isinstance(value, (np.ndarray, np.generic)):
+            key = f"array_{len(self.arrays)}"
+            self.arrays[key] = np.asarray(value)
+            node = {"array": key, "scalar": isinstance(value, np.generic)}
+
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            node = {"value": value}
+
+        elif isinstance(value, np.dtype) or (isinstance(value, type) and issubclass(value, (bool, int, float, complex, np.generic))):
+            node = {"dtype": np.dtype(value).str}
+
+        elif isinstance(value, Enum):
+            node = {"enum": _class_path(type(value)), "name": value.name}
+
+        elif isinstance(value, range):
+            node = {"range": [value.start, value.stop, value.step]}
+
+        elif isinstance(value, np.random.Generator):
+            node = {"rng": self.encode(value.bit_generator.state)}
+
+        elif isinstance(value, (list, tuple)):
+            node = {type(value).__name__: [self.encode(item) for item in value]}
+
+        elif isinstance(value, dict):
+            items = [(self.encode(key), self.encode(item)) for key, item in value.items()]
+            node = {"dict": [[key, item] for key, item in items if key is not None and item is not None]}
+
+        elif _is_component(value):
+            if id(value) in self.seen:
+                node = {"ref": self.seen[id(value)]}
+            else:
+                ref = len(self.seen)
+                self.seen[id(value)] = ref
+                attributes = {name: self.encode(attr) for name, attr in _component_attributes(value).items()}
+                node = {
+                    "object": {name: attr for name, attr in attributes.items() if attr is not None},
+                    "id": ref,
+                    "class": _class_path(type(value)),
+                }
+
+        return node
+
+
+class _StateReader:
+    """
+    Restores the values of a tree generated by '_StateWriter' on top of existing objects.
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.restored = {}
+
+    def decode(self, current: Any, node: dict) -> Any:
+        if node is None:
+            return current
+
+        if "value" in node:
+            return node["value"]
+
+        if "array" in node:
+            array = self.arrays[node["array"]]
+            return array[()] if node["scalar"] else array
+
+        if "dtype" in node:
+            # Types given as Python classes (float, int...) are kept as they are
+            return current if current is not None and np.dtype(current) == np.dtype(node["dtype"]) else np.dtype(node["dtype"])
+
+        if "enum" in node:
+            return getattr(_import_class(node["enum"]), node["name"])
+
+        if "range" in node:
+            return range(*node["range"])
+
+        if "rng" in node:
+            state = self.decode(None, node["rng"])
+            if not isinstance(current, np.random.Generator):
+                current = np.random.Generator(getattr(np.random, state["bit_generator"])())
+            current.bit_generator.state = state
+            return current
+
+        if "list" in node or "tuple" in node:
+            items = node.get("list", node.get("tuple"))
+            if isinstance(current, list) and "list" in node and len(current) == len(items):
+                # Restored in place in case the list is shared with other objects
+                for idx, item in enumerate(items):
+                    current[idx] = self.decode(current[idx], item)
+                return current
+
+            current_items = current if isinstance(current, (list, tuple)) and len(current) == len(items) else [None] * len(items)
+            decoded = [self.decode(current_item, item) for current_item, item in zip(current_items, items)]
+            return decoded if "list" in node else tuple(decoded)
+
+        if "dict" in node:
+            if not isinstance(current, dict):
+                current = {}
+            for key, item in node["dict"]:
+                key = self.decode(None, key)
+                current[key] = self.decode(current.get(key), item)
+            return current
+
+        if "ref" in node:
+            return self.restored.get(node["ref"], current)
+
+        if "object" in node:
+            if current is None or _class_path(type(current)) != node["class"]:
+                cls = _import_class(node["class"])
+                current = cls.__new__(cls)
+
+            self.restored[node["id"]] = current
+            if hasattr(current, "_checkpoint_restore"):
+                current._checkpoint_restore({name: self.decode(None, attr) for name, attr in node["object"].items()})
+            else:
+                for name, attr in node["object"].items():
+                    setattr(current, name, self.decode(getattr(current, name, None), attr))
+            return current
+
+        return current
+
+
+def save_checkpoint(file_name: str, objects: dict):
+    """
+    Stores the state of the objects given and of the random number generators in a binary file.
+
+    The file is written to a temporary file first and then renamed, so that an interrupted
+    execution doesn't leave a corrupted checkpoint.
+
+    Parameters
+    ----------
+    file_name: str
+        Path of the checkpoint file.
+    objects: dict
+        Objects to store, identified by a name.
+    """
+
+    writer = _StateWriter()
+    state = {name: writer.encode(obj) for name, obj in objects.items()}
+
+    metadata = {
+        "version": CHECKPOINT_VERSION,
+        "rng": writer.encode(RAND_GEN.bit_generator.state),
+        "python_rng": writer.encode(random.getstate()),
+        "state": state,
+    }
+
+    tmp_file_name = f"{file_name}.tmp"
+    with open(tmp_file_name, "wb") as file:
+        # The JSON document is stored as UTF-8 bytes, a unicode array takes 4 bytes per character
+        np.savez(file, checkpoint_metadata=np.array(json.dumps(metadata).encode()), **writer.arrays)
+    os.replace(tmp_file_name, file_name)
+
+
+def load_checkpoint(file_name: str, objects: dict) -> dict:
+    """
+    Restores the state stored with 'save_checkpoint' on top of the objects given and restores the state of
+    the random number generators.
+
+    Arrays of Python objects are stored with pickle, so only checkpoints from trusted sources should be loaded.
+
+    Parameters
+    ----------
+    file_name: str
+        Path of the checkpoint file.
+    objects: dict
+        Objects where the state will be restored, identified by the same names used when saving them.
+
+    Returns
+    -------
+    objects: dict
+        The restored objects, they are the same objects given unless one of them couldn't be restored in place.
+    """
+
+    with np.load(file_name, allow_pickle=True) as data:
+        metadata = data["checkpoint_metadata"].item()
+        metadata = json.loads(metadata.decode() if isinstance(metadata, bytes) else metadata)
+        if metadata["version"] != CHECKPOINT_VERSION:
+            raise ValueError(f"Checkpoint version {metadata['version']} is not supported, expected version {CHECKPOINT_VERSION}.")
+
+        arrays = {key: data[key] for key in data.files if key != "checkpoint_metadata"}
+
+    reader = _StateReader(arrays)
+    restored = {name: reader.decode(objects.get(name), node) for name, node in metadata["state"].items()}
+
+    RAND_GEN.bit_generator.state = reader.decode(None, metadata["rng"])
+    random.setstate(reader.decode(None, metadata["python_rng"]))
+
+    return restored
@@ -0,0 +1,38 @@
+from __future__ import annotations
+from numpy import ndarray
+from ..Encoding import Encoding
+from ..bitpack import pack_bits, unpack_bits, padding_mask
+
+
+class BitPackEncoding(Encoding):
+    """
+    Encoder that stores binary vectors packed in 64 bit words, each individual is a vector of
+    ceil(vecsize/64) unsigned integers that is decoded as a vector of 'vecsize' zeros and ones.
+
+    Parameters
+    ----------
+    vecsize: int
+        Number of bits of the decoded vectors.
+    decoded_dtype: type, optional
+        Data type of the decoded vectors.
+    """
+
+    def __init__(self, vecsize: int, decoded_dtype: type = int):
+        self.vecsize = vecsize
+        self.decoded_dtype = decoded_dtype
+
+        super().__init__(vectorized=True, decode_as_array=True)
+
+    def encode_func(self, solutions: ndarray) -> ndarray:
+        return pack_bits(solutions)
+
+    def decode_func(self, population: ndarray) -> ndarray:
+        return unpack_bits(population, self.vecsize, self.decoded_dtype)
+
+    def repair_population(self, objfunc: ObjectiveFunc, population: ndarray) -> ndarray:
+        # Binary vectors are left unchanged by the repair, only the unused bits of the last word are cleared
+        if objfunc.repair_is_identity(0, 1):
+            return population & padding_mask(self.vecsize)
+
+        # The objective function repairs the unpacked vectors
+        return self.encode(objfunc.repair_population(self.decode(population)))
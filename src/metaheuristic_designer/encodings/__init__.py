@@ -6,3 +6,4 @@ from .TypeCastEncoding import TypeCastEncoding
 from .AdaptionEncoding import AdaptionEncoding
 from .CompositeEncoding import CompositeEncoding
 from .EncodingFromLambda import EncodingFromLambda
+from .BitPackEncoding import BitPackEncoding
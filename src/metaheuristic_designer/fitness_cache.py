@@ -0,0 +1,388 @@
+from __future__ import annotations
+from typing import Any, Sequence
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import os
+import hashlib
+import pickle
+import sqlite3
+import numpy as np
+from numpy import ndarray
+
+
+def solution_key(solution: Any, adjusted: bool = True) -> bytes:
+    """
+    Calculates a hash of the bytes of a solution that identifies it in a fitness cache.
+
+    Parameters
+    ----------
+    solution: Any
+        A decoded solution.
+    adjusted: bool, optional
+        Whether the fitness value stored with this key is adjusted or not.
+
+    Returns
+    -------
+    key: bytes
+        A 16 byte digest of the solution.
+    """
+
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(b"A" if adjusted else b"R")
+
+    if isinstance(solution, ndarray) and solution.dtype != object:
+        hasher.update(solution.dtype.str.encode())
+        hasher.update(str(solution.shape).encode())
+        hasher.update(np.ascontiguousarray(solution).tobytes())
+    else:
+        hasher.update(pickle.dumps(solution))
+
+    return hasher.digest()
+
+
+def definition_digest(definition: Any) -> str:
+    """
+    Calculates a hash of the data that defines a problem, used to tell apart objective functions
+    that share a persistent fitness cache.
+
+    Arrays are hashed by their contents, containers and objects by their items and attributes,
+    functions by their qualified name and the rest of the values by their representation.
+
+    Parameters
+    ----------
+    definition: Any
+        The values that define the problem, usually a dictionary of the attributes of the objective function.
+
+    Returns
+    -------
+    digest: str
+        A hexadecimal digest of the definition.
+    """
+
+    hasher = hashlib.blake2b(digest_size=16)
+    _hash_value(hasher, definition, set())
+
+    return hasher.hexdigest()
+
+
+def _hash_value(hasher: hashlib.blake2b, value: Any, seen: set):
+    hasher.update(type(value).__qualname__.encode())
+
+    if isinstance(value, (ndarray, np.generic)) and np.asarray(value).dtype != object:
+        value = np.asarray(value)
+        hasher.update(value.dtype.str.encode())
+        hasher.update(str(value.shape).encode())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+
+    elif value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        hasher.update(repr(value).encode())
+
+    elif isinstance(value, (list, tuple, ndarray)):
+        hasher.update(str(len(value)).encode())
+        for item in value:
+            _hash_value(hasher, item, seen)
+
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            hasher.update(repr(key).encode())
+            _hash_value(hasher, value[key], seen)
+
+    elif callable(value) and hasattr(value, "__qualname__"):
+        hasher.update(f"{getattr(value, '__module__', '')}.{value.__qualname__}".encode())
+
+    elif hasattr(value, "__dict__") and id(value) not in seen:
+        seen.add(id(value))
+        _hash_value(hasher, vars(value), seen)
+
+    else:
+        hasher.update(repr(value).encode())
+
+
+class FitnessCache(ABC):
+    """
+    Abstract fitness cache class.
+
+    Stores the fitness of the solutions already evaluated so that the objective function
+    does not need to be evaluated again when a solution is repeated.
+
+    Parameters
+    ----------
+    count_hits: bool, optional
+        Whether the solutions found in the cache count as evaluations of the objective function.
+    """
+
+    def __init__(self, count_hits: bool = False):
+        """
+        Constructor of the FitnessCache class.
+        """
+
+        self.count_hits = count_hits
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, keys: Sequence[bytes]) -> tuple[ndarray, ndarray]:
+        """
+        Searches the fitness of a list of solutions in the cache.
+
+        Parameters
+        ----------
+        keys: Sequence[bytes]
+            Keys of the solutions, obtained with 'solution_key'.
+
+        Returns
+        -------
+        found: ndarray
+            Boolean mask indicating which solutions were found in the cache.
+        fitness: ndarray
+            Stored fitness of the solutions, only valid in the positions where 'found' is True.
+        """
+
+        found, fitness = self._lookup(keys)
+
+        n_hits = int(found.sum())
+        self.hits += n_hits
+        self.misses += len(keys) - n_hits
+
+        return found, fitness
+
+    def reset_stats(self):
+        """
+        Resets the hit and miss counters.
+        """
+
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _lookup(self, keys: Sequence[bytes]) -> tuple[ndarray, ndarray]:
+        """
+        Implementation of the search of keys in the cache.
+        """
+
+    @abstractmethod
+    def store(self, keys: Sequence[bytes], fitness: ndarray):
+        """
+        Stores the fitness of a list of solutions.
+
+        Parameters
+        ----------
+        keys: Sequence[bytes]
+            Keys of the solutions, obtained with 'solution_key'.
+        fitness: ndarray
+            Fitness of each of the solutions.
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        Removes every stored value from the cache.
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Number of stored values.
+        """
+
+
+class LRUFitnessCache(FitnessCache):
+    """
+    In memory fitness cache with a bounded size. When it is full, the least recently used solution is discarded.
+
+    Parameters
+    ----------
+    maxsize: int, optional
+        Maximum number of solutions stored.
+    count_hits: bool, optional
+        Whether the solutions found in the cache count as evaluations of the objective function.
+    """
+
+    def __init__(self, maxsize: int = 10000, count_hits: bool = False):
+        """
+        Constructor of the LRUFitnessCache class.
+        """
+
+        super().__init__(count_hits)
+
+        if maxsize <= 0:
+            raise ValueError("The maximum size of the cache must be a positive number.")
+
+        self.maxsize = maxsize
+        self.storage = OrderedDict()
+
+    def _lookup(self, keys: Sequence[bytes]) -> tuple[ndarray, ndarray]:
+        found = np.zeros(len(keys), dtype=bool)
+        fitness = np.empty(len(keys))
+
+        for idx, key in enumerate(keys):
+            value = self.storage.get(key)
+            if value is not None:
+                self.storage.move_to_end(key)
+                found[idx] = True
+                fitness[idx] = value
+
+        return found, fitness
+
+    def store(self, keys: Sequence[bytes], fitness: ndarray):
+        for key, value in zip(keys, fitness):
+            self.storage[key] = float(value)
+            self.storage.move_to_end(key)
+
+        while len(self.storage) > self.maxsize:
+            self.storage.popitem(last=False)
+
+    def clear(self):
+        self.storage.clear()
+
+    def __len__(self) -> int:
+        return len(self.storage)
+
+
+class SQLiteFitnessCache(FitnessCache):
+    """
+    Fitness cache stored in an sqlite database in disk, shared between runs and between processes.
+
+    The database is opened in write-ahead-log mode so that several processes can read it while
+    another one is writing, each process opens its own connection to the database.
+
+    Parameters
+    ----------
+    path: str
+        Path of the database file, it is created if it doesn't exist.
+    namespace: str, optional
+        Identifier of the objective function, used to share the same file between several objective functions.
+        If it is None, the objective function that uses the cache sets it from a digest of its definition.
+    count_hits: bool, optional
+        Whether the solutions found in the cache count as evaluations of the objective function.
+    timeout: float, optional
+        Number of seconds to wait for other processes to finish writing before raising an error.
+    """
+
+    # Maximum number of keys in a single query
+    _query_size = 500
+
+    def __init__(self, path: str, namespace: str = "default", count_hits: bool = False, timeout: float = 60):
+        """
+        Constructor of the SQLiteFitnessCache class.
+        """
+
+        super().__init__(count_hits)
+
+        self.path = path
+        self.namespace = namespace
+        self.timeout = timeout
+
+        self._connection = None
+        self._pid = None
+
+    def __getstate__(self) -> dict:
+        # The connection can't be shared with other processes, a new one is opened when needed
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_pid"] = None
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Connection to the database owned by the current process.
+        """
+
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS fitness_cache ("
+                    "namespace TEXT NOT NULL, key BLOB NOT NULL, fitness REAL NOT NULL, "
+                    "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+                )
+            self._pid = os.getpid()
+
+        return self._connection
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        """
+
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+
+        self._connection = None
+        self._pid = None
+
+    def _lookup(self, keys: Sequence[bytes]) -> tuple[ndarray, ndarray]:
+        stored = {}
+        for i in range(0, len(keys), self._query_size):
+            key_batch = keys[i : i + self._query_size]
+            placeholders = ",".join("?" * len(key_batch))
+            rows = self.connection.execute(
+                f"SELECT key, fitness FROM fitness_cache WHERE namespace = ? AND key IN ({placeholders})",
+                (self.namespace, *key_batch),
+            )
+            stored.update(rows)
+
+        found = np.fromiter((key in stored for key in keys), dtype=bool, count=len(keys))
+        fitness = np.fromiter((stored.get(key, np.nan) for key in keys), dtype=float, count=len(keys))
+
+        return found, fitness
+
+    def store(self, keys: Sequence[bytes], fitness: ndarray):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO fitness_cache (namespace, key, fitness) VALUES (?, ?, ?)",
+                ((self.namespace, key, float(value)) for key, value in zip(keys, fitness)),
+            )
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM fitness_cache WHERE namespace = ?", (self.namespace,))
+
+    def __len__(self) -> int:
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM fitness_cache WHERE namespace = ?", (self.namespace,)).fetchone()
+        return count
+
+
+def get_cache(cache: bool | int | str | FitnessCache, count_hits: bool = False, namespace: str = "default") -> FitnessCache | None:
+    """
+    Interprets the value of the 'cache' parameter of an objective function.
+
+    Parameters
+    ----------
+    cache: bool | int | str | FitnessCache
+        False or None to disable the cache, True to use an LRU cache with the default size,
+        an integer to use an LRU cache of that size, the path of an sqlite database to store
+        the fitness in disk or an already created cache.
+    count_hits: bool, optional
+        Whether the solutions found in the cache count as evaluations of the objective function.
+        Only used when a new cache is created.
+    namespace: str, optional
+        Identifier of the objective function in the sqlite database, None to let the objective function
+        derive it from its definition.
+
+    Returns
+    -------
+    cache: FitnessCache | None
+    """
+
+    if cache is None or cache is False:
+        return None
+
+    if cache is True:
+        return LRUFitnessCache(count_hits=count_hits)
+
+    if isinstance(cache, FitnessCache):
+        return cache
+
+    if isinstance(cache, (int, np.integer)):
+        return LRUFitnessCache(int(cache), count_hits=count_hits)
+
+    if isinstance(cache, (str, os.PathLike)):
+        return SQLiteFitnessCache(os.fspath(cache), namespace=namespace, count_hits=count_hits)
+
+    raise ValueError('The "cache" parameter must be a boolean, the size of the cache, a path to a database or a FitnessCache.')
@@ -0,0 +1,32 @@
+from __future__ import annotations
+from ..Initializer import Initializer
+from ..bitpack import packed_size
+from ..operators.operator_functions.binary import random_words
+
+
+class BitPackInitializer(Initializer):
+    """
+    Initializer that generates random binary vectors packed in 64 bit words.
+
+    Parameters
+    ----------
+    vecsize: int
+        Number of bits of each vector.
+    pop_size: int, optional
+        Number of individuals to be generated.
+    encoding: Encoding, optional
+        Encoding that will be passed to each individual. Use 'BitPackEncoding' if the objective
+        function expects vectors of zeros and ones instead of packed words.
+    """
+
+    def __init__(self, vecsize, pop_size=1, encoding=None):
+        self.vecsize = vecsize
+        self.genotype_size = packed_size(vecsize)
+
+        super().__init__(pop_size, encoding)
+
+    def generate_random(self):
+        return random_words(self.genotype_size, self.vecsize)
+
+    def generate_batch(self, n_indiv):
+        return random_words((n_indiv, self.genotype_size), self.vecsize)
@@ -23,3 +23,6 @@ class PermInitializer(Initializer):
 
     def generate_random(self):
         return RAND_GEN.permutation(self.genotype_size)
+
+    def generate_batch(self, n_indiv):
+        return RAND_GEN.permuted(np.tile(np.arange(self.genotype_size), (n_indiv, 1)), axis=1)
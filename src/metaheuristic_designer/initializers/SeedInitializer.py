@@ -46,6 +46,18 @@ class SeedProbInitializer(Initializer):
 
         return new_indiv
 
+    def generate_batch(self, n_indiv):
+        inserted_mask = RAND_GEN.random(n_indiv) < self.insert_prob
+        n_inserted = np.count_nonzero(inserted_mask)
+
+        inserted = [self.solutions[i] for i in RAND_GEN.integers(0, len(self.solutions), n_inserted)]
+        generated = self.default_init.generate_batch(n_indiv - n_inserted)
+
+        # The inserted solutions are placed in the positions where they were chosen
+        order = np.argsort(np.concatenate((np.flatnonzero(inserted_mask), np.flatnonzero(~inserted_mask))))
+
+        return _join_batches(inserted, generated, order)
+
 
 class SeedDetermInitializer(Initializer):
     """
@@ -93,7 +105,38 @@ class SeedDetermInitializer(Initializer):
         self.inserted += 1
         return new_indiv
 
+    def generate_batch(self, n_indiv):
+        n_inserted = min(max(self.number_to_insert - self.inserted, 0), n_indiv)
+
+        inserted = [self.solutions[(self.inserted + i) % len(self.solutions)] for i in range(n_inserted)]
+        generated = self.default_init.generate_batch(n_indiv - n_inserted)
+        self.inserted += n_indiv
+
+        return _join_batches(inserted, generated)
+
     def generate_population(self, objfunc, n_indiv=None):
         self.inserted = 0
 
         return super().generate_population(objfunc, n_indiv)
+
+
+def _join_batches(inserted, generated, order=None):
+    """
+    Joins the predefined solutions with the generated individuals, reordering them if 'order' is given.
+    """
+
+    if isinstance(generated, np.ndarray):
+        # An empty list of solutions would be converted to floats and change the type of the batch
+        if len(inserted) == 0:
+            batch = generated
+        else:
+            batch = np.concatenate((np.reshape(inserted, (-1,) + generated.shape[1:]), generated))
+    else:
+        batch = list(inserted) + list(generated)
+        if len(batch) > 0 and isinstance(batch[0], np.ndarray):
+            batch = np.asarray(batch)
+
+    if order is not None:
+        batch = batch[order] if isinstance(batch, np.ndarray) else [batch[i] for i in order]
+
+    return batch
@@ -23,10 +23,12 @@ class UniformVectorInitializer(Initializer):
         Encoding that will be passed to each individual.
     dtype: type, optional
         Data type used in each of the components of the vector in the individual.
+    storage_dtype: type, optional
+        Data type used to store the genotypes of the population, the solutions generated by the operators will be converted to it.
     """
 
-    def __init__(self, genotype_size, low_lim, up_lim, pop_size=1, encoding=None, dtype=float):
-        super().__init__(pop_size, encoding)
+    def __init__(self, genotype_size, low_lim, up_lim, pop_size=1, encoding=None, dtype=float, storage_dtype=None):
+        super().__init__(pop_size, encoding, storage_dtype)
 
         self.genotype_size = genotype_size
         if isinstance(encoding, AdaptionEncoding):
@@ -51,13 +53,17 @@ class UniformVectorInitializer(Initializer):
         self.dtype = dtype
 
     def generate_random(self):
-        new_vector_float = RAND_GEN.uniform(self.low_lim, self.up_lim, size=self.genotype_size)
-        if self.dtype is int:
-            new_vector = np.round(new_vector_float).astype(self.dtype)
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, n_indiv):
+        new_vectors_float = RAND_GEN.uniform(self.low_lim, self.up_lim, size=(n_indiv, self.genotype_size))
+
+        if np.issubdtype(self.dtype, np.integer):
+            new_vectors = np.round(new_vectors_float).astype(self.dtype)
         else:
-            new_vector = new_vector_float.astype(self.dtype)
+            new_vectors = new_vectors_float.astype(self.dtype)
 
-        return new_vector
+        return new_vectors
 
     def generate_individual(self):
         return self.generate_random()
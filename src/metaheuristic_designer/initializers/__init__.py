@@ -4,3 +4,4 @@ from .SeedInitializer import SeedDetermInitializer, SeedProbInitializer
 from .DirectInitializer import DirectInitializer
 from .PermInitializer import PermInitializer
 from .InitializerFromLambda import InitializerFromLambda
+from .BitPackInitializer import BitPackInitializer
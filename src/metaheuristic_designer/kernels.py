@@ -0,0 +1,180 @@
+"""
+Optional acceleration of the hot functions of the package with numba.
+
+Each kernel has a NumPy implementation and an equivalent version written with plain loops that numba
+can compile. Whether numba is used is decided when the package is imported, by checking if it is
+installed, but it is only imported and the loops are only compiled the first time a kernel is called,
+so that importing the package doesn't get slower. The compiled kernels are cached on disk by default,
+use 'warmup' to compile them before a short run.
+
+Setting the environment variable METAHEURISTIC_DESIGNER_NUMBA to "0" disables numba.
+"""
+
+from __future__ import annotations
+from typing import Callable, Iterable
+import os
+import importlib.util
+import numpy as np
+
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+_numba_enabled = NUMBA_AVAILABLE and os.environ.get("METAHEURISTIC_DESIGNER_NUMBA", "1") != "0"
+_numba_cache = True
+
+_kernels = {}
+
+
+class Kernel:
+    """
+    Function with a NumPy implementation and a loop implementation that is compiled with numba if it is available.
+
+    Parameters
+    ----------
+    name: str
+        Name used to register the kernel.
+    numpy_func: Callable
+        Implementation used when numba is not available.
+    loop_func: Callable
+        Implementation with the same inputs and outputs written with loops supported by numba in nopython mode.
+    example_args: Callable, optional
+        Function that returns a tuple of arguments used to compile the kernel in 'warmup'.
+    rows: bool, optional
+        Whether the first argument is a vector or a matrix with one vector per row and the output
+        has one value per row. In that case 'loop_func' only receives matrices.
+    """
+
+    def __init__(self, name: str, numpy_func: Callable, loop_func: Callable, example_args: Callable = None, rows: bool = False):
+        self.name = name
+        self.numpy_func = numpy_func
+        self.loop_func = loop_func
+        self.example_args = example_args
+        self.rows = rows
+        self.__doc__ = numpy_func.__doc__
+        self._compiled = None
+
+    @property
+    def jitted(self) -> bool:
+        """
+        Whether calling the kernel uses the compiled version.
+        """
+
+        return _numba_enabled
+
+    def compile(self) -> Callable:
+        """
+        Compiles the loop implementation with numba (only the first time it is called).
+        """
+
+        if self._compiled is None:
+            import numba
+
+            self._compiled = numba.njit(cache=_numba_cache)(self.loop_func)
+
+        return self._compiled
+
+    def __call__(self, *args):
+        if not _numba_enabled:
+            return self.numpy_func(*args)
+
+        if not self.rows:
+            return self.compile()(*args)
+
+        vectors, *args = args
+        vectors = np.asarray(vectors)
+        matrix = np.ascontiguousarray(vectors.reshape((-1, vectors.shape[-1])), dtype=float)
+        return self.compile()(matrix, *args).reshape(vectors.shape[:-1])[()]
+
+
+def register_kernel(name: str, numpy_func: Callable, loop_func: Callable, example_args: Callable = None, rows: bool = False) -> Kernel:
+    """
+    Creates a kernel and registers it with the given name.
+
+    Parameters
+    ----------
+    name: str
+        Name used to register the kernel.
+    numpy_func: Callable
+        Implementation used when numba is not available.
+    loop_func: Callable
+        Implementation written with loops supported by numba in nopython mode.
+    example_args: Callable, optional
+        Function that returns a tuple of arguments used to compile the kernel in 'warmup'.
+    rows: bool, optional
+        Whether the kernel is evaluated on each row of the first argument.
+
+    Returns
+    -------
+    kernel: Kernel
+    """
+
+    kernel = Kernel(name, numpy_func, loop_func, example_args, rows)
+    _kernels[name] = kernel
+
+    return kernel
+
+
+def get_kernel(name: str) -> Kernel:
+    """
+    Returns the kernel registered with the given name.
+    """
+
+    if name not in _kernels:
+        raise ValueError(f'Kernel "{name}" is not registered, the available kernels are: {", ".join(_kernels)}.')
+
+    return _kernels[name]
+
+
+def registered_kernels() -> list:
+    """
+    Returns the names of the registered kernels.
+    """
+
+    return list(_kernels)
+
+
+def use_numba(enabled: bool = True, cache: bool = True):
+    """
+    Chooses whether the kernels are compiled with numba.
+
+    Parameters
+    ----------
+    enabled: bool, optional
+        Whether to use the compiled kernels. It is ignored if numba is not installed.
+    cache: bool, optional
+        Whether to store the compiled kernels on disk so that they aren't compiled again in the next runs.
+    """
+
+    global _numba_enabled, _numba_cache
+
+    _numba_enabled = enabled and NUMBA_AVAILABLE
+    if cache != _numba_cache:
+        _numba_cache = cache
+        for kernel in _kernels.values():
+            kernel._compiled = None
+
+
+def warmup(names: Iterable[str] = None):
+    """
+    Compiles the kernels so that the compilation time is not spent during the optimization.
+
+    Parameters
+    ----------
+    names: Iterable[str], optional
+        Names of the kernels to compile, by default all of them.
+    """
+
+    if not _numba_enabled:
+        return
+
+    # The kernels are registered when the modules that define them are imported
+    from . import benchmarks, operators, selectionMethods
+
+    if names is None:
+        names = registered_kernels()
+
+    for name in names:
+        kernel = get_kernel(name)
+        if kernel.example_args is not None:
+            kernel(*kernel.example_args())
+        else:
+            kernel.compile()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from copy import copy
+import enum
+from enum import Enum
+import numpy as np
+from ..Operator import Operator
+from .operator_functions.binary import *
+from ..ParamScheduler import ParamScheduler
+from ..utils import RAND_GEN
+
+
+class BinOpMethods(Enum):
+    ONE_POINT = enum.auto()
+    TWO_POINT = enum.auto()
+    MULTIPOINT = enum.auto()
+    XOR_CROSS = enum.auto()
+    XOR = enum.auto()
+    RANDOM = enum.auto()
+    CUSTOM = enum.auto()
+    NOTHING = enum.auto()
+
+    @staticmethod
+    def from_str(str_input):
+        str_input = str_input.lower()
+
+        if str_input not in bin_ops_map:
+            raise ValueError(f'Binary operator "{str_input}" not defined')
+
+        return bin_ops_map[str_input]
+
+
+bin_ops_map = {
+    "1point": BinOpMethods.ONE_POINT,
+    "2point": BinOpMethods.TWO_POINT,
+    "multipoint": BinOpMethods.MULTIPOINT,
+    "uniform": BinOpMethods.MULTIPOINT,
+    "xorcross": BinOpMethods.XOR_CROSS,
+    "flipcross": BinOpMethods.XOR_CROSS,
+    "xor": BinOpMethods.XOR,
+    "flip": BinOpMethods.XOR,
+    "random": BinOpMethods.RANDOM,
+    "custom": BinOpMethods.CUSTOM,
+    "nothing": BinOpMethods.NOTHING,
+}
+
+
+class OperatorBinary(Operator):
+    """
+    Operator class that has mutation and cross methods for bit-packed binary vectors.
+
+    Each individual is stored as a vector of 64 bit words (see the 'BitPackEncoding' encoding
+    and the 'BitPackInitializer' initializer), so the operators work on 64 components at a time.
+
+    Parameters
+    ----------
+    method: str
+        Type of operator that will be applied.
+    params: ParamScheduler or dict, optional
+        Dictionary of parameters to define the operator.
+        The number of bits of each vector is read from the "vecsize" parameter or
+        from the objective function if it isn't given.
+    name: str, optional
+        Name that is associated with the operator.
+    """
+
+    def __init__(self, method: str, params: ParamScheduler | dict = None, name: str = None):
+        """
+        Constructor for the OperatorBinary class
+        """
+
+        if name is None:
+            name = method
+
+        super().__init__(params, name)
+
+        self.method = BinOpMethods.from_str(method)
+
+    def evolve(self, population, initializer=None):
+        new_population = None
+        population_matrix = population.genotype_set
+
+        params = copy(self.params)
+
+        n_bits = params.get("vecsize", population.objfunc.vecsize)
+
+        if "Cr" in params and "N" not in params:
+            params["N"] = RAND_GEN.binomial(n_bits, params["Cr"])
+
+        if "N" in params:
+            params["N"] = round(params["N"])
+            params["N"] = min(params["N"], n_bits)
+
+        # Perform one of the methods (switch-case like structure)
+        match self.method:
+            case BinOpMethods.ONE_POINT:
+                population_matrix = packed_cross_1p(population_matrix, n_bits)
+
+            case BinOpMethods.TWO_POINT:
+                population_matrix = packed_cross_2p(population_matrix, n_bits)
+
+            case BinOpMethods.MULTIPOINT:
+                population_matrix = packed_cross_mp(population_matrix)
+
+            case BinOpMethods.XOR_CROSS:
+                population_matrix = packed_xor_cross(population_matrix)
+
+            case BinOpMethods.XOR:
+                population_matrix = packed_flip_mutation(population_matrix, params["N"], n_bits)
+
+            case BinOpMethods.RANDOM:
+                new_population = initializer.generate_population(population.objfunc, len(population))
+
+            case BinOpMethods.CUSTOM:
+                fn = params["function"]
+                population_matrix = fn(population_matrix, population.objfunc, params)
+
+            case BinOpMethods.NOTHING:
+                new_population = copy(population)
+
+        if new_population is None:
+            new_population = population.update_genotype_set(population_matrix)
+
+        return new_population
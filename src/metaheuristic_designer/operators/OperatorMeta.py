@@ -5,6 +5,7 @@ from enum import Enum
 from copy import copy
 import numpy as np
 from ..Operator import Operator
+from ..Population import Population, PopulationArena
 from ..ParamScheduler import ParamScheduler
 from ..utils import RAND_GEN
 
@@ -86,6 +87,9 @@ class OperatorMeta(Operator):
 
         self.method = MetaOpMethods.from_str(method)
 
+        # Reusable storage for the output of the operators applied to each individual
+        self._arena = PopulationArena()
+
         # Record of the index of the last operator used
         self.chosen_idx = params.get("init_idx", -1)
         self.mask = params.get("mask", 0)
@@ -94,40 +98,68 @@ class OperatorMeta(Operator):
         if self.method == MetaOpMethods.BRANCH and "weights" not in params and "p" in params and len(op_list) == 2:
             params["weights"] = [params["p"], 1 - params["p"]]
 
+    def _dispatch(self, population, chosen_idx, initializer=None):
+        """
+        Evolves each individual with the operator in its position of 'chosen_idx', the individuals
+        with an index that doesn't correspond to any operator are kept unchanged.
+
+        Each operator receives the individuals assigned to it, as a view when they are contiguous in the
+        population, and its results are written in place into an output population reused between calls.
+        """
+
+        n_ops = len(self.op_list)
+        groups = np.where((chosen_idx >= 0) & (chosen_idx < n_ops), chosen_idx, n_ops)
+        group_bounds = np.concatenate(([0], np.cumsum(np.bincount(groups, minlength=n_ops + 1))))
+        order = np.argsort(groups, kind="stable")
+
+        new_population = self._arena.empty_like(population)
+        if group_bounds[n_ops] < len(population):
+            # The individuals without an operator keep their values
+            new_population = new_population.apply_selection(population, slice(None))
+
+        for idx, op in enumerate(self.op_list):
+            start, end = group_bounds[idx], group_bounds[idx + 1]
+
+            if start < end:
+                group_idx = order[start:end]
+                if group_idx[-1] - group_idx[0] == end - start - 1:
+                    split_population = population.take_block(group_idx[0], group_idx[-1] + 1)
+                else:
+                    split_population = population.take_selection(group_idx)
+
+                split_population = op.evolve(split_population, initializer)
+                new_population = new_population.apply_selection(split_population, group_idx)
+
+        return new_population
+
     def evolve(self, population, initializer=None):
-        new_population = copy(population)
+        new_population = population
 
         match self.method:
             case MetaOpMethods.BRANCH:
                 self.chosen_idx = RAND_GEN.choice(np.arange(len(self.op_list)), size=population.pop_size, p=self.params["weights"])
-                for idx, op in enumerate(self.op_list):
-                    split_mask = self.chosen_idx == idx
-
-                    if np.any(split_mask):
-                        split_population = population.take_selection(split_mask)
-                        split_population = op.evolve(split_population, initializer)
-                        new_population = new_population.apply_selection(split_population, split_mask)
+                new_population = self._dispatch(population, self.chosen_idx, initializer)
 
             case MetaOpMethods.PICK:
-                if isinstance(self.chosen_idx, np.ndarray) and self.chosen_idx.ndim > 0:
-                    chosen_idx = self.chosen_idx
-                else:
-                    chosen_idx = np.asarray([self.chosen_idx] * len(population))
-
                 # the chosen index is assumed to be changed by the user
-                for idx, op in enumerate(self.op_list):
-                    split_mask = chosen_idx == idx
+                chosen_idx = np.asarray(self.chosen_idx)
+                if chosen_idx.ndim == 0:
+                    chosen_idx = np.full(len(population), chosen_idx)
 
-                    if np.any(split_mask):
-                        split_population = new_population.take_selection(split_mask)
-                        split_population = op.evolve(split_population, initializer)
-                        new_population = new_population.apply_selection(split_population, split_mask)
+                new_population = self._dispatch(population, chosen_idx, initializer)
 
             case MetaOpMethods.SEQUENCE:
+                # The operators don't modify the solutions of their input, only the first one needs a view of them
+                new_population = population.take_block(0, len(population))
                 for op in self.op_list:
                     new_population = op.evolve(new_population, initializer)
 
+                # The result can't keep the solutions of the input if no operator replaced them
+                if np.may_share_memory(new_population.genotype_set, population.genotype_set):
+                    new_population = copy(new_population)
+
             case MetaOpMethods.SPLIT:
+                new_population = copy(population)
                 for idx_op, op in enumerate(self.op_list):
                     split_mask = self.mask == idx_op
 
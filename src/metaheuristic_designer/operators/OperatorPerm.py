@@ -75,7 +75,7 @@ class OperatorPerm(Operator):
 
     def evolve(self, population, initializer=None):
         new_population = None
-        population_matrix = population.genotype_set
+        population_matrix = copy(population.genotype_set)
 
         params = copy(self.params)
 
@@ -110,7 +110,7 @@ class OperatorPerm(Operator):
                 population_matrix = order_cross(population_matrix)
 
             case PermOpMethods.RANDOM:
-                new_indiv = initializer.generate_population(population.objfunc)
+                population_matrix = initializer.generate_batch(len(population))
 
             case PermOpMethods.DUMMY:
                 population_matrix = np.tile(np.arange(population_matrix.shape[1]), (population_matrix.shape[0], 1))
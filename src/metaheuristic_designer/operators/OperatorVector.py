@@ -164,9 +164,10 @@ class OperatorVector(Operator):
         new_population = None
         population_matrix = copy(population.genotype_set)
         fitness_array = copy(population.fitness)
-        speed = copy(population.speed_set)
         global_best = population.best
-        historical_best = population.historical_best_set
+
+        # The speed and the historical best are only allocated if an operator uses them
+        speed = None
 
         params = copy(self.params)
 
@@ -285,6 +286,8 @@ class OperatorVector(Operator):
 
             ## Swarm based algorithms
             case VectorOpMethods.PSO:
+                speed = copy(population.speed_set)
+                historical_best = population.historical_best_set
                 population_matrix, speed = pso_operator(
                     population_matrix, speed, historical_best, global_best, params["w"], params["c1"], params["c2"]
                 )
@@ -314,9 +317,9 @@ class OperatorVector(Operator):
                 mask_pos = np.tile(np.arange(population_matrix.shape[1]) < params["N"], population_matrix.shape[0]).reshape(population_matrix.shape)
                 mask_pos = RAND_GEN.permuted(mask_pos, axis=1)
 
-                random_population = initializer.generate_population(population.objfunc, len(population))
+                random_matrix = initializer.generate_batch(len(population))
 
-                population_matrix[mask_pos] = random_population.genotype_set[mask_pos]
+                population_matrix[mask_pos] = random_matrix[mask_pos]
 
             case VectorOpMethods.DUMMY:
                 population_matrix = dummy_op(population_matrix, params["F"])
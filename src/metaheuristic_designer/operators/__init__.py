@@ -1,5 +1,6 @@
 from .OperatorVector import OperatorVector, VectorOpMethods, vector_ops_map
 from .OperatorPerm import OperatorPerm, PermOpMethods, perm_ops_map
+from .OperatorBinary import OperatorBinary, BinOpMethods, bin_ops_map
 from .OperatorMeta import OperatorMeta, MetaOpMethods, meta_ops_map
 from .OperatorAdaptative import OperatorAdaptative
 from .OperatorNull import OperatorNull
@@ -3,3 +3,4 @@ from . import mutation
 from . import differential_evolution
 from . import swarm
 from . import permutation
+from . import binary
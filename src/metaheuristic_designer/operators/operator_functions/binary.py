@@ -0,0 +1,123 @@
+import math
+import numpy as np
+from ...utils import RAND_GEN
+from ...bitpack import WORD_BITS, ALL_ONES, prefix_mask, padding_mask
+
+
+def random_words(shape, n_bits):
+    """
+    Generates random packed binary vectors of 'n_bits' bits with the unused bits set to 0.
+    """
+
+    words = RAND_GEN.integers(0, ALL_ONES, size=shape, dtype=np.uint64, endpoint=True)
+
+    return words & padding_mask(n_bits)
+
+
+def distinct_positions(n_rows, n, n_bits):
+    """
+    Chooses 'n' different positions out of 'n_bits' for each of the 'n_rows' rows.
+
+    When 'n' is small compared to 'n_bits' the positions are sampled directly and the repeated
+    ones are sampled again, so that the cost does not depend on the size of the vectors.
+    """
+
+    n = min(n, n_bits)
+
+    if 2 * n > n_bits:
+        return np.argpartition(RAND_GEN.random((n_rows, n_bits)), n - 1, axis=1)[:, :n]
+
+    positions = RAND_GEN.integers(0, n_bits, (n_rows, n))
+    while True:
+        positions.sort(axis=1)
+        repeated = np.zeros(positions.shape, dtype=bool)
+        repeated[:, 1:] = positions[:, 1:] == positions[:, :-1]
+
+        if not repeated.any():
+            break
+
+        positions[repeated] = RAND_GEN.integers(0, n_bits, np.count_nonzero(repeated))
+
+    return positions
+
+
+def packed_flip_mutation(population, n, n_bits):
+    """
+    Flips 'n' different bits of each of the packed binary vectors in the population.
+    """
+
+    mask = np.zeros_like(population, dtype=np.uint64)
+    if n <= 0:
+        return population ^ mask
+
+    positions = distinct_positions(population.shape[0], n, n_bits)
+    rows = np.repeat(np.arange(population.shape[0]), positions.shape[1])
+    positions = positions.ravel()
+
+    bit_values = np.uint64(1) << (positions % WORD_BITS).astype(np.uint64)
+    np.bitwise_or.at(mask, (rows, positions // WORD_BITS), bit_values)
+
+    return population ^ mask
+
+
+def _cross_with_mask(population, mask_fn):
+    """
+    Combines the first and second half of the population with the bit masks generated by 'mask_fn'.
+    """
+
+    half_size = population.shape[0] / 2
+    parents1 = population[: math.ceil(half_size)]
+    parents2 = population[math.floor(half_size) :]
+
+    cross_mask = mask_fn(parents1.shape[0])
+
+    offspring1 = (parents1 & cross_mask) | (parents2 & ~cross_mask)
+    offspring2 = (parents2 & cross_mask) | (parents1 & ~cross_mask)
+
+    return np.concatenate((offspring1, offspring2))[: population.shape[0]]
+
+
+def packed_cross_1p(population, n_bits):
+    """
+    Performs a 1-point crossover between one half of the packed population and the rest.
+    """
+
+    def mask_fn(n_pairs):
+        cross_points = RAND_GEN.integers(1, n_bits, n_pairs)
+        return prefix_mask(cross_points, population.shape[1])
+
+    return _cross_with_mask(population, mask_fn)
+
+
+def packed_cross_2p(population, n_bits):
+    """
+    Performs a 2-point crossover between one half of the packed population and the rest.
+    """
+
+    def mask_fn(n_pairs):
+        cross_points1 = RAND_GEN.integers(1, n_bits - 1, n_pairs)
+        cross_points2 = RAND_GEN.integers(cross_points1 + 1, n_bits, n_pairs)
+        return prefix_mask(cross_points1, population.shape[1]) | ~prefix_mask(cross_points2, population.shape[1])
+
+    return _cross_with_mask(population, mask_fn)
+
+
+def packed_cross_mp(population):
+    """
+    Performs a multipoint (uniform) crossover between one half of the packed population and the rest.
+    """
+
+    def mask_fn(n_pairs):
+        return RAND_GEN.integers(0, ALL_ONES, size=(n_pairs, population.shape[1]), dtype=np.uint64, endpoint=True)
+
+    return _cross_with_mask(population, mask_fn)
+
+
+def packed_xor_cross(population):
+    """
+    Applies the XOR operation between each packed vector and a random member of the population.
+    """
+
+    population_shuffled = population[RAND_GEN.permutation(population.shape[0])]
+
+    return population ^ population_shuffled
@@ -1,5 +1,5 @@
 import numpy as np
-from ...utils import RAND_GEN
+from ...utils import RAND_GEN, best_indices
 
 
 def DE_rand1(population, F, CR):
@@ -103,7 +103,7 @@ def DE_current_to_pbest1(population, fitness, F, CR, P):
     """
 
     n_best_max_idx = np.ceil(population.shape[0] * P).astype(int)
-    n_best_idx = np.argsort(fitness)[::-1][:n_best_max_idx]
+    n_best_idx = best_indices(fitness, n_best_max_idx)
     chosen_idx = RAND_GEN.choice(n_best_idx, replace=True, size=population.shape[0])
 
     r_best = population[chosen_idx]
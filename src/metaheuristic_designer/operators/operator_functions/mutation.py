@@ -1,4 +1,5 @@
 import enum
+import functools
 from enum import Enum
 import numpy as np
 import scipy as sp
@@ -244,6 +245,9 @@ def rand_noise(population, **params):
 def sample_distribution(shape, loc=None, scale=None, **params):
     """
     Takes samples as a matrix with shape 'shape' from a given probablility distribution and returns them as a vector.
+
+    The common distributions are sampled directly with the random generator, scipy is only used for the
+    Levy stable distribution, whose frozen standard distributions are reused between calls.
     """
 
     distrib = params["distrib"]
@@ -252,46 +256,55 @@ def sample_distribution(shape, loc=None, scale=None, **params):
 
     match distrib:
         case ProbDist.GAUSS:
-            prob_distrib = sp.stats.norm(loc=loc, scale=scale)
+            samples = RAND_GEN.normal(loc, scale, size=shape)
         case ProbDist.UNIFORM:
-            prob_distrib = sp.stats.uniform(loc=loc, scale=scale)
+            samples = loc + scale * RAND_GEN.random(size=shape)
         case ProbDist.CAUCHY:
-            prob_distrib = sp.stats.cauchy(loc=loc, scale=scale)
+            samples = loc + scale * RAND_GEN.standard_cauchy(size=shape)
         case ProbDist.LAPLACE:
-            prob_distrib = sp.stats.laplace(loc=loc, scale=scale)
+            samples = RAND_GEN.laplace(loc, scale, size=shape)
         case ProbDist.GAMMA:
             a = params.get("a", 1)
-            prob_distrib = sp.stats.gamma(a, loc=loc, scale=scale)
+            samples = loc + RAND_GEN.gamma(a, scale, size=shape)
         case ProbDist.EXPON:
-            prob_distrib = sp.stats.expon(loc=loc, scale=scale)
+            samples = loc + RAND_GEN.exponential(scale, size=shape)
         case ProbDist.LEVYSTABLE:
             a = params.get("a", 2)
             b = params.get("b", 0)
-            prob_distrib = sp.stats.levy_stable(a, b, loc=loc, scale=scale)
+            samples = loc + scale * _standard_levy_stable(a, b).rvs(size=shape, random_state=RAND_GEN)
         case ProbDist.POISSON:
             mu = params.get("mu", 0)
-            prob_distrib = sp.stats.poisson(mu, loc=loc)
+            samples = loc + RAND_GEN.poisson(mu, size=shape)
         case ProbDist.BERNOULLI:
             p = params.get("p", 0.5)
-            prob_distrib = sp.stats.bernoulli(p, loc=loc)
+            samples = loc + RAND_GEN.binomial(1, p, size=shape)
         case ProbDist.BINOMIAL:
             n = params["n"]
             p = params.get("p", 0.5)
-            prob_distrib = sp.stats.binomial(n, p, loc=loc)
+            samples = loc + RAND_GEN.binomial(n, p, size=shape)
         case ProbDist.CATEGORICAL:
-            p = params["p"]
-            prob_distrib = sp.stats.rv_discrete(name="categorical", values=(np.arange(p.size), p / np.sum(p)))
+            p = np.asarray(params["p"])
+            samples = RAND_GEN.choice(p.size, size=shape, p=p / np.sum(p))
         # case ProbDist.MULTICATEGORICAL:
         #     p = params["p"]
         #     prob_distrib = mulitcategorial(np.arange(p.shape[0]), weight_matrix=p)
         case ProbDist.CUSTOM:
             if "distrib_class" not in params:
                 raise Exception("To use a custom probability distribution you must specify it with the 'distrib_class' parameter.")
-            prob_distrib = params["distrib_class"]
+            samples = params["distrib_class"].rvs(size=shape, random_state=RAND_GEN)
         case _:
             raise ValueError("Invalid probability distribution")
 
-    return prob_distrib.rvs(size=shape, random_state=RAND_GEN)
+    return samples
+
+
+@functools.lru_cache(maxsize=32)
+def _standard_levy_stable(a, b):
+    """
+    Frozen Levy stable distribution with location 0 and scale 1.
+    """
+
+    return sp.stats.levy_stable(a, b)
 
 
 def generate_statistic(population, **params):
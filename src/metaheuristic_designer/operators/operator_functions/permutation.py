@@ -2,6 +2,7 @@ import math
 import numpy as np
 import scipy as sp
 from ...utils import RAND_GEN
+from ...kernels import register_kernel
 
 
 def permute_mutation(population, n):
@@ -24,6 +25,26 @@ def permute_mutation(population, n):
     return population
 
 
+# Above this number of components, moving the segments of each row with slices is faster
+# than gathering the whole population with an array of indices
+SEGMENT_LOOP_MIN_SIZE = 128
+
+
+def _segment_gather(population, in_segment, segment_source, start):
+    """
+    Builds a new population where the positions of each row inside the segment take the component
+    in the position 'segment_source' of the same row, measured from the start of the segment.
+    """
+
+    n_rows, vecsize = population.shape
+    positions = np.arange(vecsize)
+    row_offset = (np.arange(n_rows) * vecsize)[:, None]
+
+    source_idx = np.where(in_segment, row_offset + start + segment_source, row_offset + positions)
+
+    return population.reshape(-1).take(source_idx)
+
+
 def roll_mutation(population, n):
     """
     Rolls a selection of components of the vector.
@@ -32,14 +53,22 @@ def roll_mutation(population, n):
     roll_start = RAND_GEN.integers(0, population.shape[1] - 2, population.shape[0])
     roll_end = RAND_GEN.integers(roll_start + 2, population.shape[1] + 1, (population.shape[0]))
 
-    def roll_individual(indiv, start, end, n):
-        indiv_copy = indiv.copy()
-        indiv_copy[start:end] = np.roll(indiv[start:end], n)
-        return indiv_copy
+    if population.shape[1] > SEGMENT_LOOP_MIN_SIZE:
+        new_population = population.copy()
+        for row, (start, end) in enumerate(zip(roll_start, roll_end)):
+            split = end - n % (end - start)
+            new_population[row, start : start + end - split] = population[row, split:end]
+            new_population[row, start + end - split : end] = population[row, start:split]
 
-    roll_vec = np.vectorize(roll_individual, signature="(m),(),(),()->(m)")
-    population = roll_vec(population, roll_start, roll_end, n)
-    return population
+        return new_population
+
+    # Each position of the segment takes the component 'n' positions behind it, wrapping around the segment
+    positions = np.arange(population.shape[1])
+    start = roll_start[:, None]
+    end = roll_end[:, None]
+    in_segment = (positions >= start) & (positions < end)
+
+    return _segment_gather(population, in_segment, (positions - start - n) % (end - start), start)
 
 
 def invert_mutation(population):
@@ -50,36 +79,144 @@ def invert_mutation(population):
     invert_start = RAND_GEN.integers(0, population.shape[1] - 2, population.shape[0])
     invert_end = RAND_GEN.integers(invert_start + 2, population.shape[1] + 1, population.shape[0])
 
-    def invert_individual(indiv, start, end):
-        indiv_copy = indiv.copy()
-        indiv_copy[start:end] = indiv[start:end][::-1]
-        return indiv_copy
+    if population.shape[1] > SEGMENT_LOOP_MIN_SIZE:
+        new_population = population.copy()
+        for row, (start, end) in enumerate(zip(invert_start, invert_end)):
+            new_population[row, start:end] = population[row, start:end][::-1]
 
-    invert_vec = np.vectorize(invert_individual, signature="(m),(),()->(m)")
-    population = invert_vec(population, invert_start, invert_end)
-    return population
+        return new_population
+
+    positions = np.arange(population.shape[1])
+    start = invert_start[:, None]
+    end = invert_end[:, None]
+    in_segment = (positions >= start) & (positions < end)
+
+    return _segment_gather(population, in_segment, end - 1 - positions, start)
+
+
+def _inverse_permutation(population):
+    """
+    Calculates the position of each value in each row of a population of permutations of 0..n-1.
+    """
+
+    inverse = np.empty_like(population)
+    np.put_along_axis(inverse, population, np.arange(population.shape[1])[None, :], axis=1)
+
+    return inverse
 
 
 def pmx(population):
+    """
+    Partially mapped crossover between each individual 'i' and the individual '2i' of the population.
+
+    The individuals must be permutations of the numbers 0..n-1.
+    """
+
     half_size = np.ceil(population.shape[0] / 2).astype(int)
+    idx1 = np.arange(half_size)
+    idx2 = 2 * idx1
+
+    parents1 = population[np.concatenate((idx1, idx2))]
+    parents2 = population[np.concatenate((idx2, idx1))]
+
+    cross_point1 = RAND_GEN.integers(0, population.shape[1] - 2, parents1.shape[0])
+    cross_point2 = RAND_GEN.integers(cross_point1 + 1, population.shape[1])
+
+    return pmx_pairs(parents1, parents2, cross_point1, cross_point2)
+
+
+def _pmx_pairs_numpy(parents1, parents2, cross_point1, cross_point2):
+    """
+    Partially mapped crossover of each row of 'parents1' with the same row of 'parents2', the segment
+    between the positions 'cross_point1' and 'cross_point2' (both included) is taken from 'parents1'
+    and the rest of the values are taken from 'parents2' in the same way as 'pmx_single'.
+
+    The individuals must be permutations of the numbers 0..n-1.
+    """
+
+    positions = np.arange(parents1.shape[1])
+    in_segment = (positions >= cross_point1[:, None]) & (positions <= cross_point2[:, None])
+
+    # Values that are inside the segment taken from the first parent
+    inverse1 = _inverse_permutation(parents1)
+    value_in_segment = np.take_along_axis(in_segment, inverse1, axis=1)
 
-    new_population = np.empty((2 * half_size, population.shape[1]), dtype=int)
-    for i in range(half_size):
-        new_population[i] = pmx_single(population[i], population[2 * i])
-        new_population[i + half_size] = pmx_single(population[2 * i], population[i])
+    # The values of the second parent that are not repeated are placed in its positions in ascending order
+    child = np.where(in_segment, parents1, parents2)
+    repeated_mask = np.take_along_axis(value_in_segment, parents2, axis=1)
+    free_mask = ~in_segment & ~repeated_mask
+    free_values = np.sort(np.where(free_mask, parents2, parents1.shape[1]), axis=1)
+    child[free_mask] = free_values[positions < np.count_nonzero(free_mask, axis=1)[:, None]]
 
-    return new_population
+    # The repeated values are replaced following the mapping between both parents in the segment
+    rows, cols = np.nonzero(~in_segment & repeated_mask)
+    values = child[rows, cols]
+    while rows.size > 0:
+        values = parents2[rows, inverse1[rows, values]]
+        child[rows, cols] = values
 
+        repeated = value_in_segment[rows, values]
+        rows, cols, values = rows[repeated], cols[repeated], values[repeated]
 
-def pmx_single(vector1, vector2):
+    return child
+
+
+def _pmx_pairs_loop(parents1, parents2, cross_point1, cross_point2):
+    n_rows, vecsize = parents1.shape
+    child = np.empty_like(parents1)
+    inverse1 = np.empty(vecsize, dtype=np.int64)
+    inverse2 = np.empty(vecsize, dtype=np.int64)
+    value_in_segment = np.empty(vecsize, dtype=np.bool_)
+
+    for row in range(n_rows):
+        start = cross_point1[row]
+        end = cross_point2[row]
+        for i in range(vecsize):
+            inverse1[parents1[row, i]] = i
+            inverse2[parents2[row, i]] = i
+            value_in_segment[parents1[row, i]] = start <= i <= end
+
+        # Values of the second parent that are not repeated, in ascending order
+        free_pos = 0
+        for value in range(vecsize):
+            pos2 = inverse2[value]
+            if not value_in_segment[value] and (pos2 < start or pos2 > end):
+                while start <= free_pos <= end or value_in_segment[parents2[row, free_pos]]:
+                    free_pos += 1
+                child[row, free_pos] = value
+                free_pos += 1
+
+        for i in range(vecsize):
+            if start <= i <= end:
+                child[row, i] = parents1[row, i]
+            elif value_in_segment[parents2[row, i]]:
+                value = parents2[row, i]
+                while value_in_segment[value]:
+                    value = parents2[row, inverse1[value]]
+                child[row, i] = value
+
+    return child
+
+
+pmx_pairs = register_kernel(
+    "pmx_pairs",
+    _pmx_pairs_numpy,
+    _pmx_pairs_loop,
+    lambda: (np.array([[0, 1, 2, 3]]), np.array([[3, 2, 1, 0]]), np.array([1]), np.array([2])),
+)
+
+
+def pmx_single(vector1, vector2, cross_point1=None, cross_point2=None):
     """
     Partially mapped crossover.
 
     Taken from https://github.com/cosminmarina/A1_ComputacionEvolutiva
     """
 
-    cross_point1 = RAND_GEN.integers(0, vector1.size - 2)
-    cross_point2 = RAND_GEN.integers(cross_point1 + 1, vector1.size)
+    if cross_point1 is None:
+        cross_point1 = RAND_GEN.integers(0, vector1.size - 2)
+    if cross_point2 is None:
+        cross_point2 = RAND_GEN.integers(cross_point1 + 1, vector1.size)
 
     # Segmentamos
     child = np.full_like(vector1, -1)
@@ -111,21 +248,98 @@ def pmx_single(vector1, vector2):
 
 
 def order_cross(population):
+    """
+    Order crossover between one half of the population and the rest.
+
+    The individuals must be permutations of the numbers 0..n-1.
+    """
+
     half_size = population.shape[0] / 2
     parents1 = population[: math.ceil(half_size)]
     parents2 = population[math.floor(half_size) :]
 
-    new_population = np.empty((2 * np.ceil(half_size).astype(int), population.shape[1]), dtype=int)
-    for i in range(math.ceil(half_size)):
-        new_population[i] = order_cross_single(parents1[i], parents2[i])
-        new_population[i + math.ceil(half_size)] = order_cross_single(parents2[i], parents1[i])
+    parents1, parents2 = np.concatenate((parents1, parents2)), np.concatenate((parents2, parents1))
+
+    cross_point1 = RAND_GEN.integers(0, population.shape[1] - 2, parents1.shape[0])
+    cross_point2 = RAND_GEN.integers(cross_point1, population.shape[1])
+
+    return order_cross_pairs(parents1, parents2, cross_point1, cross_point2)
+
+
+def _order_cross_pairs_numpy(parents1, parents2, cross_point1, cross_point2):
+    """
+    Order crossover of each row of 'parents1' with the same row of 'parents2', the segment between the
+    positions 'cross_point1' and 'cross_point2' (both included) is taken from 'parents1' and the
+    rest of the values are placed around it in ascending order, rotated 'cross_point1' positions.
+
+    The individuals must be permutations of the numbers 0..n-1.
+    """
+
+    n_rows, vecsize = parents1.shape
+    positions = np.arange(vecsize)
+    start = cross_point1[:, None]
+    end = cross_point2[:, None]
+    in_segment = (positions >= start) & (positions <= end)
+
+    # Values that are not in the segment, sorted in ascending order
+    used = np.zeros_like(in_segment)
+    np.put_along_axis(used, parents1, in_segment, axis=1)
+    unused_values = np.argsort(used, axis=1, kind="stable")
+
+    # The k-th position outside of the segment takes the unused value (k - cross_point1) mod n_unused
+    n_unused = vecsize - (end - start + 1)
+    outside_idx = np.where(positions < start, positions, positions - (end - start + 1))
+    source_idx = np.where(in_segment, 0, (outside_idx - start) % np.maximum(n_unused, 1))
+
+    child = np.take_along_axis(unused_values, source_idx, axis=1).astype(parents1.dtype, copy=False)
+    child[in_segment] = parents1[in_segment]
+
+    return child
+
+
+def _order_cross_pairs_loop(parents1, parents2, cross_point1, cross_point2):
+    n_rows, vecsize = parents1.shape
+    child = np.empty_like(parents1)
+    used = np.empty(vecsize, dtype=np.bool_)
+    unused_values = np.empty(vecsize, dtype=parents1.dtype)
+
+    for row in range(n_rows):
+        start = cross_point1[row]
+        end = cross_point2[row]
+
+        used[:] = False
+        for i in range(start, end + 1):
+            used[parents1[row, i]] = True
+            child[row, i] = parents1[row, i]
+
+        n_unused = 0
+        for value in range(vecsize):
+            if not used[value]:
+                unused_values[n_unused] = value
+                n_unused += 1
+
+        outside_idx = 0
+        for i in range(vecsize):
+            if i < start or i > end:
+                child[row, i] = unused_values[(outside_idx - start) % n_unused]
+                outside_idx += 1
+
+    return child
+
 
-    return new_population
+order_cross_pairs = register_kernel(
+    "order_cross_pairs",
+    _order_cross_pairs_numpy,
+    _order_cross_pairs_loop,
+    lambda: (np.array([[0, 1, 2, 3]]), np.array([[3, 2, 1, 0]]), np.array([1]), np.array([2])),
+)
 
 
-def order_cross_single(vector1, vector2):
-    cross_point1 = RAND_GEN.integers(0, vector1.size - 2)
-    cross_point2 = RAND_GEN.integers(cross_point1, vector1.size)
+def order_cross_single(vector1, vector2, cross_point1=None, cross_point2=None):
+    if cross_point1 is None:
+        cross_point1 = RAND_GEN.integers(0, vector1.size - 2)
+    if cross_point2 is None:
+        cross_point2 = RAND_GEN.integers(cross_point1, vector1.size)
 
     child = np.full_like(vector1, -1)
     range_vec = np.arange(vector1.size)
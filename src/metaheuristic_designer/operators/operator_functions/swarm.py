@@ -1,6 +1,4 @@
 import numpy as np
-import scipy as sp
-import scipy.spatial.distance as sp_dist
 from ...utils import RAND_GEN
 
 
@@ -32,6 +30,8 @@ def firefly(population, fitness, objfunc, alpha_0, beta_0, delta, gamma):
     sorted_population = population[fit_order]
     sorted_fitness = fitness[fit_order]
 
+    import scipy.spatial.distance as sp_dist
+
     distances = sp_dist.squareform(sp_dist.pdist())[:, :, None]
     beta = beta_0 * np.exp(-gamma * distances**2)
 
@@ -0,0 +1,400 @@
+from __future__ import annotations
+from typing import Any, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+import math
+import numpy as np
+from numpy import ndarray
+
+_parallel_backends = ["thread", "process", "shared_memory"]
+
+
+def get_backend(parallel: bool | str | Executor) -> str | Executor | None:
+    """
+    Interprets the value of the 'parallel' parameter.
+
+    Parameters
+    ----------
+    parallel: bool | str | Executor
+        False to evaluate serially, True to use the default backend ("thread"), the name
+        of a backend ("thread", "process" or "shared_memory"), an already created executor
+        or a SharedMemoryEvaluator.
+
+    Returns
+    -------
+    backend: str | Executor | SharedMemoryEvaluator | None
+        The name of the backend to use, the executor passed as an input or None if the evaluation is not parallel.
+    """
+
+    if parallel is None or parallel is False:
+        return None
+
+    if parallel is True:
+        return "thread"
+
+    if isinstance(parallel, (Executor, SharedMemoryEvaluator)):
+        return parallel
+
+    if isinstance(parallel, str):
+        backend = parallel.lower()
+        if backend not in _parallel_backends:
+            raise ValueError(f'Parallel backend "{parallel}" not defined, use "thread", "process" or "shared_memory".')
+        return backend
+
+    raise ValueError('The "parallel" parameter must be a boolean, the name of a backend or an Executor.')
+
+
+def create_executor(backend: str, threads: int = 8) -> Executor:
+    """
+    Creates a pool of workers of the given type.
+
+    Parameters
+    ----------
+    backend: str
+        Either "thread" for objectives that release the GIL or "process" for pure python objectives.
+    threads: int, optional
+        Number of workers of the pool.
+
+    Returns
+    -------
+    executor: Executor
+    """
+
+    if backend == "thread":
+        executor = ThreadPoolExecutor(max_workers=threads)
+    elif backend == "process":
+        executor = ProcessPoolExecutor(max_workers=threads)
+    else:
+        raise ValueError(f'Parallel backend "{backend}" not defined, use "thread" or "process".')
+
+    return executor
+
+
+def split_chunks(indices: ndarray, n_chunks: int) -> list[ndarray]:
+    """
+    Splits the indices of the individuals to evaluate in contiguous chunks of similar size.
+
+    Parameters
+    ----------
+    indices: ndarray
+        Indices of the individuals to be evaluated.
+    n_chunks: int
+        Maximum number of chunks to generate.
+
+    Returns
+    -------
+    chunks: list[ndarray]
+        The list of non-empty chunks.
+    """
+
+    n_chunks = max(1, min(n_chunks, len(indices)))
+    chunk_size = math.ceil(len(indices) / n_chunks)
+
+    return [indices[i : i + chunk_size] for i in range(0, len(indices), chunk_size)]
+
+
+def evaluate_chunk(objfunc: ObjectiveFunc, solutions: Sequence[Any], adjusted: bool = True) -> ndarray:
+    """
+    Evaluates a list of solutions one by one. This function is executed by the workers of the pool.
+
+    Parameters
+    ----------
+    objfunc: ObjectiveFunc
+        The objective function used to evaluate the solutions.
+    solutions: Sequence[Any]
+        Decoded solutions to be evaluated.
+    adjusted: bool, optional
+        Whether to adjust the fitness value or not.
+
+    Returns
+    -------
+    fitness: ndarray
+        The fitness of each solution.
+    """
+
+    fitness = np.empty(len(solutions))
+    for idx, solution in enumerate(solutions):
+        value = objfunc.objective(solution)
+
+        if adjusted:
+            value = objfunc.factor * (value - objfunc.penalize(solution))
+
+        fitness[idx] = value
+
+    return fitness
+
+
+def parallel_evaluate(
+    objfunc: ObjectiveFunc,
+    solutions: Sequence[Any],
+    indices: ndarray,
+    adjusted: bool = True,
+    parallel: bool | str | Executor = True,
+    threads: int = 8,
+) -> ndarray:
+    """
+    Evaluates the chosen solutions by dispatching them in chunks to a pool of workers.
+
+    Parameters
+    ----------
+    objfunc: ObjectiveFunc
+        The objective function used to evaluate the solutions.
+    solutions: Sequence[Any]
+        The decoded population.
+    indices: ndarray
+        Indices of the solutions that need to be evaluated.
+    adjusted: bool, optional
+        Whether to adjust the fitness value or not.
+    parallel: bool | str | Executor, optional
+        Backend used for the evaluation, see 'get_backend'.
+    threads: int, optional
+        Number of workers to use.
+
+    Returns
+    -------
+    fitness: ndarray
+        The fitness of the solutions in the positions given by 'indices'.
+    """
+
+    backend = get_backend(parallel)
+
+    if isinstance(backend, SharedMemoryEvaluator):
+        return backend.evaluate(solutions, indices, adjusted)
+
+    if backend == "shared_memory":
+        with SharedMemoryEvaluator(objfunc, threads) as evaluator:
+            fitness = evaluator.evaluate(solutions, indices, adjusted)
+        return fitness
+
+    chunks = split_chunks(indices, threads)
+
+    if isinstance(backend, Executor):
+        executor = backend
+        owns_executor = False
+    else:
+        executor = create_executor(backend, threads)
+        owns_executor = True
+
+    try:
+        futures = [executor.submit(evaluate_chunk, objfunc, [solutions[i] for i in chunk], adjusted) for chunk in chunks]
+        fitness = np.concatenate([future.result() for future in futures])
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=True)
+
+    return fitness
+
+
+def submit_evaluation(
+    objfunc: ObjectiveFunc, solutions: Sequence[Any], adjusted: bool = True, executor: Executor | SharedMemoryEvaluator = None
+) -> Future:
+    """
+    Sends a list of solutions to be evaluated asynchronously.
+
+    Parameters
+    ----------
+    objfunc: ObjectiveFunc
+        The objective function used to evaluate the solutions.
+    solutions: Sequence[Any]
+        Decoded solutions to be evaluated.
+    adjusted: bool, optional
+        Whether to adjust the fitness value or not.
+    executor: Executor | SharedMemoryEvaluator
+        Pool of workers where the evaluation will be performed.
+
+    Returns
+    -------
+    future: Future
+        Future that will hold the fitness of the solutions.
+    """
+
+    if isinstance(executor, SharedMemoryEvaluator):
+        return executor.submit(solutions, adjusted)
+
+    return executor.submit(evaluate_chunk, objfunc, solutions, adjusted)
+
+
+# Objective function and shared memory blocks of each worker process of a SharedMemoryEvaluator
+_worker_objfunc = None
+_worker_shm = {}
+
+
+def _init_worker(objfunc: ObjectiveFunc):
+    """
+    Stores the objective function in the worker process so that it is only sent once.
+    """
+
+    global _worker_objfunc
+    _worker_objfunc = objfunc
+
+
+def _attach_shared(name: str) -> shared_memory.SharedMemory:
+    """
+    Gets the shared memory block with the given name, closing the blocks that are no longer used.
+    """
+
+    if name not in _worker_shm:
+        for old_shm in _worker_shm.values():
+            old_shm.close()
+        _worker_shm.clear()
+        _worker_shm[name] = shared_memory.SharedMemory(name=name)
+
+    return _worker_shm[name]
+
+
+def _evaluate_shared_chunk(name: str, shape: tuple, dtype: str, chunk: ndarray, adjusted: bool) -> ndarray:
+    """
+    Evaluates the rows of the genotype matrix stored in shared memory given by 'chunk'.
+    """
+
+    shm = _attach_shared(name)
+    solutions = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    return evaluate_chunk(_worker_objfunc, [solutions[i] for i in chunk], adjusted)
+
+
+def _evaluate_pickled_chunk(solutions: Sequence[Any], adjusted: bool) -> ndarray:
+    """
+    Evaluates solutions sent to the worker, used when they cannot be stored in shared memory.
+    """
+
+    return evaluate_chunk(_worker_objfunc, solutions, adjusted)
+
+
+class SharedMemoryEvaluator:
+    """
+    Pool of worker processes that stays alive between evaluations.
+
+    The objective function is sent to each worker once when the pool is started and
+    the solutions are published in a shared memory block, so that only the indices of the
+    solutions to evaluate and the resulting fitness values are transferred in each evaluation.
+
+    Parameters
+    ----------
+    objfunc: ObjectiveFunc
+        The objective function that will be evaluated by the workers.
+    threads: int, optional
+        Number of worker processes.
+    """
+
+    def __init__(self, objfunc: ObjectiveFunc, threads: int = 8):
+        """
+        Constructor of the SharedMemoryEvaluator class.
+        """
+
+        self.objfunc = objfunc
+        self.threads = threads
+
+        self.executor = None
+        self.shm = None
+
+    def __enter__(self) -> SharedMemoryEvaluator:
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+
+    def submit(self, solutions: Sequence[Any], adjusted: bool = True) -> Future:
+        """
+        Sends a small list of solutions to be evaluated by the first worker available.
+
+        Parameters
+        ----------
+        solutions: Sequence[Any]
+            Decoded solutions to be evaluated.
+        adjusted: bool, optional
+            Whether to adjust the fitness value or not.
+
+        Returns
+        -------
+        future: Future
+            Future that will hold the fitness of the solutions.
+        """
+
+        self.start()
+        return self.executor.submit(_evaluate_pickled_chunk, solutions, adjusted)
+
+    def start(self) -> SharedMemoryEvaluator:
+        """
+        Starts the worker processes.
+
+        Returns
+        -------
+        self: SharedMemoryEvaluator
+        """
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.threads, initializer=_init_worker, initargs=(self.objfunc,))
+
+        return self
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """
+        Stops the worker processes and releases the shared memory.
+
+        Parameters
+        ----------
+        wait: bool, optional
+            Whether to wait for the evaluations in progress to end.
+        cancel_futures: bool, optional
+            Whether to cancel the evaluations that have not started yet.
+        """
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+            self.executor = None
+
+        self._release_shared()
+
+    def _release_shared(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def _publish(self, solutions: ndarray) -> ndarray:
+        """
+        Copies the solutions into the shared memory block, allocating a bigger one if needed.
+        """
+
+        if self.shm is None or self.shm.size < solutions.nbytes:
+            self._release_shared()
+            self.shm = shared_memory.SharedMemory(create=True, size=max(solutions.nbytes, 1))
+
+        shared_solutions = np.ndarray(solutions.shape, dtype=solutions.dtype, buffer=self.shm.buf)
+        shared_solutions[:] = solutions
+
+        return shared_solutions
+
+    def evaluate(self, solutions: Sequence[Any], indices: ndarray, adjusted: bool = True) -> ndarray:
+        """
+        Evaluates the chosen solutions in the worker processes.
+
+        Parameters
+        ----------
+        solutions: Sequence[Any]
+            The decoded population.
+        indices: ndarray
+            Indices of the solutions that need to be evaluated.
+        adjusted: bool, optional
+            Whether to adjust the fitness value or not.
+
+        Returns
+        -------
+        fitness: ndarray
+            The fitness of the solutions in the positions given by 'indices'.
+        """
+
+        self.start()
+        chunks = split_chunks(indices, self.threads)
+
+        if isinstance(solutions, np.ndarray) and solutions.dtype != object:
+            self._publish(solutions)
+            futures = [
+                self.executor.submit(_evaluate_shared_chunk, self.shm.name, solutions.shape, solutions.dtype.str, chunk, adjusted) for chunk in chunks
+            ]
+        else:
+            futures = [self.executor.submit(_evaluate_pickled_chunk, [solutions[i] for i in chunk], adjusted) for chunk in chunks]
+
+        return np.concatenate([future.result() for future in futures])
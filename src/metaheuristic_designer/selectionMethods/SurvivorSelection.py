@@ -1,7 +1,9 @@
 from __future__ import annotations
 import enum
 from enum import Enum
-from ..Population import Population
+import numpy as np
+from numpy import ndarray
+from ..Population import Population, PopulationArena
 from ..ParamScheduler import ParamScheduler
 from ..SelectionMethod import SelectionMethod
 from .survivor_selection_functions import *
@@ -68,6 +70,9 @@ class SurvivorSelection(SelectionMethod):
         The name that will be assigned to this selection method.
     """
 
+    # The arena only holds reusable storage, it is rebuilt in the first selection after resuming from a checkpoint
+    _checkpoint_exclude = ("arena",)
+
     def __init__(
         self,
         method: str,
@@ -85,6 +90,12 @@ class SurvivorSelection(SelectionMethod):
 
         self.method = SurvSelMethod.from_str(method)
 
+        # Reused storage for the selected individuals
+        self.arena = PopulationArena()
+
+        # Spot of the reef occupied by each individual selected with the CRO method
+        self.reef_spots = None
+
     def select(self, population: Population, offspring: Population) -> Population:
         new_population = None
         full_idx = None
@@ -129,17 +140,39 @@ class SurvivorSelection(SelectionMethod):
                 full_idx = lamb_comma_mu(population_fitness, offspring_fitness)
 
             case SurvSelMethod.CRO:
-                full_idx = cro_selection(
+                full_idx, self.reef_spots = cro_selection(
                     population_fitness,
                     offspring_fitness,
                     self.params["Fd"],
                     self.params["Pd"],
                     self.params["attempts"],
                     self.params["maxPopSize"],
+                    self.population_spots(len(population)),
                 )
 
         if new_population is None:
             self.last_selection_idx = full_idx
-            new_population = population.join(offspring).take_selection(full_idx)
+            new_population = self.arena.select(population, offspring, full_idx)
 
         return new_population
+
+    def population_spots(self, pop_size: int) -> ndarray:
+        """
+        Gets the spot of the reef occupied by each individual of the last population selected with the CRO method.
+
+        Parameters
+        ----------
+        pop_size: int
+            Size of the current population.
+
+        Returns
+        -------
+        spots: ndarray
+            The spot of each individual, if the population doesn't come from the last selection
+            the individuals occupy the first spots of the reef.
+        """
+
+        if self.reef_spots is None or len(self.reef_spots) != pop_size:
+            return np.arange(pop_size)
+
+        return self.reef_spots
@@ -2,7 +2,7 @@ import warnings
 import enum
 from enum import Enum
 import numpy as np
-from ..utils import RAND_GEN
+from ..utils import RAND_GEN, best_indices
 
 
 class SelectionDist(Enum):
@@ -47,7 +47,7 @@ def select_best(fitness, amount):
     """
 
     # Select the best indices of the best 'n' individuals
-    order = np.argsort(fitness)[::-1][:amount]
+    order = best_indices(fitness, amount)
 
     return order
 
@@ -1,6 +1,7 @@
 from copy import copy
 import numpy as np
-from ..utils import RAND_GEN
+from ..utils import RAND_GEN, best_indices
+from ..kernels import register_kernel
 
 
 def one_to_one(population_fitness, offspring_fitness):
@@ -165,8 +166,8 @@ def elitism(population_fitness, offspring_fitness, amount):
     n_parents = population_fitness.shape[0]
     amount = min(n_parents, amount)
 
-    parent_order = np.argsort(population_fitness)[::-1][:amount]
-    offspring_order = np.argsort(offspring_fitness)[::-1][: n_parents - amount]
+    parent_order = best_indices(population_fitness, amount)
+    offspring_order = best_indices(offspring_fitness, n_parents - amount)
     return np.concatenate((parent_order, offspring_order + n_parents))
 
 
@@ -199,8 +200,8 @@ def cond_elitism(population_fitness, offspring_fitness, amount):
 
     n_parents = population_fitness.shape[0]
 
-    parent_order = np.argsort(population_fitness)[::-1][:amount]
-    offspring_order = np.argsort(offspring_fitness)[::-1][: n_parents - amount]
+    parent_order = best_indices(population_fitness, amount)
+    offspring_order = best_indices(offspring_fitness, n_parents - amount)
     return np.concatenate((parent_order, offspring_order + n_parents))
 
 
@@ -225,7 +226,7 @@ def lamb_plus_mu(population_fitness, offspring_fitness):
     n_parents = population_fitness.shape[0]
 
     full_fitness = np.concatenate((population_fitness, offspring_fitness))
-    fitness_order = np.argsort(full_fitness)[::-1][:n_parents]
+    fitness_order = best_indices(full_fitness, n_parents)
 
     return fitness_order
 
@@ -249,45 +250,119 @@ def lamb_comma_mu(population_fitness, offspring_fitness):
 
     n_parents = population_fitness.shape[0]
 
-    fitness_order = np.argsort(offspring_fitness)[::-1][:n_parents] + n_parents
+    fitness_order = best_indices(offspring_fitness, n_parents) + n_parents
     return fitness_order
 
 
-def _cro_set_larvae(population_fitness, offspring_fitness, attempts, maxpopsize):
+def _cro_set_larvae(population_fitness, offspring_fitness, attempts, maxpopsize, parent_spots=None):
     """
     First step of the CRO selection function.
 
     Each individual in the offsring tries to settle down into the reef,
     if the spot they find is empty they are accepted, if there is already
     an individual in that spot, the one with the best fitness is kept.
+
+    The parents occupy the spots given in 'parent_spots', or the first spots of the reef if they are not given.
+
+    Returns the index of the individual in each spot of the reef, the parents are numbered
+    first and then the offspring, empty spots have a value of -1.
     """
 
-    # new_population = copy(population)
-    # for larva in offspring:
-    #     attempts_left = attempts
-    #     setted = False
+    n_parents = population_fitness.shape[0]
+    n_offspring = offspring_fitness.shape[0]
 
-    #     while attempts_left > 0 and not setted:
-    #         idx = random.randrange(0, maxpopsize)
+    if parent_spots is None:
+        parent_spots = np.arange(n_parents)
+    parent_spots = np.asarray(parent_spots, dtype=np.int64)
+    maxpopsize = max(maxpopsize, n_parents, parent_spots.max(initial=-1) + 1)
 
-    #         if setted := (idx >= len(new_population)):
-    #             new_population.append(larva)
-    #         elif setted := (larva.fitness > new_population[idx].fitness):
-    #             new_population[idx] = larva
+    spots = RAND_GEN.integers(0, maxpopsize, size=(n_offspring, attempts))
 
-    #         attempts_left -= 1
+    return _cro_settle_larvae(population_fitness, parent_spots, offspring_fitness, spots, maxpopsize)
+
+
+def _cro_settle_larvae_numpy(population_fitness, parent_spots, offspring_fitness, spots, maxpopsize):
+    """
+    Settles the larvae in the reef, where the parents occupy the spots in 'parent_spots'. In each attempt
+    all the larvae that haven't settled yet try the spot in the corresponding column of 'spots' at the same time.
 
-    # return new_population
+    When several larvae try the same spot the best one (the first one in case of a tie) competes
+    for it and the rest try again in the next attempt. A larva settles if the spot is empty or if it
+    is strictly better than the coral in the spot.
+    """
 
     n_parents = population_fitness.shape[0]
-    n_offspring = offspring_fitness.shape[0]
+    n_offspring, attempts = spots.shape
+
+    reef = np.full(maxpopsize, -1)
+    reef[parent_spots] = np.arange(n_parents)
+    reef_fitness = np.full(maxpopsize, -np.inf)
+    reef_fitness[parent_spots] = population_fitness
+
+    larvae = np.arange(n_offspring)
+    for attempt in range(attempts):
+        if larvae.size == 0:
+            break
+
+        # Keep the best larva aiming at each spot
+        targets = spots[larvae, attempt]
+        order = np.lexsort((larvae, -offspring_fitness[larvae], targets))
+        first_in_spot = np.ones(order.size, dtype=bool)
+        first_in_spot[1:] = targets[order[1:]] != targets[order[:-1]]
+        candidates = order[first_in_spot]
+
+        candidate_larvae = larvae[candidates]
+        candidate_spots = targets[candidates]
+        settles = (reef[candidate_spots] < 0) | (offspring_fitness[candidate_larvae] > reef_fitness[candidate_spots])
+
+        reef[candidate_spots[settles]] = n_parents + candidate_larvae[settles]
+        reef_fitness[candidate_spots[settles]] = offspring_fitness[candidate_larvae[settles]]
 
-    idx_to_compare = RAND_GEN.integers(0, n_parents, size=(n_offspring, attempts))
-    spot_fitness = population_fitness[idx_to_compare]
-    new_fitness = np.tile(offspring_fitness, (attempts, 1)).T
+        settled = np.zeros(larvae.size, dtype=bool)
+        settled[candidates[settles]] = True
+        larvae = larvae[~settled]
 
+    return reef
 
-def _cro_depredation(population, Fd, Pd):
+
+def _cro_settle_larvae_loop(population_fitness, parent_spots, offspring_fitness, spots, maxpopsize):
+    n_parents = population_fitness.shape[0]
+    n_offspring, attempts = spots.shape
+
+    reef = np.full(maxpopsize, -1)
+    reef_fitness = np.full(maxpopsize, -np.inf)
+    for i in range(n_parents):
+        reef[parent_spots[i]] = i
+        reef_fitness[parent_spots[i]] = population_fitness[i]
+
+    settled = np.zeros(n_offspring, dtype=np.bool_)
+    best_larva = np.empty(maxpopsize, dtype=np.int64)
+    for attempt in range(attempts):
+        best_larva[:] = -1
+        for larva in range(n_offspring):
+            spot = spots[larva, attempt]
+            if not settled[larva] and (best_larva[spot] < 0 or offspring_fitness[larva] > offspring_fitness[best_larva[spot]]):
+                best_larva[spot] = larva
+
+        for spot in range(maxpopsize):
+            larva = best_larva[spot]
+            if larva >= 0 and (reef[spot] < 0 or offspring_fitness[larva] > reef_fitness[spot]):
+                reef[spot] = n_parents + larva
+                reef_fitness[spot] = offspring_fitness[larva]
+                settled[larva] = True
+
+    return reef
+
+
+_cro_settle_larvae = register_kernel(
+    "cro_settle_larvae",
+    _cro_settle_larvae_numpy,
+    _cro_settle_larvae_loop,
+    lambda: (np.zeros(2), np.arange(2), np.ones(2), np.zeros((2, 2), dtype=np.int64), 3),
+)
+
+
+def _cro_depredation(reef_fitness, Fd, Pd):
     """
     Second step of the CRO selection function.
 
@@ -296,30 +371,25 @@ def _cro_depredation(population, Fd, Pd):
 
     To ensure the integrity of the algorithm at least 2 individuals will always be
     kept.
-    """
-
-    # amount = int(len(population) * Fd)
 
-    # fitness_values = [coral.fitness for coral in population]
-    # affected_corals = np.argsort(fitness_values)[:amount]
+    Returns the indices of the individuals that survive.
+    """
 
-    # alive_count = len(population)
-    # dead_list = [False] * len(population)
+    n_corals = reef_fitness.shape[0]
+    amount = int(n_corals * Fd)
 
-    # for idx, val in enumerate(affected_corals):
-    #     if alive_count <= 2:
-    #         break
+    # The worst corals die first, until only 2 of them are left
+    affected_corals = np.argsort(reef_fitness, kind="stable")[:amount]
+    dies = RAND_GEN.random(amount) <= Pd
+    dies &= np.cumsum(dies) <= n_corals - 2
 
-    #     dies = random.random() <= Pd
-    #     dead_list[idx] = dies
-    #     if dies:
-    #         alive_count -= 1
+    alive = np.ones(n_corals, dtype=bool)
+    alive[affected_corals[dies]] = False
 
-    # return [c for idx, c in enumerate(population) if not dead_list[idx]]
-    return []
+    return np.flatnonzero(alive)
 
 
-def cro_selection(population_fitness, offspring_fitness, Fd, Pd, attempts, maxpopsize):
+def cro_selection(population_fitness, offspring_fitness, Fd, Pd, attempts, maxpopsize, parent_spots=None):
     """
     Selection method of the Coral Reef Optimization algorithm.
     The offspring first tries to be inserted into the population, then
@@ -328,10 +398,10 @@ def cro_selection(population_fitness, offspring_fitness, Fd, Pd, attempts, maxpo
 
     Parameters
     ----------
-    popul: List[Individual]
-        Original population of individuals before being operated on.
-    offspring: List[Individual]
-        Individuals resulting from an iteration of the algorithm.
+    population_fitness: ndarray
+        Fitness of the original population of individuals before being operated on.
+    offspring_fitness: ndarray
+        Fitness of the individuals resulting from an iteration of the algorithm.
     Fd: float
         Proportion of individuals with the worse fintess that will go through
         a depredation step.
@@ -343,16 +413,24 @@ def cro_selection(population_fitness, offspring_fitness, Fd, Pd, attempts, maxpo
         position with an individual with a better fitness value.
     maxpopsize: int
         Maximum size of the population.
+    parent_spots: ndarray, optional
+        Spot of the reef occupied by each individual of the original population. By default
+        they occupy the first spots of the reef.
 
     Returns
     -------
-    survivors: List[Individual]
-        The individuals selected for the next generation.
+    survivors: ndarray
+        The indices of the individuals selected for the next generation, the parents are
+        numbered first and then the offspring.
+    survivor_spots: ndarray
+        Spot of the reef occupied by each of the selected individuals.
     """
 
-    # setted_corals = _cro_set_larvae(popul, offspring, attempts, maxpopsize)
-    # reduced_population = _cro_depredation(setted_corals, Fd, Pd)
-    # return reduced_population
+    reef = _cro_set_larvae(population_fitness, offspring_fitness, attempts, maxpopsize, parent_spots)
+    occupied = np.flatnonzero(reef >= 0)
+    corals = reef[occupied]
+
+    full_fitness = np.concatenate((population_fitness, offspring_fitness))
+    survivors = _cro_depredation(full_fitness[corals], Fd, Pd)
 
-    # DELETEME (debug)
-    return lamb_plus_mu(population_fitness, offspring_fitness)
+    return corals[survivors], occupied[survivors]
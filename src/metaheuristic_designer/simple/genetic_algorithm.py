@@ -1,10 +1,10 @@
 from __future__ import annotations
 from ..ObjectiveFunc import ObjectiveVectorFunc
 from ..Algorithm import Algorithm
-from ..initializers import UniformVectorInitializer
-from ..operators import OperatorVector
+from ..initializers import UniformVectorInitializer, BitPackInitializer
+from ..operators import OperatorVector, OperatorBinary
 from ..selectionMethods import SurvivorSelection, ParentSelection
-from ..encodings import TypeCastEncoding
+from ..encodings import TypeCastEncoding, BitPackEncoding
 from ..strategies import GA
 from ..algorithms import GeneralAlgorithm
 
@@ -47,6 +47,8 @@ def _genetic_algorithm_bin_vec(params, objfunc):
     """
     Instantiates a genetic algorithm to optimize the given objective function.
     This objective function should accept binary coded vectors.
+
+    If the "packed" parameter is set, the vectors are stored packed in 64 bit words.
     """
 
     pop_size = params.get("pop_size", 100)
@@ -60,12 +62,21 @@ def _genetic_algorithm_bin_vec(params, objfunc):
     else:
         vecsize = objfunc.vecsize
 
-    encoding = TypeCastEncoding(int, bool)
+    if params.get("packed", False):
+        # The bits are stored in 64 bit words, only decoded if the objective doesn't work with packed vectors
+        encoding = None if getattr(objfunc, "packed", False) else BitPackEncoding(vecsize)
 
-    pop_initializer = UniformVectorInitializer(vecsize, 0, 1, pop_size=pop_size, dtype=int, encoding=encoding)
+        pop_initializer = BitPackInitializer(vecsize, pop_size=pop_size, encoding=encoding)
 
-    cross_op = OperatorVector(cross_method)
-    mutation_op = OperatorVector("Flip", {"N": mutstr})
+        cross_op = OperatorBinary(cross_method)
+        mutation_op = OperatorBinary("Flip", {"N": mutstr})
+    else:
+        encoding = TypeCastEncoding(int, bool)
+
+        pop_initializer = UniformVectorInitializer(vecsize, 0, 1, pop_size=pop_size, dtype=int, encoding=encoding)
+
+        cross_op = OperatorVector(cross_method)
+        mutation_op = OperatorVector("Flip", {"N": mutstr})
 
     parent_sel_op = ParentSelection("Best", {"amount": n_parents})
     selection_op = SurvivorSelection("KeepBest")
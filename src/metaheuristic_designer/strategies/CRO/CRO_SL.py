@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Union, List
 from copy import deepcopy
+import numpy as np
 from ...selectionMethods import SurvivorSelection
 from ...ParamScheduler import ParamScheduler
 from ...SearchStrategy import SearchStrategy
@@ -20,15 +21,17 @@ class CRO_SL(SearchStrategy):
         params: ParamScheduler | dict = None,
         name: str = "CRO-SL",
     ):
+        # The reef has a spot for each individual of the initializer and starts partially occupied
+        maxpopsize = initializer.pop_size
         initializer = deepcopy(initializer)
-        initializer.pop_size = round(initializer.pop_size * params["rho"])
+        initializer.pop_size = round(maxpopsize * params["rho"])
 
         super().__init__(initializer, params=params, name=name)
 
         # Hyperparameters of the algorithm
-        self.maxpopsize = initializer.pop_size
+        self.maxpopsize = maxpopsize
         self.operator_list = operator_list
-        self.operator_idx = [i % len(operator_list) for i in range(initializer.pop_size)]
+        self.operator_idx = np.arange(maxpopsize) % len(operator_list)
 
         # self.operator = OperatorMeta("Branch", operator_list)
         self.operator = OperatorMeta("Pick", operator_list)
@@ -40,10 +43,16 @@ class CRO_SL(SearchStrategy):
                 "Fd": params["Fd"],
                 "Pd": params["Pd"],
                 "attempts": params["attempts"],
-                "maxPopSize": initializer.pop_size,
+                "maxPopSize": maxpopsize,
             },
         )
 
+    def perturb(self, parents, **kwargs):
+        # Each coral is evolved with the operator of the substrate of its spot
+        self.operator.chosen_idx = np.asarray(self.operator_idx)[self.survivor_sel.population_spots(len(parents))]
+
+        return super().perturb(parents, **kwargs)
+
     def select_individuals(self, population, offspring, **kwargs):
         return self.survivor_sel(population, offspring)
 
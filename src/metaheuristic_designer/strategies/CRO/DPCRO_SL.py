@@ -1,8 +1,10 @@
 from __future__ import annotations
-import random
 from typing import Union, List
+from copy import copy
 import numpy as np
+from ...utils import RAND_GEN
 from ...ParamScheduler import ParamScheduler
+from ...HistoryRecorder import _RingBuffer
 from .CRO_SL import CRO_SL
 
 
@@ -30,43 +32,57 @@ class DPCRO_SL(CRO_SL):
         self.dyn_metric = params["dyn_metric"]
         self.dyn_steps = params["dyn_steps"]
         self.prob_amp = params["prob_amp"]
+        self.prob_amp_warned = False
 
-        self.operator_idx = random.choices(range(len(self.operator_list)), k=self.maxpopsize)
-        self.operator_weight = [1 / len(operator_list)] * len(operator_list)
+        n_operators = len(operator_list)
+        self.operator_idx = RAND_GEN.integers(0, n_operators, self.maxpopsize)
+        self.operator_weight = np.full(n_operators, 1 / n_operators)
 
-        if self.dyn_method == "success":
-            self.operator_data = [[0] for i in operator_list]
-        else:
-            self.operator_data = [[] for i in operator_list]
+        # Substrate of each larva produced in the last generation
+        self.larva_substrate = np.zeros(0, dtype=int)
 
-        self.operator_metric_prev = [0 for i in operator_list]
+        # Data gathered from the larvae of each substrate since the last evaluation of the operators
+        self.larva_count = np.zeros(n_operators, dtype=int)
+        self.settled_count = np.zeros(n_operators, dtype=int)
+        self.larva_fitness = []
+        self.larva_fitness_substrate = []
 
-        self.larva_count = [0 for i in operator_list]
+        self.operator_metric_prev = np.zeros(n_operators)
 
-        self.operator_w_history = []
+        # Weight and evaluation of each operator in the last 'history_size' generations
+        history_size = params.get("history_size", 1000)
+        self.operator_w_history = _RingBuffer(history_size)
         self.op_steps = 0
-        self.operator_metric = [0] * len(operator_list)
-        self.operator_history = []
+        self.operator_metric = np.zeros(n_operators)
+        self.operator_history = _RingBuffer(history_size)
+
+    def _operator_metric(self, data, substrate, n_groups):
+        """
+        Reduces the fitness of the larvae of each substrate to a single value, substrates without data get a 0.
+        """
 
-    def _operator_metric(self, data):
-        result = 0
+        count = np.bincount(substrate, minlength=n_groups)
+        result = np.zeros(n_groups)
 
         # Choose what information to extract from the data gathered
-        if len(data) > 0:
-            if self.dyn_metric == "best":
-                result = max(data)
-            elif self.dyn_metric == "avg":
-                result = sum(data) / len(data)
-            elif self.dyn_metric == "med":
-                data = sorted(data)
-                if len(data) % 2 == 0:
-                    result = (data[len(data) // 2 - 1] + data[len(data) // 2]) / 2
-                else:
-                    result = data[len(data) // 2]
-            elif self.dyn_metric == "worse":
-                result = min(data)
-
-        return result
+        if self.dyn_metric == "best":
+            result = np.full(n_groups, -np.inf)
+            np.maximum.at(result, substrate, data)
+        elif self.dyn_metric == "avg":
+            result = np.bincount(substrate, weights=data, minlength=n_groups) / np.maximum(count, 1)
+        elif self.dyn_metric == "med":
+            order = np.lexsort((data, substrate))
+            sorted_data = data[order]
+            group_start = np.cumsum(count) - count
+            lower = group_start + (count - 1) // 2
+            upper = group_start + count // 2
+            has_data = count > 0
+            result[has_data] = (sorted_data[lower[has_data]] + sorted_data[upper[has_data]]) / 2
+        elif self.dyn_metric == "worse":
+            result = np.full(n_groups, np.inf)
+            np.minimum.at(result, substrate, data)
+
+        return np.where(count > 0, result, 0)
 
     def _operator_probability(self, values):
         # Normalization to avoid passing big values to softmax
@@ -98,38 +114,31 @@ class DPCRO_SL(CRO_SL):
         return prob
 
     def _evaluate_operators(self):
-        metric = 0
-
-        # take reference data for the calculation of the difference of the next evaluation
-        if self.dyn_method == "diff":
-            full_data = [data_point for op_data in self.operator_data for data_point in op_data]
-            metric = self._operator_metric(full_data)
-
-        # calculate the value of each operator with the data gathered
-        for idx, s_data in enumerate(self.operator_data):
-            if self.dyn_method == "success":
-                # obtain the rate of success of the larvae
-                if self.larva_count[idx] > 0:
-                    self.operator_metric[idx] = s_data[0] / self.larva_count[idx]
-                else:
-                    self.operator_metric[idx] = 0
-
-                # Reset data for nex iteration
-                self.operator_data[idx] = [0]
-                self.larva_count[idx] = 0
-
-            elif self.dyn_method == "fitness" or self.dyn_method == "diff":
-                # obtain the value used in the evaluation of the operator
-                self.operator_metric[idx] = self._operator_metric(s_data)
-
-                # Calculate the difference of the fitness in this generation to the previous one and
-                # store the current value for the next evaluation
-                if self.dyn_method == "diff":
-                    self.operator_metric[idx] = self.operator_metric[idx] - self.operator_metric_prev[idx]
-                    self.operator_metric_prev[idx] = metric
-
-                # Reset data for next iteration
-                self.operator_data[idx] = []
+        n_operators = len(self.operator_list)
+
+        if self.dyn_method == "success":
+            # obtain the rate of success of the larvae
+            self.operator_metric = self.settled_count / np.maximum(self.larva_count, 1)
+
+        elif self.dyn_method == "fitness" or self.dyn_method == "diff":
+            data = np.concatenate(self.larva_fitness) if self.larva_fitness else np.zeros(0)
+            substrate = np.concatenate(self.larva_fitness_substrate) if self.larva_fitness_substrate else np.zeros(0, dtype=int)
+
+            # obtain the value used in the evaluation of the operator
+            self.operator_metric = self._operator_metric(data, substrate, n_operators)
+
+            # Calculate the difference of the fitness in this generation to the previous one and
+            # store the reference value of the whole reef for the next evaluation
+            if self.dyn_method == "diff":
+                metric = self._operator_metric(data, np.zeros_like(substrate), 1)[0]
+                self.operator_metric = self.operator_metric - self.operator_metric_prev
+                self.operator_metric_prev = np.full(n_operators, metric)
+
+        # Reset data for next iteration
+        self.larva_count[:] = 0
+        self.settled_count[:] = 0
+        self.larva_fitness = []
+        self.larva_fitness_substrate = []
 
     def _generate_substrates(self, progress=0):
         n_operators = len(self.operator_list)
@@ -143,68 +152,66 @@ class DPCRO_SL(CRO_SL):
         self.operator_w_history.append(self.operator_weight)
 
         # Choose each operator with the weights chosen
-        self.operator_idx = random.choices(range(n_operators), weights=self.operator_weight, k=self.maxpopsize)
+        self.operator_idx = RAND_GEN.choice(n_operators, size=self.maxpopsize, p=self.operator_weight)
 
         # save the evaluation of each operator
-        self.operator_history.append(np.array(self.operator_metric))
-
-    def perturb(self, parent_list, objfunc, **kwargs):
-        offspring = []
+        self.operator_history.append(self.operator_metric)
 
-        divided_population = [[] for i in self.operator_list]
-        for idx, indiv in enumerate(parent_list):
-            op_idx = self.operator_idx[idx]
-            divided_population[op_idx].append(indiv)
+    def perturb(self, parents, **kwargs):
+        # Each coral is evolved with the operator of the substrate of its spot
+        self.larva_substrate = self.operator_idx[self.survivor_sel.population_spots(len(parents))]
 
-        for idx, indiv in enumerate(parent_list):
-            # Select operator
-            op_idx = self.operator_idx[idx]
-
-            op = self.operator_list[op_idx]
-
-            new_parent_list = divided_population[op_idx] if self.group_subs else parent_list
-
-            # Apply operator
-            new_indiv = op.evolve_single(indiv, new_parent_list, objfunc, self.initializer, self.best)
-            new_indiv.genotype = objfunc.repair_solution(new_indiv.genotype)
-            new_indiv.speed = objfunc.repair_speed(new_indiv.speed)
-
-            # Collect data about each operator
-            if self.dyn_method == "fitness" or self.dyn_method == "diff":
-                self.operator_data[op_idx].append(new_indiv.fitness)
-
-            # Add to offspring list
-            offspring.append(new_indiv)
-
-        # Update best solution
-        current_best = max(offspring, key=lambda x: x.fitness)
-        if self.best.fitness < current_best.fitness:
-            self.best = current_best
-
-        return offspring
+        if self.group_subs:
+            # Each operator only uses the corals of its substrate
+            self.operator.chosen_idx = self.larva_substrate
+            offspring = self.operator.evolve(parents, self.initializer)
+        else:
+            # Each operator evolves the corals of its substrate together with donors from the rest of the reef
+            offspring = copy(parents)
+            for op_idx, op in enumerate(self.operator_list):
+                substrate_mask = self.larva_substrate == op_idx
+                substrate_idx = np.flatnonzero(substrate_mask)
+                if substrate_idx.size > 0:
+                    donor_idx = self._choose_donors(substrate_mask)
+                    op_input = parents.take_selection(np.concatenate((substrate_idx, donor_idx)))
+                    op_offspring = op.evolve(op_input, self.initializer).take_selection(np.arange(substrate_idx.size))
+                    offspring = offspring.apply_selection(op_offspring, substrate_mask)
+
+        return self.repair_population(offspring)
+
+    def _choose_donors(self, substrate_mask):
+        """
+        Chooses as many corals outside of a substrate as there are inside of it (or all of them if there
+        aren't enough), they are placed after the corals of the substrate so that operators that combine
+        individuals can use the whole reef.
+        """
+
+        others = np.flatnonzero(~substrate_mask)
+        n_donors = min(np.count_nonzero(substrate_mask), others.size)
+
+        return RAND_GEN.choice(others, size=n_donors, replace=False)
 
     def select_individuals(self, population, offspring, **kwargs):
-        offspring_ids = [i.id for i in offspring]
         new_population = self.survivor_sel(population, offspring)
-        new_ids = [i.id for i in new_population]
 
-        for idx, off_id in enumerate(offspring_ids):
-            op_idx = self.operator_idx[idx]
+        # Collect data about each operator
+        n_operators = len(self.operator_list)
+        selection_idx = np.asarray(self.survivor_sel.last_selection_idx)
+        settled = selection_idx[selection_idx >= len(population)] - len(population)
 
-            self.larva_count[op_idx] += 1
+        self.larva_count += np.bincount(self.larva_substrate, minlength=n_operators)
+        self.settled_count += np.bincount(self.larva_substrate[settled], minlength=n_operators)
 
-            if off_id in new_ids:
-                self.operator_data[op_idx][0] += 1
+        if self.dyn_method == "fitness" or self.dyn_method == "diff":
+            self.larva_fitness.append(offspring.fitness.copy())
+            self.larva_fitness_substrate.append(self.larva_substrate)
 
         return new_population
 
     def update_params(self, **kwargs):
         super().update_params(**kwargs)
 
-        progress = kwargs["progress"]
-
-        self._generate_substrates(progress)
-        super().update_params(progress=progress)
+        self._generate_substrates(kwargs["progress"])
 
     def extra_step_info(self):
         print("\n\tSubstrate probability:")
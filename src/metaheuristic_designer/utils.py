@@ -21,6 +21,9 @@ class NumpyEncoder(json.JSONEncoder):
 
 RAND_GEN = np.random.default_rng()
 
+# Below this population size sorting the whole population is faster than selecting the best individuals first
+PARTIAL_SORT_MIN_SIZE = 256
+
 
 def get_rng():
     """
@@ -49,3 +52,45 @@ def reset_seed(seed=0):
     RAND_GEN.bit_generator.state = bit_gen(seed).state
 
     return RAND_GEN
+
+
+def best_indices(fitness, amount):
+    """
+    Returns the indices of the 'amount' individuals with the highest fitness, from best to worst.
+
+    Equivalent to 'np.argsort(fitness, kind="stable")[::-1][:amount]' (individuals with the same fitness
+    are ordered from the last to the first) but only the selected individuals are sorted, so the
+    cost is linear in the size of the population when 'amount' is small.
+
+    Parameters
+    ----------
+    fitness: ndarray
+        Fitness of each individual.
+    amount: int
+        Number of individuals to select.
+
+    Returns
+    -------
+    order: ndarray
+        Indices of the selected individuals.
+    """
+
+    fitness = np.asarray(fitness)
+    n_indiv = fitness.shape[0]
+    amount = max(min(amount, n_indiv), 0)
+
+    if amount == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if n_indiv < PARTIAL_SORT_MIN_SIZE or 4 * amount > n_indiv:
+        return np.argsort(fitness, kind="stable")[::-1][:amount]
+
+    # Every individual at least as good as the one in position 'amount' is a candidate, so the individuals
+    # tied with it are sorted with the rest to break the ties in the same way as a full sort
+    threshold = np.partition(fitness, n_indiv - amount)[n_indiv - amount]
+    if np.isnan(threshold):
+        candidates = np.flatnonzero(np.isnan(fitness))
+    else:
+        candidates = np.flatnonzero((fitness >= threshold) | np.isnan(fitness))
+
+    return candidates[np.argsort(fitness[candidates], kind="stable")[::-1][:amount]]
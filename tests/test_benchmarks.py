@@ -1,6 +1,11 @@
 import pytest
+import numpy as np
 
+from metaheuristic_designer import Population, ObjectiveVectorFunc
 from metaheuristic_designer.initializers import UniformVectorInitializer
+from metaheuristic_designer.algorithms import GeneralAlgorithm
+from metaheuristic_designer.operators import OperatorVector
+from metaheuristic_designer.strategies import DE
 from metaheuristic_designer.benchmarks import *
 import metaheuristic_designer as mhd
 
@@ -67,3 +72,197 @@ def test_fitness(vecsize, bench_class):
     population = pop_init.generate_population(objfunc)
     objfunc.fitness(population, adjusted=False)
     objfunc.fitness(population, adjusted=True)
+
+
+@pytest.mark.parametrize("vecsize", [2, 5, 10, 30])
+@pytest.mark.parametrize("bench_class", real_benchmarks)
+def test_objective_batched(vecsize, bench_class):
+    objfunc = bench_class(vecsize)
+    pop_init = UniformVectorInitializer(vecsize, objfunc.low_lim, objfunc.up_lim, pop_size=100)
+    population = pop_init.generate_population(objfunc)
+
+    batched = objfunc.objective(population.genotype_set)
+    one_by_one = np.array([objfunc.objective(indiv) for indiv in population.genotype_set])
+
+    assert objfunc.vectorized
+    assert batched.shape == (100,)
+    np.testing.assert_allclose(batched, one_by_one, rtol=1e-10)
+
+
+class ClipOnlyPositive(ObjectiveVectorFunc):
+    def __init__(self, vecsize):
+        super().__init__(vecsize, low_lim=-10, up_lim=10)
+
+    def objective(self, solution):
+        return solution.sum()
+
+    def repair_solution(self, solution):
+        return np.maximum(solution, 0)
+
+
+@pytest.mark.parametrize("bench_class", real_benchmarks + [ClipOnlyPositive])
+def test_repair_population(bench_class):
+    objfunc = bench_class(10)
+    genotype = mhd.RAND_GEN.uniform(-200, 200, (50, 10))
+    population = Population(objfunc, genotype.copy(), speed_set=genotype.copy())
+
+    population.repair_solutions()
+
+    expected = np.array([objfunc.repair_solution(indiv) for indiv in genotype])
+    np.testing.assert_array_equal(population.genotype_set, expected)
+    expected_speed = np.array([objfunc.repair_speed(speed) for speed in genotype])
+    np.testing.assert_array_equal(population.speed_set, expected_speed)
+
+
+def _three_sat_loop(objfunc, solution):
+    n_satisfied = 0
+    for clause in objfunc.clauses:
+        bool_vals = solution[np.abs(clause) - 1].astype(bool)
+        n_satisfied += np.any(np.logical_xor(bool_vals, clause < 0))
+    return n_satisfied / objfunc.clauses.shape[0]
+
+
+# The last clauses repeat a variable to check that its literals change together
+sat_clauses = np.concatenate([mhd.RAND_GEN.integers(1, 21, (80, 3)) * mhd.RAND_GEN.choice([-1, 1], (80, 3)), [[3, 3, -5], [4, -4, 7], [-6, -6, -6]]])
+
+
+def test_three_sat_vectorized():
+    objfunc = ThreeSAT(sat_clauses)
+    solutions = mhd.RAND_GEN.integers(0, 2, (30, objfunc.vecsize))
+
+    expected = [_three_sat_loop(objfunc, solution) for solution in solutions]
+    np.testing.assert_allclose(objfunc.objective(solutions), expected)
+    np.testing.assert_allclose(objfunc(Population(objfunc, solutions)), expected)
+    assert objfunc.objective(solutions[0]) == pytest.approx(expected[0])
+
+
+def test_three_sat_flip_delta():
+    objfunc = ThreeSAT(sat_clauses)
+    n_clauses = sat_clauses.shape[0]
+    solutions = mhd.RAND_GEN.integers(0, 2, (5, objfunc.vecsize))
+
+    delta = objfunc.flip_delta(solutions)
+    for row, solution in enumerate(solutions):
+        for var_idx in range(objfunc.vecsize):
+            flipped = solution.copy()
+            flipped[var_idx] = 1 - flipped[var_idx]
+            expected = (objfunc.objective(flipped) - objfunc.objective(solution)) * n_clauses
+            assert delta[row, var_idx] == round(expected)
+
+    # Flip variables one by one updating the number of true literals incrementally
+    solution = solutions[0].copy()
+    true_count = objfunc.true_literal_count(solution)
+    for var_idx in mhd.RAND_GEN.integers(0, objfunc.vecsize, 40):
+        expected = objfunc.flip_delta(solution, true_count)[var_idx]
+        assert objfunc.flip_variable(solution, var_idx, true_count) == expected
+        np.testing.assert_array_equal(true_count, objfunc.true_literal_count(solution))
+
+
+tsp_distances = mhd.RAND_GEN.uniform(0, 50, (20, 20))
+tsp_distances = tsp_distances + tsp_distances.T
+np.fill_diagonal(tsp_distances, 0)
+
+
+@pytest.mark.parametrize(
+    "objfunc", [Sphere(20), HighCondElliptic(20), Rastrigin(20), MaxOnesReal(20), MaxOnes(20), ThreeSAT(sat_clauses), TSP(tsp_distances)]
+)
+def test_delta_fitness(objfunc):
+    assert objfunc.has_delta
+
+    solutions = mhd.RAND_GEN.integers(0, 2, (10, objfunc.vecsize)).astype(float)
+    changed_idx = np.argsort(mhd.RAND_GEN.random(solutions.shape), axis=1)[:, :3]
+    new_values = 1 - np.take_along_axis(solutions, changed_idx, axis=1)
+
+    modified = solutions.copy()
+    np.put_along_axis(modified, changed_idx, new_values, axis=1)
+
+    fitness = objfunc.objective(solutions)
+    np.testing.assert_allclose(objfunc.delta_fitness(solutions, fitness, changed_idx, new_values), objfunc.objective(modified))
+    assert objfunc.delta_fitness(solutions[0], fitness[0], changed_idx[0], new_values[0]) == pytest.approx(objfunc.objective(modified[0]))
+
+    assert not Ackley(20).has_delta
+    assert Ackley(20).delta_fitness(solutions[0], fitness[0], changed_idx[0], new_values[0]) is None
+
+
+@pytest.mark.parametrize("objfunc", [Sphere(10, "min"), HighCondElliptic(10, "min")])
+def test_delta_fitness_long_run(objfunc):
+    # DE with a low crossover rate changes few components, so almost every individual is updated incrementally
+    mhd.reset_seed(0)
+    pop_init = UniformVectorInitializer(10, objfunc.low_lim, objfunc.up_lim, pop_size=20)
+    search_strat = DE(pop_init, OperatorVector("DE/rand/1", {"F": 0.8, "Cr": 0.1}))
+    algorithm = GeneralAlgorithm(objfunc, search_strat, params={"stop_cond": "ngen", "ngen": 3000, "verbose": False})
+    algorithm.optimize()
+
+    # The stored fitness doesn't drift away from the objective value, even after it decreased by many orders of magnitude
+    population = search_strat.population
+    objective = objfunc.objective(population.decode())
+    assert objective.max() < 1e-20
+    assert np.all(population.fitness <= 0)
+    np.testing.assert_allclose(-population.fitness, objective, rtol=1e-9)
+
+
+def test_tsp_from_file(tmp_path):
+    objfunc = TSP.from_file("data/tsp_examples/r20_01.csv")
+    edges = np.loadtxt("data/tsp_examples/r20_01.csv", delimiter=",", skiprows=1)
+
+    assert objfunc.vecsize == 20
+    assert objfunc.symmetric
+    assert objfunc.distances[int(edges[0, 0]), int(edges[0, 1])] == edges[0, 2]
+    assert objfunc.distances.max() == 20 * edges[:, 2].max()
+
+    # The matrix is stored next to the csv file and memory-mapped in the next loads
+    csv_path = tmp_path / "r20_01.csv"
+    csv_path.write_text(open("data/tsp_examples/r20_01.csv").read())
+    mapped_objfunc = TSP.from_file(str(csv_path), mmap=True)
+    assert isinstance(mapped_objfunc.distances, np.memmap)
+    assert (tmp_path / "r20_01.npy").exists()
+    np.testing.assert_array_equal(TSP.from_file(str(csv_path)).distances, objfunc.distances)
+
+    # Matrices with a different missing weight are stored apart
+    weighted_objfunc = TSP.from_file(str(csv_path), missing_weight=1e6, mmap=True)
+    assert weighted_objfunc.distances.max() == 1e6
+    assert TSP.from_file(str(csv_path), mmap=True).distances.max() == 20 * edges[:, 2].max()
+    assert TSP.from_file(str(csv_path), missing_weight=1e6, mmap=True).distances.max() == 1e6
+
+    cache_dir = tmp_path / "cache"
+    TSP.from_file(str(csv_path), mmap=True, cache_dir=str(cache_dir))
+    assert (cache_dir / "r20_01.npy").exists()
+
+
+def test_tsp_objective():
+    objfunc = TSP(tsp_distances)
+    tours = np.array([mhd.RAND_GEN.permutation(20) for _ in range(10)])
+
+    expected = [sum(tsp_distances[tour[i], tour[(i + 1) % 20]] for i in range(20)) for tour in tours]
+    np.testing.assert_allclose(objfunc.objective(tours), expected)
+    np.testing.assert_allclose(objfunc(Population(objfunc, tours)), -np.array(expected))
+
+    np.testing.assert_array_equal(objfunc.repair_population(tours), tours)
+    assert sorted(objfunc.repair_solution(np.array([3, 1, 1, 0]))) == [0, 1, 2, 3]
+
+
+def test_tsp_moves():
+    objfunc = TSP(tsp_distances)
+    tour = mhd.RAND_GEN.permutation(20)
+    length = objfunc.objective(tour)
+
+    for i in range(20):
+        for j in range(20):
+            swapped = tour.copy()
+            swapped[[i, j]] = swapped[[j, i]]
+            assert objfunc.swap_delta(tour, i, j) == pytest.approx(objfunc.objective(swapped) - length)
+
+            inserted = list(tour)
+            inserted.insert(j, inserted.pop(i))
+            assert objfunc.insert_delta(tour, i, j) == pytest.approx(objfunc.objective(np.array(inserted)) - length)
+
+            if i <= j:
+                reversed_tour = tour.copy()
+                reversed_tour[i : j + 1] = reversed_tour[i : j + 1][::-1]
+                assert objfunc.two_opt_delta(tour, i, j) == pytest.approx(objfunc.objective(reversed_tour) - length)
+
+    tours = np.array([mhd.RAND_GEN.permutation(20) for _ in range(10)])
+    i, j = mhd.RAND_GEN.integers(0, 20, (2, 10))
+    np.testing.assert_allclose(objfunc.two_opt_delta(tours, np.minimum(i, j), np.maximum(i, j)), [
+        objfunc.two_opt_delta(tour, min(a, b), max(a, b)) for tour, a, b in zip(tours, i, j)
+    ])
@@ -0,0 +1,78 @@
+import pytest
+
+import numpy as np
+from metaheuristic_designer.bitpack import pack_bits, unpack_bits, popcount, padding_mask, packed_size
+from metaheuristic_designer.operators.operator_functions.binary import *
+import metaheuristic_designer as mhd
+
+mhd.reset_seed(0)
+
+n_indiv = 20
+
+
+def random_bits(n_bits):
+    return mhd.RAND_GEN.integers(0, 2, (n_indiv, n_bits))
+
+
+@pytest.mark.parametrize("n_bits", [1, 10, 63, 64, 65, 200])
+def test_pack_roundtrip(n_bits):
+    bits = random_bits(n_bits)
+    packed = pack_bits(bits)
+
+    assert packed.dtype == np.uint64
+    assert packed.shape == (n_indiv, packed_size(n_bits))
+    assert np.all(packed & ~padding_mask(n_bits) == 0)
+    np.testing.assert_array_equal(unpack_bits(packed, n_bits), bits)
+    np.testing.assert_array_equal(pack_bits(bits[0]), packed[0])
+
+
+@pytest.mark.parametrize("n_bits", [10, 64, 200])
+def test_popcount(n_bits):
+    bits = random_bits(n_bits)
+    np.testing.assert_array_equal(popcount(pack_bits(bits)), bits.sum(axis=1))
+
+
+@pytest.mark.parametrize("n_bits", [10, 64, 200])
+@pytest.mark.parametrize("n", [0, 1, 3, 8])
+def test_flip_mutation(n_bits, n):
+    bits = random_bits(n_bits)
+    packed = pack_bits(bits)
+
+    mutated = unpack_bits(packed_flip_mutation(packed, n, n_bits), n_bits)
+
+    np.testing.assert_array_equal((mutated != bits).sum(axis=1), n)
+
+
+@pytest.mark.parametrize("n_bits", [10, 64, 200])
+@pytest.mark.parametrize("cross_fn", [packed_cross_1p, packed_cross_2p, packed_cross_mp])
+def test_crossover(n_bits, cross_fn):
+    # One half of the population has all its bits set and the other one has none
+    bits = np.zeros((n_indiv, n_bits), dtype=int)
+    bits[: n_indiv // 2] = 1
+    packed = pack_bits(bits)
+
+    if cross_fn is packed_cross_mp:
+        offspring = cross_fn(packed)
+    else:
+        offspring = cross_fn(packed, n_bits)
+
+    assert offspring.shape == packed.shape
+    assert np.all(offspring & ~padding_mask(n_bits) == 0)
+
+    offspring_bits = unpack_bits(offspring, n_bits)
+    half = n_indiv // 2
+    np.testing.assert_array_equal(offspring_bits[:half] + offspring_bits[half:], 1)
+
+    if cross_fn is packed_cross_1p:
+        # The first parent gives the start of the vector and the second one gives the rest
+        assert np.all(np.diff(offspring_bits[:half], axis=1) <= 0)
+        assert np.all(offspring_bits[:half, 0] == 1)
+        assert np.all(offspring_bits[:half, -1] == 0)
+
+
+def test_xor_cross():
+    bits = random_bits(100)
+    offspring = packed_xor_cross(pack_bits(bits))
+
+    assert offspring.shape == (n_indiv, 2)
+    assert np.all(offspring & ~padding_mask(100) == 0)
@@ -0,0 +1,97 @@
+import pytest
+
+import numpy as np
+from metaheuristic_designer import Population
+from metaheuristic_designer.operators import OperatorBinary, bin_ops_map
+from metaheuristic_designer.initializers import BitPackInitializer
+from metaheuristic_designer.encodings import BitPackEncoding
+from metaheuristic_designer.benchmarks import MaxOnes, ThreeSAT, BinKnapsack
+from metaheuristic_designer.bitpack import unpack_bits, padding_mask
+from metaheuristic_designer.simple import genetic_algorithm
+import metaheuristic_designer as mhd
+
+mhd.reset_seed(0)
+
+bin_ops = [i for i in bin_ops_map.keys() if i != "custom"]
+
+pop_size = 100
+
+
+@pytest.mark.parametrize("vecsize", [10, 64, 1000])
+@pytest.mark.parametrize("op_method", bin_ops)
+def test_basic_working(vecsize, op_method):
+    objfunc = MaxOnes(vecsize, packed=True)
+    pop_init = BitPackInitializer(vecsize, pop_size)
+    population = pop_init.generate_population(objfunc)
+    operator = OperatorBinary(op_method, "default")
+
+    new_population = operator.evolve(population, pop_init)
+
+    assert isinstance(new_population, Population)
+    assert new_population.genotype_set.dtype == np.uint64
+    assert new_population.genotype_set.shape == population.genotype_set.shape
+    assert np.all(new_population.genotype_set & ~padding_mask(vecsize) == 0)
+
+
+def test_custom():
+    objfunc = MaxOnes(100, packed=True)
+    population = BitPackInitializer(100, pop_size).generate_population(objfunc)
+    fitness = objfunc(population).copy()
+    operator = OperatorBinary("custom", {"function": lambda words, objfunc, params: ~words})
+
+    new_population = operator.evolve(population).repair_solutions()
+    np.testing.assert_array_equal(objfunc(new_population), 100 - fitness)
+
+
+def test_packed_fitness():
+    objfunc = MaxOnes(200, packed=True)
+    population = BitPackInitializer(200, pop_size).generate_population(objfunc)
+
+    bits = unpack_bits(population.genotype_set, 200)
+    np.testing.assert_array_equal(objfunc(population), bits.sum(axis=1))
+
+
+def test_bitpack_encoding():
+    clauses = mhd.RAND_GEN.integers(1, 71, (300, 3)) * mhd.RAND_GEN.choice([-1, 1], (300, 3))
+    objfunc = ThreeSAT(clauses)
+    encoding = BitPackEncoding(objfunc.vecsize)
+    population = BitPackInitializer(objfunc.vecsize, pop_size, encoding=encoding).generate_population(objfunc)
+
+    decoded = population.decode()
+    assert decoded.shape == (pop_size, objfunc.vecsize)
+
+    genotype = population.genotype_set.copy()
+    population.repair_solutions()
+    np.testing.assert_array_equal(population.genotype_set, genotype)
+
+    np.testing.assert_array_equal(objfunc(population), [objfunc.objective(solution) for solution in decoded])
+
+
+def test_bitpack_repair(monkeypatch):
+    clauses = mhd.RAND_GEN.integers(1, 71, (300, 3)) * mhd.RAND_GEN.choice([-1, 1], (300, 3))
+    objfunc = ThreeSAT(clauses)
+    encoding = BitPackEncoding(objfunc.vecsize)
+    population = BitPackInitializer(objfunc.vecsize, pop_size, encoding=encoding).generate_population(objfunc)
+    genotype = population.genotype_set.copy()
+    population.genotype_set |= ~padding_mask(objfunc.vecsize)
+
+    # The default repair leaves binary vectors unchanged, so the words are repaired without unpacking them
+    monkeypatch.setattr(encoding, "decode", None)
+    population.repair_solutions()
+    np.testing.assert_array_equal(population.genotype_set, genotype)
+
+    # Other repairs are applied to the unpacked vectors
+    knapsack = BinKnapsack(mhd.RAND_GEN.random(70), mhd.RAND_GEN.random(70), 10)
+    assert not knapsack.repair_is_identity(0, 1)
+
+
+@pytest.mark.parametrize("cross", ["1point", "2point", "multipoint", "xorcross"])
+def test_packed_genetic_algorithm(cross):
+    objfunc = MaxOnes(300, packed=True)
+    params = {"encoding": "bin", "packed": True, "cross": cross, "stop_cond": "neval", "neval": 2000, "verbose": False}
+
+    algorithm = genetic_algorithm(params, objfunc)
+    population = algorithm.optimize()
+
+    assert population.genotype_set.dtype == np.uint64
+    assert algorithm.best_solution()[1] > 150
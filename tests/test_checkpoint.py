@@ -0,0 +1,154 @@
+import pytest
+
+import json
+import numpy as np
+from metaheuristic_designer import ParamScheduler
+from metaheuristic_designer.selectionMethods import ParentSelection, SurvivorSelection
+from metaheuristic_designer.algorithms import GeneralAlgorithm, MemeticAlgorithm
+from metaheuristic_designer.operators import OperatorVector
+from metaheuristic_designer.initializers import UniformVectorInitializer
+from metaheuristic_designer.strategies import GA, SA, DE, PSO, DPCRO_SL, HillClimb, LocalSearch, VNS
+from metaheuristic_designer.benchmarks import Sphere
+from metaheuristic_designer.checkpoint import save_checkpoint, load_checkpoint
+import metaheuristic_designer as mhd
+
+
+def build_algorithm(strategy_name, params):
+    objfunc = Sphere(10, "min")
+    mutation_op = OperatorVector("RandNoise", ParamScheduler("Linear", {"distrib": "Gauss", "F": [0.01, 0.0001]}))
+    cross_op = OperatorVector("Multipoint")
+    parent_sel = ParentSelection("Best", ParamScheduler("Linear", {"amount": [30, 15]}))
+    survivor_sel = SurvivorSelection("(m+n)")
+    single_init = UniformVectorInitializer(10, objfunc.low_lim, objfunc.up_lim, pop_size=1)
+    pop_init = UniformVectorInitializer(10, objfunc.low_lim, objfunc.up_lim, pop_size=30)
+
+    match strategy_name:
+        case "HillClimb":
+            search_strat = HillClimb(single_init, mutation_op)
+        case "SA":
+            search_strat = SA(single_init, mutation_op, {"iter": 7, "temp_init": 10, "alpha": 0.9})
+        case "GA":
+            search_strat = GA(pop_init, mutation_op, cross_op, parent_sel, survivor_sel)
+        case "DE":
+            search_strat = DE(
+                pop_init, OperatorVector("DE/current-to-pbest/1", ParamScheduler("Linear", {"F": [0.8, 0.9], "Cr": [0.8, 0.5], "P": 0.1}))
+            )
+        case "PSO":
+            search_strat = PSO(pop_init, {"w": 0.7, "c1": 1.5, "c2": 1.5})
+        case "DPCRO_SL":
+            cro_params = {
+                "rho": 0.6,
+                "Fb": 0.95,
+                "Fd": 0.1,
+                "Pd": 0.9,
+                "attempts": 3,
+                "group_subs": True,
+                "dyn_method": "fitness",
+                "dyn_metric": "avg",
+                "dyn_steps": 10,
+                "prob_amp": 0.1,
+            }
+            search_strat = DPCRO_SL(pop_init, [mutation_op, cross_op], cro_params)
+        case "VNS":
+            neighborhoods = [OperatorVector("RandNoise", {"distrib": "Gauss", "F": f}) for f in (1, 0.1, 0.01)]
+            search_strat = VNS(single_init, neighborhoods, LocalSearch(single_init, mutation_op, params={"iters": 5}), params={"iters": 5})
+        case "Memetic":
+            search_strat = GA(pop_init, mutation_op, cross_op, parent_sel, survivor_sel)
+            local_search = LocalSearch(single_init, mutation_op, params={"iters": 3})
+            return MemeticAlgorithm(objfunc, search_strat, local_search, ParentSelection("Best", {"amount": 5}), params=params)
+
+    return GeneralAlgorithm(objfunc, search_strat, params=params)
+
+
+@pytest.mark.parametrize("strategy_name", ["HillClimb", "SA", "GA", "DE", "PSO", "DPCRO_SL", "VNS", "Memetic"])
+def test_resume(tmp_path, strategy_name):
+    checkpoint_file = str(tmp_path / "checkpoint.npz")
+    params = {"stop_cond": "ngen", "ngen": 30, "verbose": False}
+
+    mhd.reset_seed(0)
+    algorithm = build_algorithm(strategy_name, params | {"checkpoint_file": checkpoint_file, "checkpoint_every": 20})
+    algorithm.optimize()
+
+    # The random generator is reseeded to check that its state is taken from the checkpoint
+    mhd.reset_seed(1)
+    resumed = build_algorithm(strategy_name, params).resume(checkpoint_file)
+    assert resumed.steps == 20
+    resumed.optimize(initialize=False)
+
+    population = algorithm.search_strategy.population
+    resumed_population = resumed.search_strategy.population
+    np.testing.assert_array_equal(resumed_population.genotype_set, population.genotype_set)
+    np.testing.assert_array_equal(resumed_population.fitness, population.fitness)
+    np.testing.assert_array_equal(resumed.fit_history, algorithm.fit_history)
+    assert resumed.steps == algorithm.steps
+    assert resumed.objfunc.counter == algorithm.objfunc.counter
+
+
+def test_save_and_resume(tmp_path):
+    checkpoint_file = str(tmp_path / "checkpoint.npz")
+
+    mhd.reset_seed(0)
+    algorithm = build_algorithm("GA", {"stop_cond": "ngen", "ngen": 10, "verbose": False})
+    algorithm.optimize()
+    algorithm.save_checkpoint(checkpoint_file)
+    assert not (tmp_path / "checkpoint.npz.tmp").exists()
+
+    # The configuration is taken from the new algorithm, the state from the checkpoint
+    resumed = build_algorithm("GA", {"stop_cond": "ngen", "ngen": 15, "verbose": False}).resume(checkpoint_file)
+    assert resumed.ngen == 15
+    assert resumed.steps == 10
+    np.testing.assert_array_equal(resumed.search_strategy.population.genotype_set, algorithm.search_strategy.population.genotype_set)
+
+    resumed.optimize(initialize=False)
+    assert resumed.steps == 15
+    assert len(resumed.fit_history) == 15
+
+
+def test_checkpoint_size(tmp_path):
+    checkpoint_file = tmp_path / "checkpoint.npz"
+
+    mhd.reset_seed(0)
+    algorithm = build_algorithm("GA", {"stop_cond": "ngen", "ngen": 10, "verbose": False})
+    algorithm.optimize()
+    algorithm.save_checkpoint(str(checkpoint_file))
+
+    # Only the state is stored, not the preallocated history or the buffers of the survivor selection
+    genotype_size = algorithm.search_strategy.population.genotype_set.nbytes
+    assert checkpoint_file.stat().st_size < genotype_size + 50000
+
+    resumed = build_algorithm("GA", {"stop_cond": "ngen", "ngen": 15, "verbose": False}).resume(str(checkpoint_file))
+    assert resumed.history._fitness.capacity == algorithm.history._fitness.capacity
+    np.testing.assert_array_equal(resumed.fit_history, algorithm.fit_history)
+    resumed.optimize(initialize=False)
+    assert len(resumed.fit_history) == 15
+
+
+def test_shared_objects(tmp_path):
+    checkpoint_file = str(tmp_path / "checkpoint.npz")
+    shared = {"a": np.arange(5), "b": [1.5, "x", None]}
+
+    operator = OperatorVector("RandNoise", {"distrib": "Gauss", "F": 0.1})
+    objects = {"first": operator, "second": [operator, shared]}
+    save_checkpoint(checkpoint_file, objects)
+
+    new_operator = OperatorVector("RandNoise", {"distrib": "Gauss", "F": 0.5})
+    restored = load_checkpoint(checkpoint_file, {"first": new_operator, "second": [None, {}]})
+
+    assert restored["first"] is new_operator
+    assert restored["second"][0] is new_operator
+    assert new_operator.params["F"] == 0.1
+    np.testing.assert_array_equal(restored["second"][1]["a"], shared["a"])
+    assert restored["second"][1]["b"] == shared["b"]
+
+
+def test_version(tmp_path):
+    checkpoint_file = str(tmp_path / "checkpoint.npz")
+    save_checkpoint(checkpoint_file, {})
+
+    with np.load(checkpoint_file) as data:
+        metadata = json.loads(data["checkpoint_metadata"].item().decode())
+    metadata["version"] = -1
+    np.savez(checkpoint_file, checkpoint_metadata=np.array(json.dumps(metadata).encode()))
+
+    with pytest.raises(ValueError):
+        load_checkpoint(checkpoint_file, {})
@@ -0,0 +1,178 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from metaheuristic_designer import Population, ObjectiveVectorFunc
+from metaheuristic_designer.fitness_cache import LRUFitnessCache, SQLiteFitnessCache, get_cache, solution_key
+from metaheuristic_designer.benchmarks import MaxOnes, Sphere, ThreeSAT
+import metaheuristic_designer as mhd
+
+mhd.reset_seed(0)
+
+pop_size = 20
+vecsize = 8
+
+
+class CountingObjective(ObjectiveVectorFunc):
+    def __init__(self, vecsize, **kwargs):
+        super().__init__(vecsize, mode="max", **kwargs)
+        self.calls = 0
+
+    def objective(self, solution):
+        self.calls += 1
+        return solution.sum()
+
+
+@pytest.mark.parametrize("count_hits", [True, False])
+@pytest.mark.parametrize("parallel", [False, "thread"])
+def test_repeated_solutions(count_hits, parallel):
+    objfunc = CountingObjective(vecsize, cache=True, count_cache_hits=count_hits)
+    genotype = mhd.RAND_GEN.integers(0, 2, (pop_size // 2, vecsize))
+    genotype = np.concatenate([genotype, genotype])
+
+    fitness = objfunc.fitness(Population(objfunc, genotype.copy()), parallel=parallel, threads=2)
+    np.testing.assert_array_equal(fitness, genotype.sum(axis=1))
+
+    n_unique = np.unique(genotype, axis=0).shape[0]
+    fitness = objfunc.fitness(Population(objfunc, genotype.copy()), parallel=parallel, threads=2)
+    np.testing.assert_array_equal(fitness, genotype.sum(axis=1))
+
+    assert objfunc.cache.misses == n_unique
+    assert objfunc.cache.hits == n_unique
+    if not parallel:
+        assert objfunc.calls == n_unique
+
+    if count_hits:
+        assert objfunc.counter == 2 * pop_size
+    else:
+        assert objfunc.counter == objfunc.cache.misses
+
+
+def test_vectorized_cache():
+    objfunc = Sphere(vecsize)
+    objfunc.vectorized = True
+    objfunc.set_cache(100)
+
+    population = Population(objfunc, mhd.RAND_GEN.uniform(-5, 5, (pop_size, vecsize)))
+    fitness = objfunc.fitness(population).copy()
+    population.fitness_calculated[:] = 0
+    np.testing.assert_allclose(objfunc.fitness(population), fitness)
+
+    assert objfunc.cache.hits == pop_size
+    assert objfunc.counter == pop_size
+
+
+def test_lru_eviction():
+    cache = LRUFitnessCache(maxsize=3)
+    keys = [solution_key(np.array([i])) for i in range(4)]
+
+    cache.store(keys[:3], np.arange(3))
+    cache.lookup(keys[:1])
+    cache.store(keys[3:], np.array([3]))
+
+    found, fitness = cache.lookup(keys)
+    np.testing.assert_array_equal(found, [True, False, True, True])
+    np.testing.assert_array_equal(fitness[found], [0, 2, 3])
+    assert len(cache) == 3
+
+
+def test_disk_cache_between_runs(tmp_path):
+    path = tmp_path / "cache" / "fitness.db"
+    genotype = mhd.RAND_GEN.integers(0, 2, (pop_size, vecsize))
+
+    objfunc = CountingObjective(vecsize, cache=path)
+    fitness = objfunc.fitness(Population(objfunc, genotype.copy()))
+    objfunc.cache.close()
+
+    # A new objective function reads the fitness stored by the previous one
+    new_objfunc = CountingObjective(vecsize, cache=path)
+    np.testing.assert_array_equal(new_objfunc.fitness(Population(new_objfunc, genotype.copy())), fitness)
+    assert new_objfunc.calls == 0
+    assert new_objfunc.counter == 0
+    assert len(new_objfunc.cache) == np.unique(genotype, axis=0).shape[0]
+
+    # Objective functions with other names don't share their values
+    other_objfunc = CountingObjective(vecsize, cache=SQLiteFitnessCache(path, namespace="other"))
+    other_objfunc.fitness(Population(other_objfunc, genotype.copy()))
+    assert other_objfunc.cache.hits == 0
+
+    new_objfunc.cache.clear()
+    assert len(new_objfunc.cache) == 0
+    assert len(other_objfunc.cache) > 0
+
+
+def test_disk_cache_problem_data(tmp_path):
+    path = tmp_path / "fitness.db"
+    solution = np.array([[1, 1, 1]])
+
+    # Two instances of the same problem with different data don't share their fitness
+    satisfied = ThreeSAT(np.array([[1, 2, 3]]))
+    unsatisfied = ThreeSAT(np.array([[-1, -2, -3]]))
+    satisfied.set_cache(path)
+    unsatisfied.set_cache(path)
+
+    assert satisfied.fitness(Population(satisfied, solution.copy()))[0] == 1
+    assert unsatisfied.fitness(Population(unsatisfied, solution.copy()))[0] == 0
+    assert satisfied.cache_namespace() != unsatisfied.cache_namespace()
+
+    # Neither do the same problem in different modes
+    maximized = CountingObjective(vecsize, cache=path)
+    minimized = CountingObjective(vecsize, cache=path)
+    minimized.mode, minimized.factor = "min", -1
+    genotype = mhd.RAND_GEN.integers(0, 2, (pop_size, vecsize))
+    fitness = maximized.fitness(Population(maximized, genotype.copy()))
+    np.testing.assert_array_equal(minimized.fitness(Population(minimized, genotype.copy())), -fitness)
+
+    # The same problem built again shares them
+    satisfied_again = ThreeSAT(np.array([[1, 2, 3]]))
+    satisfied_again.set_cache(path)
+    assert satisfied_again.fitness(Population(satisfied_again, solution.copy()))[0] == 1
+    assert satisfied_again.cache.hits == 1
+
+    # An explicit namespace is used as it is
+    named = ThreeSAT(np.array([[1, 2, 3]]))
+    named.set_cache(path, namespace="3-SAT instance")
+    assert named.cache.namespace == "3-SAT instance"
+
+
+def _evaluate_with_cache(path, seed):
+    objfunc = CountingObjective(vecsize, cache=path)
+    genotype = np.random.default_rng(seed).integers(0, 2, (200, vecsize))
+    fitness = objfunc.fitness(Population(objfunc, genotype))
+    return np.all(fitness == genotype.sum(axis=1))
+
+
+def test_disk_cache_concurrent(tmp_path):
+    path = tmp_path / "fitness.db"
+
+    with ProcessPoolExecutor(4) as executor:
+        results = list(executor.map(_evaluate_with_cache, [path] * 8, range(8)))
+
+    all_genotypes = np.concatenate([np.random.default_rng(seed).integers(0, 2, (200, vecsize)) for seed in range(8)])
+
+    assert all(results)
+    assert len(SQLiteFitnessCache(path, namespace=CountingObjective(vecsize).cache_namespace())) == np.unique(all_genotypes, axis=0).shape[0]
+
+
+def test_solution_key():
+    vector = np.array([1, 0, 1, 1])
+
+    assert solution_key(vector) == solution_key(vector.copy())
+    assert solution_key(vector) != solution_key(vector, adjusted=False)
+    assert solution_key(vector) != solution_key(vector.astype(float))
+    assert solution_key(vector) != solution_key(vector[::-1])
+
+
+def test_cache_errors():
+    assert get_cache(False) is None
+    assert isinstance(get_cache(True), LRUFitnessCache)
+    assert get_cache(10).maxsize == 10
+
+    with pytest.raises(ValueError):
+        get_cache(1.5)
+
+    with pytest.raises(ValueError):
+        LRUFitnessCache(0)
+
+    objfunc = MaxOnes(vecsize)
+    assert objfunc.cache is None
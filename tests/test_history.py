@@ -0,0 +1,77 @@
+import pytest
+
+import numpy as np
+from metaheuristic_designer import HistoryRecorder
+from metaheuristic_designer.benchmarks import Sphere
+from metaheuristic_designer.simple import hill_climb
+import metaheuristic_designer as mhd
+
+mhd.reset_seed(0)
+
+
+def test_ring_buffer():
+    history = HistoryRecorder(size=10, on_improvement=False, every=4, snapshots=2)
+    for gen in range(25):
+        history.record(np.full(3, gen), gen)
+
+    assert len(history) == 25
+    np.testing.assert_array_equal(history.fitness, np.arange(15, 25))
+    np.testing.assert_array_equal(history.generations, np.arange(15, 25))
+    np.testing.assert_array_equal(history.solution_generations, [20, 24])
+    np.testing.assert_array_equal(history.solutions, [np.full(3, 20), np.full(3, 24)])
+
+    history.reset()
+    assert len(history) == 0
+    assert len(history.fitness) == 0
+
+
+@pytest.mark.parametrize("mode, improved", [("max", [0, 2, 4]), ("min", [0, 1, 3])])
+def test_snapshot_on_improvement(mode, improved):
+    history = HistoryRecorder(mode=mode)
+    for gen, fitness in enumerate([5, 3, 6, 2, 7]):
+        history.record(np.full(3, gen), fitness)
+
+    np.testing.assert_array_equal(history.solution_generations, improved)
+    np.testing.assert_array_equal(history.solutions[:, 0], improved)
+
+
+def test_spill_file(tmp_path):
+    history = HistoryRecorder(size=8, every=1, on_improvement=False, snapshots=4, spill_file=str(tmp_path / "history"))
+    for gen in range(30):
+        history.record(np.full(3, gen), float(gen))
+
+    # Everything is kept, but only the last records are in memory
+    np.testing.assert_array_equal(history.fitness, np.arange(30))
+    np.testing.assert_array_equal(history.solutions[:, 0], np.arange(30))
+    assert history._fitness.count <= 8
+    assert (tmp_path / "history.fitness").stat().st_size == 24 * 8
+
+    # The parts are read without loading the records on disk
+    spilled, recent = history.fitness_parts()
+    assert isinstance(spilled, np.memmap)
+    np.testing.assert_array_equal(np.concatenate((spilled, recent)), np.arange(30))
+    spilled, recent = history.solution_parts()
+    assert isinstance(spilled, np.memmap)
+    np.testing.assert_array_equal(np.concatenate((spilled, recent))[:, 0], np.arange(30))
+
+
+def test_parts_without_spill():
+    history = HistoryRecorder(size=8)
+    for gen in range(5):
+        history.record(np.full(3, gen), float(gen))
+
+    spilled, recent = history.fitness_parts()
+    assert len(spilled) == 0
+    np.testing.assert_array_equal(recent, np.arange(5))
+
+
+def test_algorithm_history():
+    objfunc = Sphere(10, "min")
+    algorithm = hill_climb({"encoding": "real", "stop_cond": "ngen", "ngen": 200, "verbose": False, "history_size": 50}, objfunc)
+    algorithm.optimize()
+
+    assert len(algorithm.history) == 200
+    assert algorithm.fit_history.shape == (50,)
+    assert algorithm.best_history.shape[0] <= 10
+    np.testing.assert_array_equal(algorithm.best_history[-1], algorithm.best_solution()[0])
+    assert algorithm.get_state(show_fit_history=True)["fit_history"] is not None
@@ -0,0 +1,42 @@
+import sys
+import subprocess
+import pytest
+
+heavy_modules = ["matplotlib", "pandas", "enlighten", "skimage", "pyparsing", "scipy.stats", "scipy.spatial"]
+
+
+def _loaded_modules(statement):
+    code = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import metaheuristic_designer",
+        "from metaheuristic_designer.algorithms import GeneralAlgorithm, AlgorithmSelection",
+        "from metaheuristic_designer.benchmarks import ImgApprox",
+        "from metaheuristic_designer.strategies import GA",
+    ],
+)
+def test_no_heavy_imports(statement):
+    loaded = _loaded_modules(statement)
+
+    assert not loaded.intersection(heavy_modules)
+
+
+def test_deferred_imports():
+    statement = (
+        "from metaheuristic_designer.algorithms import GeneralAlgorithm\n"
+        "from metaheuristic_designer.strategies import RandomSearch\n"
+        "from metaheuristic_designer.initializers import UniformVectorInitializer\n"
+        "from metaheuristic_designer.benchmarks import Sphere\n"
+        "objfunc = Sphere(3)\n"
+        "GeneralAlgorithm(objfunc, RandomSearch(UniformVectorInitializer(3, -1, 1, pop_size=2)), {'stop_cond': 'ngen or neval'})"
+    )
+    loaded = _loaded_modules(statement)
+
+    # The modules are only loaded when the functions that use them are called
+    assert "pyparsing" in loaded
+    assert not loaded.intersection(set(heavy_modules) - {"pyparsing"})
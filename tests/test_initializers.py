@@ -252,3 +252,66 @@ def test_perm_init(vec_size, pop_size):
 
     for indiv in rand_pop:
         assert np.all(np.isin(np.arange(vec_size), rand_inidv))
+
+
+@pytest.mark.parametrize(
+    "pop_init",
+    [
+        UniformVectorInitializer(10, -5, 5, pop_size),
+        UniformVectorInitializer(10, 0, 4, pop_size, dtype=int),
+        GaussianVectorInitializer(10, 0, 3, pop_size),
+        PermInitializer(10, pop_size),
+        BitPackInitializer(100, pop_size),
+    ],
+)
+def test_generate_batch(pop_init):
+    mhd.reset_seed(0)
+    batch = pop_init.generate_batch(pop_size)
+
+    # Sampling the whole batch at once gives the same individuals as sampling them one by one
+    mhd.reset_seed(0)
+    individuals = np.asarray([pop_init.generate_random() for _ in range(pop_size)])
+
+    assert batch.shape == (pop_size, pop_init.genotype_size)
+    np.testing.assert_array_equal(batch, individuals)
+    assert pop_init.generate_batch(0).shape == (0, pop_init.genotype_size)
+
+
+def test_seed_initializers_batch():
+    default_pop_init = UniformVectorInitializer(n_components, -1, -0.5, pop_size)
+
+    pop_init = SeedDetermInitializer(default_pop_init, sample_pop1, 15)
+    population = pop_init.generate_population(None)
+    assert len(population) == pop_size
+    np.testing.assert_array_equal(population.genotype_set[:15], sample_pop1[np.arange(15) % n_indiv])
+    assert np.all(population.genotype_set[15:] < 0)
+
+    pop_init = SeedProbInitializer(default_pop_init, sample_pop1, 0.5)
+    batch = pop_init.generate_batch(pop_size)
+    inserted = batch[:, 0] >= 0
+    assert batch.shape == (pop_size, n_components)
+    assert 0 < np.count_nonzero(inserted) < pop_size
+    assert np.all(np.isin(batch[inserted, 0], sample_pop1[:, 0]))
+
+
+def test_seed_initializers_dtype():
+    permutations = np.array([np.arange(6), np.arange(6)[::-1]])
+
+    # Without inserted solutions the batch keeps the type of the generated individuals
+    pop_init = SeedProbInitializer(PermInitializer(6, pop_size), permutations, insert_prob=0.0)
+    assert pop_init.generate_batch(pop_size).dtype == PermInitializer(6, pop_size).generate_batch(1).dtype
+
+    pop_init = SeedDetermInitializer(PermInitializer(6, pop_size), permutations)
+    first_batch = pop_init.generate_batch(5)
+    second_batch = pop_init.generate_batch(5)
+    np.testing.assert_array_equal(first_batch[:2], permutations)
+    assert second_batch.dtype == first_batch.dtype
+    assert np.issubdtype(second_batch.dtype, np.integer)
+
+
+def test_lambda_init_batch():
+    pop_init = InitializerFromLambda(lambda: np.zeros(n_components), pop_size)
+    batch = pop_init.generate_batch(pop_size)
+
+    assert batch.shape == (pop_size, n_components)
+    assert pop_init.generate_batch(0) == []
@@ -0,0 +1,64 @@
+import pytest
+
+import numpy as np
+from metaheuristic_designer import kernels
+from metaheuristic_designer.kernels import get_kernel, registered_kernels, use_numba, warmup
+from metaheuristic_designer.benchmarks import ModSchwefel
+import metaheuristic_designer as mhd
+
+rng = mhd.reset_seed(0)
+
+
+def kernel_inputs(name):
+    match name:
+        case "mod_schwefel":
+            return (rng.uniform(-1000, 1000, (20, 10)),)
+        case "pmx_pairs" | "order_cross_pairs":
+            parents1 = rng.permuted(np.tile(np.arange(30), (20, 1)), axis=1)
+            parents2 = rng.permuted(np.tile(np.arange(30), (20, 1)), axis=1)
+            cross_point1 = rng.integers(0, 28, 20)
+            return parents1, parents2, cross_point1, rng.integers(cross_point1 + 1, 30)
+        case "cro_settle_larvae":
+            return rng.random(15), rng.permutation(25)[:15], rng.random(20), rng.integers(0, 25, (20, 3)), 25
+
+
+@pytest.mark.parametrize("name", ["mod_schwefel", "pmx_pairs", "order_cross_pairs", "cro_settle_larvae"])
+def test_loop_versions(name):
+    kernel = get_kernel(name)
+    args = kernel_inputs(name)
+
+    np.testing.assert_allclose(kernel.loop_func(*args), kernel.numpy_func(*args))
+
+
+def test_registry():
+    assert {"mod_schwefel", "pmx_pairs", "order_cross_pairs", "cro_settle_larvae"} <= set(registered_kernels())
+
+    with pytest.raises(ValueError):
+        get_kernel("not_a_kernel")
+
+
+def test_numba_disabled():
+    use_numba(False)
+    try:
+        warmup()
+        kernel = get_kernel("mod_schwefel")
+        assert not kernel.jitted
+
+        solutions = rng.uniform(-100, 100, (5, 10))
+        np.testing.assert_array_equal(ModSchwefel(10).objective(solutions), kernel.numpy_func(solutions))
+    finally:
+        use_numba(kernels.NUMBA_AVAILABLE)
+
+
+def test_numba_kernels():
+    pytest.importorskip("numba")
+    use_numba(True, cache=False)
+    warmup()
+
+    for name in registered_kernels():
+        kernel = get_kernel(name)
+        args = kernel_inputs(name)
+        np.testing.assert_allclose(kernel(*args), kernel.numpy_func(*args))
+
+    solution = rng.uniform(-100, 100, 10)
+    assert ModSchwefel(10).objective(solution) == pytest.approx(get_kernel("mod_schwefel").numpy_func(solution))
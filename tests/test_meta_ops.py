@@ -1,7 +1,7 @@
 import pytest
 
 import numpy as np
-from metaheuristic_designer import Population
+from metaheuristic_designer import Population, Operator
 from metaheuristic_designer.operators import OperatorMeta, meta_ops_map, OperatorVector
 from metaheuristic_designer.benchmarks.benchmark_funcs import Sphere
 from metaheuristic_designer.initializers import UniformVectorInitializer
@@ -133,3 +133,95 @@ def test_split_op(population, op_list, values, mask):
     # for idx, val in enumerate(values):
     #     if np.any(mask == idx):
     #         assert np.all(new_indiv.genotype[mask == idx] == val)
+
+
+@pytest.mark.parametrize("population", [example_population2])
+def test_pick_dispatch(population):
+    op_list = [OperatorVector("dummy", {"F": 1}), OperatorVector("dummy", {"F": 2}), OperatorVector("dummy", {"F": 3})]
+    operator = OperatorMeta("pick", op_list, {})
+    operator.chosen_idx = mhd.RAND_GEN.integers(-1, 4, pop_size)
+    genotype_set = population.genotype_set.copy()
+
+    new_population = operator.evolve(population)
+
+    # Each individual is evolved with its operator and the ones without a valid operator are kept
+    np.testing.assert_array_equal(population.genotype_set, genotype_set)
+    for idx in range(len(op_list)):
+        assert np.all(new_population.genotype_set[operator.chosen_idx == idx] == idx + 1)
+    unchanged = (operator.chosen_idx < 0) | (operator.chosen_idx >= len(op_list))
+    np.testing.assert_array_equal(new_population.genotype_set[unchanged], genotype_set[unchanged])
+
+    operator = OperatorMeta("branch", op_list[:2], {"p": 0.3})
+    new_population = operator.evolve(population)
+    np.testing.assert_array_equal(new_population.genotype_set, np.broadcast_to(operator.chosen_idx[:, None] + 1, genotype_set.shape))
+    np.testing.assert_array_equal(population.genotype_set, genotype_set)
+
+
+def test_dispatch_buffers():
+    population = Population(Sphere(3), mhd.RAND_GEN.uniform(-100, 100, (pop_size, 3)))
+    op_list = [OperatorVector("dummy", {"F": 1}), OperatorVector("dummy", {"F": 2})]
+    operator = OperatorMeta("branch", op_list, {"p": 0.5})
+
+    # The populations kept by the caller are never overwritten
+    kept_population = operator.evolve(population)
+    kept_genotype = kept_population.genotype_set.copy()
+    outputs = [operator.evolve(population) for _ in range(4)]
+    np.testing.assert_array_equal(kept_population.genotype_set, kept_genotype)
+    np.testing.assert_array_equal(outputs[-1].genotype_set, np.broadcast_to(operator.chosen_idx[:, None] + 1, (pop_size, 3)))
+
+    # Once the output is discarded its storage is reused
+    del kept_population, outputs
+    buffers = [id(operator.evolve(population).genotype_set.base) for _ in range(4)]
+    assert len(set(buffers)) == 2
+
+
+def test_apply_selection_speed():
+    population = Population(Sphere(3), mhd.RAND_GEN.uniform(-100, 100, (pop_size, 3)))
+    selected = Population(Sphere(3), mhd.RAND_GEN.uniform(-100, 100, (10, 3)), speed_set=np.ones((10, 3)))
+
+    # The speed is allocated without drawing random numbers
+    state = mhd.RAND_GEN.bit_generator.state
+    population.apply_selection(selected, np.arange(10))
+    assert mhd.RAND_GEN.bit_generator.state == state
+    np.testing.assert_array_equal(population.speed_set[:10], 1)
+    np.testing.assert_array_equal(population.speed_set[10:], 0)
+
+
+def test_take_block():
+    population = Population(Sphere(3), mhd.RAND_GEN.uniform(-100, 100, (pop_size, 3)))
+    block = population.take_block(10, 20)
+
+    assert len(block) == 10
+    assert np.shares_memory(block.genotype_set, population.genotype_set)
+    np.testing.assert_array_equal(block.genotype_set, population.genotype_set[10:20])
+
+    # The data of each individual is copied, evaluating the block doesn't change the population
+    population.calculate_fitness()
+    fitness = population.fitness.copy()
+    block.fitness[:] = 0
+    block.ages[:] = 5
+    np.testing.assert_array_equal(population.fitness, fitness)
+    assert not np.any(population.ages == 5)
+
+
+class IdentityOperator(Operator):
+    def evolve(self, population, initializer=None):
+        return population
+
+
+@pytest.mark.parametrize("op_list", [
+    [OperatorVector("dummy", {"F": 1}), OperatorVector("dummy", {"F": 2})],
+    [IdentityOperator(name="Identity")],
+])
+def test_sequence_keeps_input(op_list):
+    population = Population(Sphere(3), mhd.RAND_GEN.uniform(-100, 100, (pop_size, 3)))
+    population.calculate_fitness()
+    genotype_set = population.genotype_set.copy()
+    fitness = population.fitness.copy()
+
+    new_population = OperatorMeta("sequence", op_list).evolve(population)
+    new_population.calculate_fitness()
+    new_population.genotype_set[:] = 0
+
+    np.testing.assert_array_equal(population.genotype_set, genotype_set)
+    np.testing.assert_array_equal(population.fitness, fitness)
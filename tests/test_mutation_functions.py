@@ -10,7 +10,9 @@ rng = mhd.reset_seed(0)
 n_indiv = 10
 n_components = 5
 sample_pop1 = np.tile(np.arange(n_components), n_indiv).reshape((n_indiv, n_components)) + 10 * np.arange(n_indiv).reshape((n_indiv, 1))
-sample_pop_bin1 = np.tile(np.arange(n_components), n_indiv).reshape((n_indiv, n_components)) < np.arange(n_indiv).reshape((n_indiv, 1)) % (n_components + 1)
+sample_pop_bin1 = np.tile(np.arange(n_components), n_indiv).reshape((n_indiv, n_components)) < np.arange(n_indiv).reshape((n_indiv, 1)) % (
+    n_components + 1
+)
 sample_pop_bin1 = sample_pop_bin1.astype(int)
 
 
@@ -18,46 +20,98 @@ def test_gaussian_mutation():
     result_arr = gaussian_mutation(sample_pop1, 0.1)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_cauchy_mutation():
     result_arr = cauchy_mutation(sample_pop1, 0.1)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_laplace_mutation():
     result_arr = laplace_mutation(sample_pop1, 0.1)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_uniform_mutation():
     result_arr = uniform_mutation(sample_pop1, 0.1)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_poisson_mutation():
     result_arr = poisson_mutation(sample_pop1, 1, 1)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_bernoulli_mutation():
     result_arr = bernoulli_mutation(sample_pop1, 0.5)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_mutate_sample():
     result_arr = mutate_sample(sample_pop1.astype(float), distrib=ProbDist.GAUSS, scale=1, N=1)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_mutate_noise():
     result_arr = mutate_noise(sample_pop1.astype(float), distrib=ProbDist.GAUSS, loc=0, scale=1, N=1)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_random_sample():
     result_arr = rand_sample(sample_pop1.astype(float), distrib=ProbDist.GAUSS, scale=1, N=1)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_random_noise():
     result_arr = rand_noise(sample_pop1.astype(float), distrib=ProbDist.GAUSS, loc=0, scale=1, N=1)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_xor_mask_byte():
     result_arr = xor_mask(sample_pop1, 2)
     assert result_arr.shape == sample_pop1.shape
 
+
 def test_xor_mask_bin():
     result_arr = xor_mask(sample_pop_bin1, 2, "bin")
-    assert result_arr.shape == sample_pop1.shape
\ No newline at end of file
+    assert result_arr.shape == sample_pop1.shape
+
+
+@pytest.mark.parametrize(
+    "params, scipy_distrib",
+    [
+        ({"distrib": ProbDist.GAUSS, "loc": 1, "scale": 2}, sp.stats.norm(1, 2)),
+        ({"distrib": ProbDist.UNIFORM, "loc": -1, "scale": 3}, sp.stats.uniform(-1, 3)),
+        ({"distrib": ProbDist.LAPLACE, "loc": 1, "scale": 0.5}, sp.stats.laplace(1, 0.5)),
+        ({"distrib": ProbDist.GAMMA, "loc": 1, "scale": 2, "a": 3}, sp.stats.gamma(3, 1, 2)),
+        ({"distrib": ProbDist.EXPON, "loc": 1, "scale": 2}, sp.stats.expon(1, 2)),
+        ({"distrib": ProbDist.POISSON, "loc": 1, "mu": 4}, sp.stats.poisson(4, 1)),
+        ({"distrib": ProbDist.BERNOULLI, "loc": 0, "p": 0.3}, sp.stats.bernoulli(0.3)),
+        ({"distrib": ProbDist.BINOMIAL, "loc": 0, "n": 10, "p": 0.3}, sp.stats.binom(10, 0.3)),
+        ({"distrib": ProbDist.CATEGORICAL, "p": np.array([1, 2, 7])}, sp.stats.rv_discrete(values=([0, 1, 2], [0.1, 0.2, 0.7]))),
+    ],
+)
+def test_sample_distribution(params, scipy_distrib):
+    samples = sample_distribution((200, 500), **params)
+
+    assert samples.shape == (200, 500)
+    np.testing.assert_allclose(samples.mean(), scipy_distrib.mean(), atol=0.05)
+    np.testing.assert_allclose(samples.std(), scipy_distrib.std(), rtol=0.05)
+
+
+def test_sample_distribution_heavy_tails():
+    samples = sample_distribution((200, 500), loc=1, scale=2, distrib=ProbDist.CAUCHY)
+    np.testing.assert_allclose(np.median(samples), 1, atol=0.05)
+
+    # Levy stable with a=2 is a gaussian with variance 2*scale^2
+    samples = sample_distribution((100, 50), loc=1, scale=2, distrib=ProbDist.LEVYSTABLE, a=2, b=0)
+    np.testing.assert_allclose(samples.mean(), 1, atol=0.3)
+    np.testing.assert_allclose(samples.std(), 2 * np.sqrt(2), rtol=0.1)
+
+
+def test_sample_distribution_vector_params():
+    loc = np.array([0, 10, 100])
+    scale = np.array([1, 0.1, 0.01])
+    samples = sample_distribution((10000, 3), loc=loc, scale=scale, distrib=ProbDist.GAUSS)
+
+    np.testing.assert_allclose(samples.mean(axis=0), loc, atol=0.05)
+    np.testing.assert_allclose(samples.std(axis=0), scale, rtol=0.05)
@@ -0,0 +1,111 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from metaheuristic_designer import Population
+from metaheuristic_designer.parallel import get_backend, split_chunks, SharedMemoryEvaluator
+from metaheuristic_designer.benchmarks import Sphere, Rastrigin
+from metaheuristic_designer.initializers import UniformVectorInitializer
+from metaheuristic_designer.operators import OperatorVector
+from metaheuristic_designer.strategies import HillClimb
+from metaheuristic_designer.algorithms import GeneralAlgorithm
+import metaheuristic_designer as mhd
+
+mhd.reset_seed(0)
+
+pop_size = 50
+vecsize = 10
+
+
+def non_vectorized(objfunc):
+    # The benchmark functions are vectorized, evaluate them one by one to use the parallel backends
+    objfunc.vectorized = False
+    return objfunc
+
+
+@pytest.mark.parametrize("objfunc", [non_vectorized(Sphere(vecsize)), non_vectorized(Rastrigin(vecsize))])
+@pytest.mark.parametrize("parallel", [True, "thread", "process", "shared_memory"])
+@pytest.mark.parametrize("threads", [1, 3, 8])
+def test_parallel_fitness(objfunc, parallel, threads):
+    genotype = mhd.RAND_GEN.uniform(-5, 5, (pop_size, vecsize))
+
+    serial_population = Population(objfunc, genotype.copy())
+    serial_fitness = objfunc.fitness(serial_population)
+
+    objfunc.counter = 0
+    parallel_population = Population(objfunc, genotype.copy())
+    parallel_fitness = objfunc.fitness(parallel_population, parallel=parallel, threads=threads)
+
+    np.testing.assert_allclose(parallel_fitness, serial_fitness)
+    assert objfunc.counter == pop_size
+
+
+def test_parallel_only_uncalculated():
+    objfunc = non_vectorized(Sphere(vecsize))
+    population = Population(objfunc, mhd.RAND_GEN.uniform(-5, 5, (pop_size, vecsize)))
+    population.fitness_calculated[: pop_size // 2] = 1
+    population.fitness[: pop_size // 2] = 1234
+
+    fitness = objfunc.fitness(population, parallel="thread", threads=4)
+
+    assert np.all(fitness[: pop_size // 2] == 1234)
+    assert np.all(fitness[pop_size // 2 :] != 1234)
+    assert objfunc.counter == pop_size - pop_size // 2
+
+
+def test_user_executor():
+    objfunc = non_vectorized(Sphere(vecsize))
+    population = Population(objfunc, mhd.RAND_GEN.uniform(-5, 5, (pop_size, vecsize)))
+
+    with ThreadPoolExecutor(2) as executor:
+        fitness = objfunc.fitness(population, parallel=executor, threads=2)
+        # The executor must still be usable after the evaluation
+        assert executor.submit(lambda: 1).result() == 1
+
+    np.testing.assert_allclose(fitness, -(population.genotype_set**2).sum(axis=1))
+
+
+def test_shared_memory_evaluator():
+    objfunc = non_vectorized(Sphere(vecsize))
+
+    with SharedMemoryEvaluator(objfunc, threads=2) as evaluator:
+        # Successive evaluations with different sizes reuse the same workers
+        for size in [10, 50, 200, 20]:
+            population = Population(objfunc, mhd.RAND_GEN.uniform(-5, 5, (size, vecsize)))
+            fitness = objfunc.fitness(population, parallel=evaluator)
+            np.testing.assert_allclose(fitness, -(population.genotype_set**2).sum(axis=1))
+
+    assert evaluator.executor is None
+    assert evaluator.shm is None
+
+
+def test_shared_memory_algorithm():
+    objfunc = non_vectorized(Sphere(vecsize))
+    pop_init = UniformVectorInitializer(vecsize, objfunc.low_lim, objfunc.up_lim, pop_size=10)
+    search_strat = HillClimb(pop_init, OperatorVector("RandNoise", {"distrib": "Gauss", "F": 0.1}))
+    params = {"stop_cond": "ngen", "ngen": 5, "verbose": False, "parallel": "shared_memory", "threads": 2}
+
+    alg = GeneralAlgorithm(objfunc, search_strat, params=params)
+    alg.optimize()
+
+    assert alg.parallel == "shared_memory"
+    assert objfunc.counter == 60
+
+
+def test_backend_errors():
+    assert get_backend(False) is None
+    assert get_backend(True) == "thread"
+
+    with pytest.raises(ValueError):
+        get_backend("gpu")
+
+
+@pytest.mark.parametrize("n_indices", [1, 7, 50])
+@pytest.mark.parametrize("n_chunks", [1, 4, 100])
+def test_split_chunks(n_indices, n_chunks):
+    indices = np.arange(n_indices)
+    chunks = split_chunks(indices, n_chunks)
+
+    assert len(chunks) <= n_chunks
+    assert all(len(chunk) > 0 for chunk in chunks)
+    np.testing.assert_array_equal(np.concatenate(chunks), indices)
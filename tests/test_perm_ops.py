@@ -26,3 +26,14 @@ def test_basic_working(population, op_method):
 
     new_population = operator.evolve(population, pop_init)
     assert isinstance(new_population, Population)
+
+
+def test_random():
+    pop_init = PermInitializer(20, pop_size)
+    operator = OperatorPerm("random")
+
+    new_population = operator.evolve(example_population2, pop_init)
+
+    assert new_population.genotype_set.shape == (pop_size, 20)
+    assert np.any(new_population.genotype_set != np.arange(20))
+    np.testing.assert_array_equal(np.sort(new_population.genotype_set, axis=1), np.tile(np.arange(20), (pop_size, 1)))
@@ -32,3 +32,55 @@ def test_order_cross():
     result_arr = order_cross(sample_pop1)
     assert result_arr.shape == sample_pop1.shape
 
+
+
+def random_permutations(n_rows, vecsize):
+    return rng.permuted(np.tile(np.arange(vecsize), (n_rows, 1)), axis=1)
+
+
+@pytest.mark.parametrize("vecsize", [3, 10, 200])
+def test_segment_mutations(vecsize):
+    population = random_permutations(50, vecsize)
+
+    for n in [1, 3, -2]:
+        mhd.reset_seed(1)
+        result_arr = roll_mutation(population, n)
+        mhd.reset_seed(1)
+        starts = mhd.RAND_GEN.integers(0, vecsize - 2, 50)
+        ends = mhd.RAND_GEN.integers(starts + 2, vecsize + 1, 50)
+
+        expected = population.copy()
+        for row, (start, end) in enumerate(zip(starts, ends)):
+            expected[row, start:end] = np.roll(population[row, start:end], n)
+        np.testing.assert_array_equal(result_arr, expected)
+
+    mhd.reset_seed(1)
+    result_arr = invert_mutation(population)
+    mhd.reset_seed(1)
+    starts = mhd.RAND_GEN.integers(0, vecsize - 2, 50)
+    ends = mhd.RAND_GEN.integers(starts + 2, vecsize + 1, 50)
+
+    expected = population.copy()
+    for row, (start, end) in enumerate(zip(starts, ends)):
+        expected[row, start:end] = population[row, start:end][::-1]
+    np.testing.assert_array_equal(result_arr, expected)
+
+
+@pytest.mark.parametrize("vecsize", [3, 10, 200])
+def test_batched_crossover(vecsize):
+    parents1 = random_permutations(50, vecsize)
+    parents2 = random_permutations(50, vecsize)
+    cross_point1 = rng.integers(0, vecsize - 2, 50)
+
+    cross_point2 = rng.integers(cross_point1 + 1, vecsize)
+    result_arr = pmx_pairs(parents1, parents2, cross_point1, cross_point2)
+    expected = [pmx_single(*args) for args in zip(parents1, parents2, cross_point1, cross_point2)]
+    np.testing.assert_array_equal(result_arr, expected)
+
+    cross_point2 = rng.integers(cross_point1, vecsize)
+    result_arr = order_cross_pairs(parents1, parents2, cross_point1, cross_point2)
+    expected = [order_cross_single(*args) for args in zip(parents1, parents2, cross_point1, cross_point2)]
+    np.testing.assert_array_equal(result_arr, expected)
+
+    for result_arr in [pmx(parents1), order_cross(parents1)]:
+        np.testing.assert_array_equal(np.sort(result_arr, axis=1), np.sort(parents1, axis=1))
@@ -0,0 +1,94 @@
+import pytest
+from copy import copy
+import numpy as np
+
+from metaheuristic_designer import Population
+from metaheuristic_designer.selectionMethods import ParentSelection, SurvivorSelection
+from metaheuristic_designer.algorithms import GeneralAlgorithm
+from metaheuristic_designer.operators import OperatorVector
+from metaheuristic_designer.initializers import UniformVectorInitializer
+from metaheuristic_designer.strategies import GA, PSO
+from metaheuristic_designer.benchmarks import Sphere, MaxOnes
+import metaheuristic_designer as mhd
+
+mhd.reset_seed(0)
+
+test_params = {"stop_cond": "ngen", "ngen": 20, "verbose": False}
+
+
+def test_lazy_optional_arrays():
+    objfunc = Sphere(10)
+    population = Population(objfunc, mhd.RAND_GEN.uniform(-100, 100, (20, 10)))
+    population.calculate_fitness()
+
+    selected = copy(population).join(copy(population)).take_selection(np.arange(0, 40, 2))
+    assert selected._speed_set is None
+    assert selected._historical_best_set is None
+
+    assert population.speed_set.shape == population.genotype_set.shape
+    np.testing.assert_array_equal(population.historical_best_set, population.genotype_set)
+    assert copy(population)._speed_set is not None
+
+
+def test_lazy_arrays_not_allocated_by_ga():
+    objfunc = Sphere(10)
+    pop_init = UniformVectorInitializer(10, objfunc.low_lim, objfunc.up_lim, pop_size=50)
+    search_strat = GA(
+        pop_init,
+        OperatorVector("RandNoise", {"distrib": "Gauss", "F": 0.1}),
+        OperatorVector("Multipoint"),
+        ParentSelection("Best", {"amount": 20}),
+        SurvivorSelection("(m+n)"),
+    )
+
+    alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
+    alg.optimize()
+
+    assert search_strat.population._speed_set is None
+    assert search_strat.population._historical_best_set is None
+
+
+def test_lazy_arrays_allocated_by_pso():
+    objfunc = Sphere(10)
+    pop_init = UniformVectorInitializer(10, objfunc.low_lim, objfunc.up_lim, pop_size=50)
+    search_strat = PSO(pop_init, {"w": 0.7, "c1": 1.5, "c2": 1.5})
+
+    alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
+    alg.optimize()
+
+    assert search_strat.population._speed_set is not None
+    assert search_strat.population._historical_best_set is not None
+    assert alg.fit_history[0] >= alg.fit_history[-1]
+
+
+@pytest.mark.parametrize("storage_dtype", [np.float32, np.float16])
+def test_float_storage(storage_dtype):
+    objfunc = Sphere(10)
+    pop_init = UniformVectorInitializer(10, objfunc.low_lim, objfunc.up_lim, pop_size=50, storage_dtype=storage_dtype)
+    search_strat = GA(
+        pop_init,
+        OperatorVector("RandNoise", {"distrib": "Gauss", "F": 0.1}),
+        OperatorVector("Multipoint"),
+        ParentSelection("Best", {"amount": 20}),
+        SurvivorSelection("(m+n)"),
+    )
+
+    alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
+    alg.optimize()
+
+    assert search_strat.population.genotype_set.dtype == storage_dtype
+    assert alg.fit_history[0] >= alg.fit_history[-1]
+
+
+def test_integer_storage():
+    objfunc = MaxOnes(20)
+    population = Population(objfunc, mhd.RAND_GEN.integers(0, 2, (10, 20)), dtype=np.int8)
+    assert population.genotype_set.dtype == np.int8
+
+    population.update_genotype_set(np.full((10, 20), 0.7))
+    assert population.genotype_set.dtype == np.int8
+    assert np.all(population.genotype_set == 1)
+
+    population.join(Population(objfunc, np.zeros((5, 20))))
+    assert population.genotype_set.dtype == np.int8
+    assert population.pop_size == 15
@@ -1,14 +1,15 @@
 import pytest
 import os
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 from metaheuristic_designer import ObjectiveFunc, ParamScheduler
 from metaheuristic_designer.selectionMethods import ParentSelection, SurvivorSelection
-from metaheuristic_designer.algorithms import GeneralAlgorithm, MemeticAlgorithm
+from metaheuristic_designer.algorithms import GeneralAlgorithm, MemeticAlgorithm, SteadyStateAlgorithm
 from metaheuristic_designer.operators import OperatorVector
 from metaheuristic_designer.initializers import UniformVectorInitializer
 from metaheuristic_designer.strategies import *
-from metaheuristic_designer.benchmarks import Sphere
+from metaheuristic_designer.benchmarks import Sphere, Rosenbrock
 import metaheuristic_designer as mhd
 
 mhd.reset_seed(0)
@@ -72,6 +73,31 @@ def test_sa():
     assert search_strat.pop_size == 1
 
 
+class CountingSphere(Sphere):
+    def __init__(self, size):
+        super().__init__(size, "min")
+        self.full_evaluations = 0
+
+    def objective(self, solution):
+        self.full_evaluations += np.atleast_2d(solution).shape[0]
+        return super().objective(solution)
+
+
+@pytest.mark.parametrize("strategy", [HillClimb, LocalSearch, SA])
+def test_delta_evaluation(strategy):
+    mhd.reset_seed(0)
+    delta_objfunc = CountingSphere(10)
+    point_mutation = OperatorVector("MutNoise", {"distrib": "Gauss", "F": 0.1, "N": 1})
+    search_strat = strategy(pop_init_single, point_mutation)
+    alg = GeneralAlgorithm(delta_objfunc, search_strat, params={"stop_cond": "neval", "neval": 2000, "verbose": False})
+    population = alg.optimize()
+
+    # Only the initial population needs a complete evaluation
+    assert delta_objfunc.full_evaluations < delta_objfunc.counter / 10
+    np.testing.assert_allclose(population.fitness, -delta_objfunc.objective(population.genotype_set))
+    assert alg.fit_history[0] > alg.fit_history[-1]
+
+
 def test_random():
     search_strat = RandomSearch(pop_init)
     alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
@@ -179,50 +205,129 @@ def test_cro():
     assert search_strat.pop_size <= pop_init.pop_size
 
 
-# def test_cro_sl():
-#     search_strat = CRO_SL(
-#         pop_init,
-#         [mutation_op, cross_op],
-#         {"rho": 0.5, "Fb": 0.75, "Fd": 0.2, "Pd": 0.7, "attempts": 4},
-#     )
-#     alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
-#     alg.optimize()
-#     assert alg.fit_history[0] > alg.fit_history[-1]
-#     assert search_strat.pop_size <= pop_init.pop_size
-
-
-# def test_pcro_sl():
-#     search_strat = PCRO_SL(
-#         pop_init,
-#         [mutation_op, cross_op],
-#         {"rho": 0.5, "Fb": 0.75, "Fd": 0.2, "Pd": 0.7, "attempts": 4},
-#     )
-#     alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
-#     alg.optimize()
-#     assert alg.fit_history[0] > alg.fit_history[-1]
-#     assert search_strat.pop_size <= pop_init.pop_size
-
-
-# @pytest.mark.parametrize("dyn_method", ["success", "fitness", "diff"])
-# @pytest.mark.parametrize("dyn_metric", ["best", "avg", "med", "worse"])
-# def test_dpcro_sl(dyn_method, dyn_metric):
-#     search_strat_params = {
-#         "rho": 0.6,
-#         "Fb": 0.95,
-#         "Fd": 0.1,
-#         "Pd": 0.9,
-#         "attempts": 3,
-#         "group_subs": True,
-#         "dyn_method": dyn_method,
-#         "dyn_metric": dyn_metric,
-#         "dyn_steps": 75,
-#         "prob_amp": 0.1,
-#     }
-#     search_strat = DPCRO_SL(pop_init, [mutation_op, cross_op], search_strat_params)
-#     alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
-#     alg.optimize()
-#     assert alg.fit_history[0] > alg.fit_history[-1]
-#     assert search_strat.pop_size <= pop_init.pop_size
+def test_cro_sl():
+    search_strat = CRO_SL(
+        pop_init,
+        [mutation_op, cross_op],
+        {"rho": 0.5, "Fb": 0.75, "Fd": 0.2, "Pd": 0.7, "attempts": 4},
+    )
+    alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
+    alg.optimize()
+    assert alg.fit_history[0] > alg.fit_history[-1]
+    assert search_strat.pop_size <= pop_init.pop_size
+
+
+def test_cro_sl_substrates():
+    search_strat = CRO_SL(
+        pop_init,
+        [mutation_op, cross_op],
+        {"rho": 0.5, "Fb": 0.75, "Fd": 0.2, "Pd": 0.7, "attempts": 4},
+    )
+    alg = GeneralAlgorithm(objfunc, search_strat, params={"stop_cond": "ngen", "ngen": 10, "verbose": False})
+    alg.optimize()
+
+    # The corals keep their spot in the reef and are evolved with the operator of their substrate
+    spots = search_strat.survivor_sel.reef_spots
+    assert len(spots) == search_strat.pop_size
+    assert len(np.unique(spots)) == len(spots)
+    assert not np.array_equal(spots, np.arange(len(spots)))
+
+    search_strat.perturb(search_strat.population)
+    np.testing.assert_array_equal(search_strat.operator.chosen_idx, search_strat.operator_idx[spots])
+
+
+def test_pcro_sl():
+    search_strat = PCRO_SL(
+        pop_init,
+        [mutation_op, cross_op],
+        {"rho": 0.5, "Fb": 0.75, "Fd": 0.2, "Pd": 0.7, "attempts": 4},
+    )
+    alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
+    alg.optimize()
+    assert alg.fit_history[0] > alg.fit_history[-1]
+    assert search_strat.pop_size <= pop_init.pop_size
+
+
+@pytest.mark.parametrize("dyn_method", ["success", "fitness", "diff"])
+@pytest.mark.parametrize("dyn_metric", ["best", "avg", "med", "worse"])
+@pytest.mark.parametrize("group_subs", [True, False])
+def test_dpcro_sl(dyn_method, dyn_metric, group_subs):
+    search_strat_params = {
+        "rho": 0.6,
+        "Fb": 0.95,
+        "Fd": 0.1,
+        "Pd": 0.9,
+        "attempts": 3,
+        "group_subs": group_subs,
+        "dyn_method": dyn_method,
+        "dyn_metric": dyn_metric,
+        "dyn_steps": 75,
+        "prob_amp": 0.1,
+    }
+    search_strat = DPCRO_SL(pop_init, [mutation_op, cross_op], search_strat_params)
+    alg = GeneralAlgorithm(objfunc, search_strat, params=test_params)
+    alg.optimize()
+    assert alg.fit_history[0] > alg.fit_history[-1]
+    assert search_strat.pop_size <= pop_init.pop_size
+
+
+def test_dpcro_sl_history():
+    search_strat_params = {
+        "rho": 0.6,
+        "Fb": 0.95,
+        "Fd": 0.1,
+        "Pd": 0.9,
+        "attempts": 3,
+        "group_subs": True,
+        "dyn_method": "fitness",
+        "dyn_metric": "avg",
+        "dyn_steps": 10,
+        "prob_amp": 0.1,
+        "history_size": 5,
+    }
+    search_strat = DPCRO_SL(pop_init, [mutation_op, cross_op], search_strat_params)
+    alg = GeneralAlgorithm(objfunc, search_strat, params={"stop_cond": "ngen", "ngen": 20, "verbose": False})
+    alg.optimize()
+
+    # Only the weights and metrics of the last generations are kept
+    weight_history = search_strat.operator_w_history.values()
+    assert weight_history.shape == (5, 2)
+    np.testing.assert_array_equal(weight_history[-1], search_strat.operator_weight)
+    np.testing.assert_array_equal(search_strat.operator_history.values()[-1], search_strat.operator_metric)
+
+
+def test_dpcro_sl_substrates():
+    evolved_sizes = []
+
+    def noise(population_matrix, objfunc, params):
+        evolved_sizes.append(population_matrix.shape[0])
+        return population_matrix + mhd.RAND_GEN.normal(0, 0.01, population_matrix.shape)
+
+    operators = [OperatorVector("Custom", {"function": noise}), cross_op]
+    search_strat_params = {
+        "rho": 0.6,
+        "Fb": 0.95,
+        "Fd": 0.1,
+        "Pd": 0.9,
+        "attempts": 3,
+        "group_subs": False,
+        "dyn_method": "success",
+        "dyn_metric": "avg",
+        "dyn_steps": 10,
+        "prob_amp": 0.1,
+    }
+    search_strat = DPCRO_SL(pop_init, operators, search_strat_params)
+    alg = GeneralAlgorithm(objfunc, search_strat, params={"stop_cond": "ngen", "ngen": 10, "verbose": False})
+    alg.optimize()
+
+    # The corals of each substrate are evolved with at most as many donors from the rest of the reef
+    evolved_sizes.clear()
+    search_strat.perturb(search_strat.population)
+    substrate = search_strat.larva_substrate
+    np.testing.assert_array_equal(substrate, search_strat.operator_idx[search_strat.survivor_sel.reef_spots])
+    n_mutated = np.count_nonzero(substrate == 0)
+    assert 0 < n_mutated < len(substrate)
+    assert evolved_sizes == [min(2 * n_mutated, len(substrate))]
 
 
 def test_memetic():
@@ -236,6 +341,60 @@ def test_memetic():
     assert search_strat.pop_size <= pop_init.pop_size
 
 
+@pytest.mark.parametrize("parallel", ["thread", "process"])
+def test_steady_state_one_to_one(parallel):
+    search_strat = StaticPopulation(pop_init, mutation_op, survivor_sel=SurvivorSelection("One-to-One"))
+    alg = SteadyStateAlgorithm(objfunc, search_strat, params=test_params | {"parallel": parallel, "threads": 4})
+    alg.optimize()
+    assert alg.fit_history[0] > alg.fit_history[-1]
+    assert search_strat.pop_size == pop_init.pop_size
+    assert len(alg.pending) == 0
+
+
+@pytest.mark.parametrize("batch_size", [1, 10])
+def test_steady_state_plus(batch_size):
+    search_strat = GA(pop_init, mutation_op, cross_op, parent_sel_op, selection_op)
+    alg = SteadyStateAlgorithm(objfunc, search_strat, params=test_params | {"threads": 4, "batch_size": batch_size})
+    alg.optimize()
+    assert alg.fit_history[0] > alg.fit_history[-1]
+    assert len(search_strat.population) == pop_init.pop_size
+
+
+def test_steady_state_generational():
+    search_strat = RandomSearch(pop_init)
+    alg = SteadyStateAlgorithm(objfunc, search_strat, params=test_params | {"threads": 4})
+    alg.optimize()
+    assert len(search_strat.population) == pop_init.pop_size
+
+
+def test_steady_state_parents():
+    perturbed_sizes = []
+
+    def noise(population_matrix, objfunc, params):
+        perturbed_sizes.append(population_matrix.shape[0])
+        return population_matrix + mhd.RAND_GEN.normal(0, 0.01, population_matrix.shape)
+
+    operator = OperatorVector("Custom", {"function": noise})
+    parent_sel = ParentSelection("Tournament", {"amount": 20, "p": 0.1})
+    search_strat = StaticPopulation(pop_init, operator, parent_sel=parent_sel, survivor_sel=SurvivorSelection("One-to-One"))
+    cached_objfunc = Rosenbrock(10, "min")
+    cached_objfunc.set_cache(True)
+    alg = SteadyStateAlgorithm(cached_objfunc, search_strat, params=test_params | {"threads": 4, "neval": 500})
+    alg.optimize()
+
+    # Only the parents whose offspring is evaluated are perturbed
+    assert max(perturbed_sizes) <= 4
+    assert len(cached_objfunc.cache) > 0
+
+    # The offspring is compared with the parent it was generated from
+    with ThreadPoolExecutor(4) as executor:
+        alg.parallel = executor
+        alg._fill_workers()
+        assert len(alg.pending) > 0
+        for evaluation, parent_idx in alg.pending.values():
+            assert parent_idx in parent_sel.last_selection_idx
+
+
 def test_reporting():
     test_params["verbose"] = True
     search_strat = GA(pop_init, mutation_op, cross_op, parent_sel_op, selection_op)
@@ -259,3 +418,20 @@ def test_reporting_memetic():
 
     alg.store_state("temp_pytest.json", True, True, True, True)
     os.remove("temp_pytest.json")
+
+
+@pytest.mark.parametrize("parallel", [False, "thread"])
+def test_steady_state_step(parallel):
+    search_strat = StaticPopulation(pop_init, mutation_op, survivor_sel=SurvivorSelection("One-to-One"))
+    alg = SteadyStateAlgorithm(objfunc, search_strat, params=test_params | {"parallel": parallel, "threads": 4})
+
+    # The steps can be run without 'optimize', the algorithm creates its own pool of workers
+    alg.initialize()
+    for _ in range(20):
+        alg.step()
+    assert alg._evaluator is not None
+    assert len(alg.history) == 20
+
+    alg.restart()
+    assert alg._evaluator is None
+    assert len(alg.pending) == 0
@@ -0,0 +1,65 @@
+import pytest
+import itertools
+
+import numpy as np
+from metaheuristic_designer.Algorithm import (
+    parse_stopping_cond,
+    process_condition,
+    process_progress,
+    compile_condition,
+    compile_progress,
+    condition_names,
+)
+from metaheuristic_designer.benchmarks import Sphere
+from metaheuristic_designer.simple import hill_climb
+import metaheuristic_designer as mhd
+
+mhd.reset_seed(0)
+
+condition_list = ["neval", "ngen", "time_limit", "cpu_time_limit", "fit_target", "convergence"]
+
+stop_conds = [
+    "ngen",
+    "neval or ngen",
+    "neval and time_limit",
+    "ngen or cpu_time_limit and fit_target",
+    "(convergence or neval) and (time_limit or ngen)",
+    "neval or ngen or time_limit or fit_target",
+]
+
+
+@pytest.mark.parametrize("stop_cond", stop_conds)
+def test_compiled_condition(stop_cond):
+    cond_parsed = parse_stopping_cond(stop_cond)
+    conditions = {name: (lambda values, i=i: values[i]) for i, name in enumerate(condition_list)}
+    condition_fn = compile_condition(cond_parsed, conditions)
+    progress_fn = compile_progress(cond_parsed, conditions)
+
+    assert condition_names(cond_parsed) == set(stop_cond.replace("(", " ").replace(")", " ").split()) - {"and", "or"}
+
+    for values in itertools.product([False, True], repeat=len(condition_list)):
+        assert condition_fn(values) == process_condition(cond_parsed, *values)
+
+    for _ in range(20):
+        values = tuple(mhd.RAND_GEN.random(len(condition_list)))
+        assert progress_fn(values) == process_progress(cond_parsed, *values)
+
+
+@pytest.mark.parametrize("check_every", [1, 7])
+def test_check_every(check_every):
+    params = {"encoding": "real", "stop_cond": "ngen", "ngen": 100, "verbose": False, "check_every": check_every}
+    algorithm = hill_climb(params, Sphere(10, "min"))
+    algorithm.optimize()
+
+    # The algorithm stops in the first check after reaching the generation limit
+    assert algorithm.steps == int(np.ceil(100 / check_every)) * check_every
+    assert algorithm.progress >= 1
+
+
+def test_progress_metric():
+    params = {"encoding": "real", "stop_cond": "ngen", "progress_metric": "neval", "ngen": 50, "neval": 1000, "verbose": False}
+    algorithm = hill_climb(params, Sphere(10, "min"))
+    algorithm.optimize()
+
+    assert algorithm.steps == 50
+    assert algorithm.progress == pytest.approx(algorithm.objfunc.counter / 1000)
@@ -1,6 +1,9 @@
+import sys
 import pytest
 import numpy as np
+from copy import copy
 from metaheuristic_designer import Population
+from metaheuristic_designer.Population import PopulationArena
 from metaheuristic_designer.selectionMethods import SurvivorSelection, surv_method_map
 from metaheuristic_designer.benchmarks import Sphere
 from metaheuristic_designer.initializers import UniformVectorInitializer
@@ -41,3 +44,79 @@ def test_basic_working(population, offspring, op_method):
 
     assert isinstance(selected_population, Population)
     assert id(selected_population) != id(population)
+
+
+@pytest.mark.parametrize("population, offspring", [
+        (example_population1, example_offspring1),
+        (example_population2, example_offspring2),
+        (example_population3, example_offspring3)
+])
+def test_arena_matches_join(population, offspring):
+    arena = PopulationArena()
+    selection_idx = mhd.RAND_GEN.integers(0, 2 * pop_size, pop_size)
+
+    selected_population = arena.select(population, offspring, selection_idx)
+    expected_population = copy(population).join(copy(offspring)).take_selection(selection_idx)
+
+    assert population.pop_size == pop_size
+    for field in PopulationArena._fields:
+        if field in PopulationArena._optional_fields:
+            field = "_" + field
+        np.testing.assert_array_equal(getattr(selected_population, field), getattr(expected_population, field))
+
+
+def test_arena_reuses_buffers():
+    objfunc = Sphere(10)
+    arena = PopulationArena()
+    population = Population(objfunc, mhd.RAND_GEN.uniform(-100, 100, (pop_size, 10)))
+    population.calculate_fitness()
+
+    buffers = []
+    for _ in range(6):
+        offspring = Population(objfunc, mhd.RAND_GEN.uniform(-100, 100, (pop_size, 10)))
+        offspring.calculate_fitness()
+
+        population = arena.select(population, offspring, mhd.RAND_GEN.permutation(2 * pop_size)[:pop_size])
+        buffers.append(arena.buffers[arena.current])
+
+        # The best solution is never a view of the reused buffers
+        assert not np.may_share_memory(population.best, population.genotype_set)
+
+    # Only two buffers are used, alternating between generations
+    assert buffers[0] is buffers[2] is buffers[4]
+    assert buffers[1] is buffers[3] is buffers[5]
+    assert buffers[0] is not buffers[1]
+
+
+def test_arena_without_refcount(monkeypatch):
+    # Without the reference counts of CPython the buffers can't be known to be unused
+    monkeypatch.setattr(sys.implementation, "name", "pypy")
+    arena = PopulationArena()
+    population = Population(Sphere(10), mhd.RAND_GEN.uniform(-100, 100, (pop_size, 10)))
+
+    buffers = []
+    for _ in range(4):
+        arena.select(population, population, np.arange(pop_size))
+        buffers.append(arena.buffers[arena.current])
+
+    assert len({id(buffer["genotype_set"]) for buffer in buffers}) == 4
+
+
+def test_arena_kept_populations():
+    objfunc = Sphere(10)
+    surv_sel = SurvivorSelection("(m+n)")
+    population = Population(objfunc, mhd.RAND_GEN.uniform(-100, 100, (pop_size, 10)))
+    population.calculate_fitness()
+
+    kept_populations = []
+    for _ in range(6):
+        offspring = Population(objfunc, mhd.RAND_GEN.uniform(-100, 100, (pop_size, 10)))
+        offspring.calculate_fitness()
+
+        population = surv_sel.select(population, offspring)
+        kept_populations.append((population, population.genotype_set.copy(), population.fitness.copy()))
+
+    # The populations kept by the caller are not overwritten by the next selections
+    for kept_population, genotype_set, fitness in kept_populations:
+        np.testing.assert_array_equal(kept_population.genotype_set, genotype_set)
+        np.testing.assert_array_equal(kept_population.fitness, fitness)
@@ -1,27 +1,29 @@
 import pytest
 import numpy as np
-from metaheuristic_designer.selectionMethods.survivor_selection_functions import * 
+from metaheuristic_designer.selectionMethods.survivor_selection_functions import *
+from metaheuristic_designer.selectionMethods.survivor_selection_functions import _cro_settle_larvae
 import metaheuristic_designer as mhd
 
 mhd.reset_seed(0)
 
 example_fitness = np.array([-10, -2, -1, 0, 0, 1, 2, 10])
-offspring_fitness_better = np.array([-9, 10, 34, 2, 100, 2, 10, 100]) 
+offspring_fitness_better = np.array([-9, 10, 34, 2, 100, 2, 10, 100])
 offspring_fitness_worse = np.array([-20, -5, -2, -1, -10, -90, -100, -10.1])
 offspring_fitness_equal = example_fitness.copy()
 offspring_fitness_mixed = np.array([-9, -5, 34, -1, 100, 2, 100, -10.1])
-offspring_fitness_local_search = np.array([
-    -11,-3, 2,-1, 0, 0, 3, 10,
-     -9, 4, 1,-1, 0, 1, 4, 80,
-     -1,-5, 0,-1, 0, 0, 5, 80])
+offspring_fitness_local_search = np.array([-11, -3, 2, -1, 0, 0, 3, 10, -9, 4, 1, -1, 0, 1, 4, 80, -1, -5, 0, -1, 0, 0, 5, 80])
+
 
 @pytest.mark.parametrize("parent_fitness", [example_fitness])
-@pytest.mark.parametrize("offspring_fitness, expected", [
-    (offspring_fitness_better, np.array([8,9,10,11,12,13,14,15])),
-    (offspring_fitness_worse, np.array([0,1,2,3,4,5,6,7])),
-    (offspring_fitness_equal, np.array([8,9,10,11,12,13,14,15])),
-    (offspring_fitness_mixed, np.array([8,1,10,3,12,13,14,7]))
-])
+@pytest.mark.parametrize(
+    "offspring_fitness, expected",
+    [
+        (offspring_fitness_better, np.array([8, 9, 10, 11, 12, 13, 14, 15])),
+        (offspring_fitness_worse, np.array([0, 1, 2, 3, 4, 5, 6, 7])),
+        (offspring_fitness_equal, np.array([8, 9, 10, 11, 12, 13, 14, 15])),
+        (offspring_fitness_mixed, np.array([8, 1, 10, 3, 12, 13, 14, 7])),
+    ],
+)
 def test_one_to_one(parent_fitness, offspring_fitness, expected):
     result = one_to_one(parent_fitness, offspring_fitness)
     assert result.max() < len(parent_fitness) + len(offspring_fitness)
@@ -29,13 +31,17 @@ def test_one_to_one(parent_fitness, offspring_fitness, expected):
     assert len(result) == len(parent_fitness)
     np.testing.assert_array_equal(result, expected)
 
+
 @pytest.mark.parametrize("parent_fitness", [example_fitness])
-@pytest.mark.parametrize("offspring_fitness", [
-    offspring_fitness_better,
-    offspring_fitness_worse,
-    offspring_fitness_equal,
-    offspring_fitness_mixed,
-])
+@pytest.mark.parametrize(
+    "offspring_fitness",
+    [
+        offspring_fitness_better,
+        offspring_fitness_worse,
+        offspring_fitness_equal,
+        offspring_fitness_mixed,
+    ],
+)
 @pytest.mark.parametrize("p", [0, 0.1, 0.25, 0.5, 0.75, 0.9, 1])
 def test_prob_one_to_one(parent_fitness, offspring_fitness, p):
     result = prob_one_to_one(parent_fitness, offspring_fitness, p)
@@ -43,9 +49,13 @@ def test_prob_one_to_one(parent_fitness, offspring_fitness, p):
     assert result.min() >= 0
     assert len(result) == len(parent_fitness)
 
-@pytest.mark.parametrize("parent_fitness, offspring_fitness, expected", [
-    (example_fitness, offspring_fitness_local_search, np.arange(8) + 8*np.array([3,2,1,0,0,0,3,2])),
-])
+
+@pytest.mark.parametrize(
+    "parent_fitness, offspring_fitness, expected",
+    [
+        (example_fitness, offspring_fitness_local_search, np.arange(8) + 8 * np.array([3, 2, 1, 0, 0, 0, 3, 2])),
+    ],
+)
 def test_many_to_one(parent_fitness, offspring_fitness, expected):
     result = many_to_one(parent_fitness, offspring_fitness)
     assert result.max() < len(parent_fitness) + len(offspring_fitness)
@@ -53,9 +63,13 @@ def test_many_to_one(parent_fitness, offspring_fitness, expected):
     assert len(result) == len(parent_fitness)
     np.testing.assert_array_equal(result, expected)
 
-@pytest.mark.parametrize("parent_fitness, offspring_fitness", [
-    (example_fitness, offspring_fitness_local_search),
-])
+
+@pytest.mark.parametrize(
+    "parent_fitness, offspring_fitness",
+    [
+        (example_fitness, offspring_fitness_local_search),
+    ],
+)
 @pytest.mark.parametrize("p", [0, 0.1, 0.25, 0.5, 0.75, 0.9, 1])
 def test_prob_many_to_one(parent_fitness, offspring_fitness, p):
     result = prob_many_to_one(parent_fitness, offspring_fitness, p)
@@ -63,13 +77,9 @@ def test_prob_many_to_one(parent_fitness, offspring_fitness, p):
     assert result.min() >= 0
     assert len(result) == len(parent_fitness)
 
+
 @pytest.mark.parametrize("parent_fitness", [example_fitness])
-@pytest.mark.parametrize("offspring_fitness", [
-    offspring_fitness_better,
-    offspring_fitness_worse,
-    offspring_fitness_equal,
-    offspring_fitness_mixed
-])
+@pytest.mark.parametrize("offspring_fitness", [offspring_fitness_better, offspring_fitness_worse, offspring_fitness_equal, offspring_fitness_mixed])
 @pytest.mark.parametrize("amount", [0, 1, 5, 8, 10])
 def test_elitism(parent_fitness, offspring_fitness, amount):
     result = elitism(parent_fitness, offspring_fitness, amount)
@@ -80,6 +90,7 @@ def test_elitism(parent_fitness, offspring_fitness, amount):
     assert np.all(result[amount:] >= len(parent_fitness))
     np.testing.assert_array_equal(result[:amount], np.argsort(parent_fitness)[::-1][:amount])
 
+
 # @pytest.mark.parametrize("parent_fitness", [example_fitness])
 # @pytest.mark.parametrize("offspring_fitness", [
 #     offspring_fitness_better,
@@ -97,13 +108,9 @@ def test_elitism(parent_fitness, offspring_fitness, amount):
 #     assert np.all(result[amount:] >= len(parent_fitness))
 #     np.testing.assert_array_equal(result[:amount], np.argsort(parent_fitness)[::-1][:amount])
 
+
 @pytest.mark.parametrize("parent_fitness", [example_fitness])
-@pytest.mark.parametrize("offspring_fitness", [
-    offspring_fitness_better,
-    offspring_fitness_worse,
-    offspring_fitness_equal,
-    offspring_fitness_mixed
-])
+@pytest.mark.parametrize("offspring_fitness", [offspring_fitness_better, offspring_fitness_worse, offspring_fitness_equal, offspring_fitness_mixed])
 @pytest.mark.parametrize("amount", [0, 1, 5, 8, 10])
 def test_lamb_plus_mu(parent_fitness, offspring_fitness, amount):
     result = lamb_plus_mu(parent_fitness, offspring_fitness)
@@ -111,16 +118,72 @@ def test_lamb_plus_mu(parent_fitness, offspring_fitness, amount):
     assert result.min() >= 0
     assert len(result) == len(parent_fitness)
 
+
+def test_large_population_selection():
+    parent_fitness = mhd.RAND_GEN.integers(0, 100, 1000).astype(float)
+    offspring_fitness = mhd.RAND_GEN.integers(0, 100, 7000).astype(float)
+    full_fitness = np.concatenate((parent_fitness, offspring_fitness))
+
+    np.testing.assert_array_equal(lamb_plus_mu(parent_fitness, offspring_fitness), np.argsort(full_fitness, kind="stable")[::-1][:1000])
+    np.testing.assert_array_equal(lamb_comma_mu(parent_fitness, offspring_fitness), np.argsort(offspring_fitness, kind="stable")[::-1][:1000] + 1000)
+
+    result = elitism(parent_fitness, offspring_fitness, 10)
+    np.testing.assert_array_equal(result[:10], np.argsort(parent_fitness, kind="stable")[::-1][:10])
+    np.testing.assert_array_equal(result[10:], np.argsort(offspring_fitness, kind="stable")[::-1][:990] + 1000)
+
+
 @pytest.mark.parametrize("parent_fitness", [example_fitness])
-@pytest.mark.parametrize("offspring_fitness", [
-    offspring_fitness_better,
-    offspring_fitness_worse,
-    offspring_fitness_equal,
-    offspring_fitness_mixed
-])
+@pytest.mark.parametrize("offspring_fitness", [offspring_fitness_better, offspring_fitness_worse, offspring_fitness_equal, offspring_fitness_mixed])
 @pytest.mark.parametrize("amount", [0, 1, 5, 8, 10])
 def test_lamb_comma_mu(parent_fitness, offspring_fitness, amount):
     result = lamb_comma_mu(parent_fitness, offspring_fitness)
     assert result.max() < len(parent_fitness) + len(offspring_fitness)
     assert result.min() >= len(parent_fitness)
-    assert len(result) == len(parent_fitness)
\ No newline at end of file
+    assert len(result) == len(parent_fitness)
+
+
+def test_cro_settle_larvae():
+    parent_fitness = np.array([5, 1, 3])
+    offspring_fitness = np.array([2, 4, 0, 4, 6])
+    spots = np.array(
+        [
+            [1, 4],  # loses spot 1 against larva 1, then settles in the empty spot 4
+            [1, 2],  # best larva aiming at spot 1 (the first one in the tie with larva 3)
+            [0, 0],  # never beats the coral in spot 0
+            [1, 0],  # loses spot 1 against larva 1 and can't beat the coral in spot 0
+            [3, 3],  # spot 3 is empty
+        ]
+    )
+
+    parent_spots = np.arange(3)
+    result = _cro_settle_larvae(parent_fitness, parent_spots, offspring_fitness, spots, 5)
+    np.testing.assert_array_equal(result, [0, 4, 2, 7, 3])
+    np.testing.assert_array_equal(_cro_settle_larvae.loop_func(parent_fitness, parent_spots, offspring_fitness, spots, 5), result)
+
+    # With the parents in other spots, larva 3 replaces the coral in spot 0 and larva 0 can't settle
+    parent_spots = np.array([4, 3, 0])
+    result = _cro_settle_larvae(parent_fitness, parent_spots, offspring_fitness, spots, 5)
+    np.testing.assert_array_equal(result, [6, 4, -1, 7, 0])
+    np.testing.assert_array_equal(_cro_settle_larvae.loop_func(parent_fitness, parent_spots, offspring_fitness, spots, 5), result)
+
+
+@pytest.mark.parametrize("parent_fitness", [example_fitness])
+@pytest.mark.parametrize("offspring_fitness", [offspring_fitness_better, offspring_fitness_worse, offspring_fitness_equal, offspring_fitness_mixed])
+@pytest.mark.parametrize("Fd, Pd", [(0, 0), (0.2, 0.5), (1, 1)])
+@pytest.mark.parametrize("maxpopsize", [8, 12])
+def test_cro_selection(parent_fitness, offspring_fitness, Fd, Pd, maxpopsize):
+    result, spots = cro_selection(parent_fitness, offspring_fitness, Fd, Pd, 3, maxpopsize)
+    assert len(spots) == len(result)
+    assert len(np.unique(spots)) == len(spots)
+    assert result.max() < len(parent_fitness) + len(offspring_fitness)
+    assert result.min() >= 0
+    assert 2 <= len(result) <= maxpopsize
+    assert len(np.unique(result)) == len(result)
+
+    if Fd == 0:
+        # Without depredation the parents are only replaced by better offspring
+        assert len(result) >= len(parent_fitness)
+        full_fitness = np.concatenate((parent_fitness, offspring_fitness))
+        assert full_fitness[result].max() >= parent_fitness.max()
+    elif Fd == 1 and Pd == 1:
+        assert len(result) == 2